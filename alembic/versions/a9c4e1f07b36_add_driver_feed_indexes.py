@@ -0,0 +1,40 @@
+"""add partial index for the driver delivery feed and order_items.order_id index
+
+Revision ID: a9c4e1f07b36
+Revises: f3b8d2a61c07
+Create Date: 2026-10-17 17:20:44.518230
+
+ix_orders_driver_open only holds orders that are not deleted, keyed by driver
+and status, so a driver's open assignments are found by status without
+reading their completed history.
+ix_order_items_order_id serves the items lookup for those orders (and every
+other page of orders).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c4e1f07b36'
+down_revision: Union[str, Sequence[str], None] = 'f3b8d2a61c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_orders_driver_open', 'orders', ['driver_id', 'status_id'],
+        postgresql_where=sa.text('is_deleted = false'),
+        sqlite_where=sa.text('is_deleted = 0'),
+        postgresql_include=['created_at'],
+    )
+    op.create_index('ix_order_items_order_id', 'order_items', ['order_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_order_items_order_id', table_name='order_items')
+    op.drop_index('ix_orders_driver_open', table_name='orders')
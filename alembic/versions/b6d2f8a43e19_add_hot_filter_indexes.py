@@ -0,0 +1,65 @@
+"""add indexes for the hot order, order item and user filters
+
+Revision ID: b6d2f8a43e19
+Revises: a9c4e1f07b36
+Create Date: 2026-10-17 18:02:15.640378
+
+Chosen from the queries the services run (scripts/check_query_plans.py
+EXPLAINs them):
+
+- ix_orders_status_created_active: the order listing filtered by status
+  (sorted by created_at, id) and its filtered count, and the per-status
+  dashboard aggregates and rebuilds. Partial on active orders, like every
+  one of those queries.
+- ix_orders_company_id, ix_orders_admin_id, ix_orders_driver_id,
+  ix_users_company_id: foreign keys Postgres checks when a company or user
+  is permanently deleted; without them each delete scans orders or users.
+- ix_users_role_id: the driver lists.
+
+Already covered: orders.created_at (ix_orders_created_at_id), order_items.order_id
+and a driver's open orders (a9c4e1f07b36). Not indexed: order_items.gas_id
+(no query filters on it, and gases are only soft deleted) and orders.is_deleted
+on its own (too few distinct values; it is the predicate of the partial indexes).
+
+On Postgres the indexes are built CONCURRENTLY so orders stays writable.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d2f8a43e19'
+down_revision: Union[str, Sequence[str], None] = 'a9c4e1f07b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, partial on active rows)
+INDEXES = [
+    ('ix_orders_status_created_active', 'orders', ['status_id', 'created_at', 'id'], True),
+    ('ix_orders_company_id', 'orders', ['company_id'], False),
+    ('ix_orders_admin_id', 'orders', ['admin_id'], False),
+    ('ix_orders_driver_id', 'orders', ['driver_id'], False),
+    ('ix_users_role_id', 'users', ['role_id'], False),
+    ('ix_users_company_id', 'users', ['company_id'], False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        for name, table, columns, partial in INDEXES:
+            options = {}
+            if partial:
+                options.update(postgresql_where=sa.text('is_deleted = false'), sqlite_where=sa.text('is_deleted = 0'))
+            op.create_index(name, table, columns, postgresql_concurrently=postgres, **options)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=postgres)
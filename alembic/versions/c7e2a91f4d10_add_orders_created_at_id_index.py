@@ -0,0 +1,27 @@
+"""add orders created_at id index for keyset pagination
+
+Revision ID: c7e2a91f4d10
+Revises: 3d815faaa623
+Create Date: 2026-10-17 10:12:31.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2a91f4d10'
+down_revision: Union[str, Sequence[str], None] = '3d815faaa623'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_orders_created_at_id', 'orders', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_orders_created_at_id', table_name='orders')
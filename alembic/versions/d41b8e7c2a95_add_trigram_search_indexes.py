@@ -0,0 +1,77 @@
+"""add trigram search indexes
+
+Revision ID: d41b8e7c2a95
+Revises: c7e2a91f4d10
+Create Date: 2026-10-17 14:03:52.817346
+
+Postgres gets pg_trgm GIN indexes so ILIKE '%term%' searches can use an index.
+SQLite (local development) gets FTS5 trigram tables kept in sync by triggers,
+which app/utils/search.py uses when they are present.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41b8e7c2a95'
+down_revision: Union[str, Sequence[str], None] = 'c7e2a91f4d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, searchable columns)
+SEARCH_COLUMNS = [
+    ("companies", ["name", "address"]),
+    ("users", ["name", "email"]),
+    ("gases", ["name"]),
+]
+
+
+def _sqlite_fts_statements(table: str, columns: list[str]) -> list[str]:
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table, columns in SEARCH_COLUMNS:
+            for column in columns:
+                op.create_index(
+                    f"ix_{table}_{column}_trgm", table, [column],
+                    postgresql_using="gin",
+                    postgresql_ops={column: "gin_trgm_ops"},
+                )
+    elif dialect == "sqlite":
+        for table, columns in SEARCH_COLUMNS:
+            for statement in _sqlite_fts_statements(table, columns):
+                op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        for table, columns in SEARCH_COLUMNS:
+            for column in columns:
+                op.drop_index(f"ix_{table}_{column}_trgm", table_name=table)
+    elif dialect == "sqlite":
+        for table, _ in SEARCH_COLUMNS:
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
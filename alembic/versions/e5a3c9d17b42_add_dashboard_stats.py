@@ -0,0 +1,47 @@
+"""add dashboard_stats table with running dashboard totals
+
+Revision ID: e5a3c9d17b42
+Revises: d41b8e7c2a95
+Create Date: 2026-10-17 14:05:12.381604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a3c9d17b42'
+down_revision: Union[str, Sequence[str], None] = 'd41b8e7c2a95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'dashboard_stats',
+        sa.Column('kind', sa.String(length=32), nullable=False),
+        sa.Column('ref_id', sa.Integer(), nullable=False),
+        sa.Column('value', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('kind', 'ref_id'),
+    )
+    # Backfill from existing orders (same queries as dashboard_stats.rebuild)
+    op.execute(
+        "INSERT INTO dashboard_stats (kind, ref_id, value) "
+        "SELECT 'order_status', status_id, COUNT(id) FROM orders "
+        "WHERE is_deleted = false GROUP BY status_id"
+    )
+    op.execute(
+        "INSERT INTO dashboard_stats (kind, ref_id, value) "
+        "SELECT 'pending_gas', order_items.gas_id, SUM(order_items.quantity) "
+        "FROM order_items JOIN orders ON order_items.order_id = orders.id "
+        "WHERE orders.status_id = 1 AND orders.is_deleted = false "
+        "GROUP BY order_items.gas_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('dashboard_stats')
@@ -0,0 +1,51 @@
+"""add order_rollup table with daily order volume per company, area, gas and status
+
+Revision ID: f3b8d2a61c07
+Revises: e5a3c9d17b42
+Create Date: 2026-10-17 16:42:37.905113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d2a61c07'
+down_revision: Union[str, Sequence[str], None] = 'e5a3c9d17b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'order_rollup',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('area', sa.String(length=255), nullable=False),
+        sa.Column('gas_id', sa.Integer(), nullable=False),
+        sa.Column('status_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.BigInteger(), nullable=False),
+        sa.Column('items', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'company_id', 'area', 'gas_id', 'status_id'),
+    )
+    # Backfill from existing orders (same query as order_rollup.rebuild)
+    if op.get_bind().dialect.name == 'postgresql':
+        day = "date(timezone('Asia/Kolkata', orders.created_at))"
+    else:
+        day = "date(orders.created_at, '+330 minutes')"
+    op.execute(
+        "INSERT INTO order_rollup (day, company_id, area, gas_id, status_id, quantity, items) "
+        f"SELECT {day}, orders.company_id, orders.area, order_items.gas_id, orders.status_id, "
+        "SUM(order_items.quantity), COUNT(order_items.id) "
+        "FROM order_items JOIN orders ON order_items.order_id = orders.id "
+        "WHERE orders.is_deleted = false "
+        f"GROUP BY {day}, orders.company_id, orders.area, order_items.gas_id, orders.status_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('order_rollup')
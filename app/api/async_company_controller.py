@@ -0,0 +1,124 @@
+from fastapi import APIRouter, Depends, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dto.base_response import APIResponse
+from app.dto.company_dto import CompanyCreate, CompanyUpdate, CompanyRead, CompanyNameRead
+from app.services.async_company_service import (
+    create_company, get_company_by_id, list_companies,
+    update_company, soft_delete_company, permanent_delete_company, get_all_companies
+)
+from app.dependencies import get_async_db
+from app.core.role import AsyncAdminOnly, AsyncStaffOnly
+from app.messages.messages import Message
+from app.db.query_budget import query_budget
+
+# Async handlers for the companies router (enable with ASYNC_ROUTERS=companies).
+router = APIRouter(prefix="/companies", tags=["companies"])
+
+@router.post("/", response_model=APIResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(3)
+async def create_company_endpoint(
+    payload: CompanyCreate,
+    db: AsyncSession = Depends(get_async_db),
+    user: dict = Depends(AsyncAdminOnly)
+):
+    """Create a new company (Admin only)"""
+    company = await create_company(db, payload.name, payload.address)
+    return APIResponse(
+        data=CompanyRead.model_validate(company),
+        statusCode=status.HTTP_201_CREATED,
+        message=Message.Success.COMPANY_CREATED
+    )
+
+@router.get("/all", response_model=APIResponse)
+@query_budget(2)
+async def list_all_companies_endpoint(
+    db: AsyncSession = Depends(get_async_db),
+    user: dict = Depends(AsyncStaffOnly)
+):
+    """List all companies for dropdowns (Staff only)"""
+    companies = await get_all_companies(db)
+    return APIResponse(
+        data=[CompanyNameRead.model_validate(c) for c in companies],
+        statusCode=status.HTTP_200_OK,
+        message=Message.Success.COMPANY_RETRIEVED
+    )
+
+@router.get("/{company_id}", response_model=APIResponse)
+@query_budget(2)
+async def get_company(
+    company_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user: dict = Depends(AsyncStaffOnly)
+):
+    """Get a specific company by ID (Staff only)"""
+    company = await get_company_by_id(db, company_id)
+    return APIResponse(
+        data=CompanyRead.model_validate(company),
+        statusCode=status.HTTP_200_OK,
+        message=Message.Success.COMPANY_RETRIEVED
+    )
+
+@router.get("/", response_model=APIResponse)
+@query_budget(3)
+async def list_companies_endpoint(
+    skip: int = Query(0, ge=0, alias="start"),
+    limit: int = Query(10, ge=1, le=100, alias="length"),
+    search: str = Query("", alias="search[value]"),
+    db: AsyncSession = Depends(get_async_db),
+    user: dict = Depends(AsyncStaffOnly)
+):
+    """List all companies with server-side processing and search (Staff only)"""
+    companies, total_records, filtered_records = await list_companies(db, skip=skip, limit=limit, search=search)
+    return APIResponse(
+        data={
+            "recordsTotal": total_records,
+            "recordsFiltered": filtered_records,
+            "data": [CompanyRead.model_validate(c) for c in companies]
+        },
+        statusCode=status.HTTP_200_OK,
+        message=Message.Success.COMPANY_RETRIEVED
+    )
+
+@router.put("/{company_id}", response_model=APIResponse)
+@query_budget(4)
+async def update_company_endpoint(
+    company_id: int,
+    payload: CompanyUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    user: dict = Depends(AsyncAdminOnly)
+):
+    """Update a company (Admin only)"""
+    company = await update_company(db, company_id, payload.name, payload.address)
+    return APIResponse(
+        data=CompanyRead.model_validate(company),
+        statusCode=status.HTTP_200_OK,
+        message=Message.Success.COMPANY_UPDATED
+    )
+
+@router.delete("/{company_id}", response_model=APIResponse)
+async def delete_company_endpoint(
+    company_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user: dict = Depends(AsyncAdminOnly)
+):
+    """Soft delete a company (Admin only)"""
+    company = await soft_delete_company(db, company_id)
+    return APIResponse(
+        data=CompanyRead.model_validate(company),
+        statusCode=status.HTTP_200_OK,
+        message=Message.Success.COMPANY_DELETED
+    )
+
+@router.delete("/permanent/{company_id}", response_model=APIResponse)
+async def permanent_delete_company_endpoint(
+    company_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user: dict = Depends(AsyncAdminOnly)
+):
+    """Permanently delete a company (Admin only). Use with caution."""
+    await permanent_delete_company(db, company_id)
+    return APIResponse(
+        statusCode=status.HTTP_200_OK,
+        message=Message.Success.COMPANY_PERMANENT_DELETE
+    )
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependencies import get_async_db
+from app.core.role import AsyncAdminOnly
+from app.services.async_dashboard_service import get_dashboard_snapshot
+from app.dto.base_response import APIResponse
+from app.dto.dashboard_dto import DashboardInsights
+from app.messages.messages import Message
+from app.utils.http_cache import cache_headers, etag_matches, not_modified
+from app.db.query_budget import query_budget
+
+# Async handlers for the dashboard router (enable with ASYNC_ROUTERS=dashboard).
+router = APIRouter(tags=["dashboard"])
+
+
+@router.get("/", response_model=APIResponse, dependencies=[Depends(AsyncAdminOnly)])
+@query_budget(2)
+async def get_dashboard_insights_endpoint(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get insightful data for the admin dashboard.
+    """
+    snapshot = await get_dashboard_snapshot(db)
+    if etag_matches(request, snapshot.etag):
+        return not_modified(snapshot.etag)
+    response.headers.update(cache_headers(snapshot.etag))
+    return APIResponse(
+        data=DashboardInsights(**snapshot.insights),
+        statusCode=status.HTTP_200_OK,
+        message=Message.Success.FETCHED_SUCCESSFULLY
+    )
@@ -0,0 +1,152 @@
+from fastapi import APIRouter, Depends, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from datetime import datetime
+from app.dto.base_response import APIResponse
+from app.dto.order_dto import (
+    OrderCreate, OrderUpdate, OrderRead, OrderWithItemsRead, OrderBulkUpdate, OrderBulkUpdateReport, OrderListResponse
+)
+from app.services.async_order_service import (
+    create_order, get_order_with_details, list_orders, update_order, bulk_update_orders, hard_delete_order
+)
+from app.dependencies import get_async_db
+from app.core import fast_json
+from app.core.role import AsyncAdminOnly, AsyncStaffOnly
+from app.messages.messages import Message
+from app.db.query_budget import query_budget
+
+# Async handlers for the orders router (enable with ASYNC_ROUTERS=orders).
+# Routes not defined here are served by app/api/order_controller.py.
+router = APIRouter(prefix="/orders", tags=["orders"])
+
+@router.post("/", response_model=APIResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(7)
+async def create_order_endpoint(
+    payload: OrderCreate,
+    db: AsyncSession = Depends(get_async_db),
+    user: dict = Depends(AsyncAdminOnly)
+):
+    """Create a new order with items (Admin only)"""
+    order = await create_order(
+        db, payload.company_id, user.id, payload.area,
+        payload.mobile_no, payload.notes, payload.items
+    )
+    return APIResponse(
+        data=OrderRead.model_validate(order),
+        statusCode=status.HTTP_201_CREATED,
+        message=Message.Success.ORDER_CREATED,
+        technicalMessage=None
+    )
+
+@router.patch("/bulk", response_model=APIResponse)
+@query_budget(8)
+async def bulk_update_orders_endpoint(
+    payload: OrderBulkUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    user: dict = Depends(AsyncStaffOnly)
+):
+    """Set the status and/or driver of many orders at once (Staff only)"""
+    report = await bulk_update_orders(db, payload.orders, payload.model_dump(exclude_unset=True, exclude={"orders"}))
+    return APIResponse(
+        data=OrderBulkUpdateReport.model_validate(report),
+        statusCode=status.HTTP_200_OK,
+        message=Message.Success.ORDERS_UPDATED,
+        technicalMessage=None
+    )
+
+@router.get("/{order_id}", response_model=APIResponse)
+@query_budget(3)
+async def get_order_endpoint(
+    order_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user: dict = Depends(AsyncStaffOnly)
+):
+    """Get order details with items (Staff only)"""
+    order = await get_order_with_details(db, order_id)
+    return APIResponse(
+        data=OrderWithItemsRead.model_validate(order),
+        statusCode=status.HTTP_200_OK,
+        message=Message.Success.ORDER_RETRIEVED,
+        technicalMessage=None
+    )
+
+@router.get("/", response_model=OrderListResponse)
+@query_budget(6)
+async def list_orders_endpoint(
+    db: AsyncSession = Depends(get_async_db),
+    user: dict = Depends(AsyncStaffOnly),
+    draw: int = Query(1, ge=1),
+    start: int = Query(0, ge=0),
+    length: int = Query(10, ge=1, le=100),
+    search: str = Query(None),
+    status_id: Optional[int] = Query(None, description="Filter orders by status ID"),
+    start_date: Optional[datetime] = Query(None, description="Start date for filtering orders (e.g., '2025-09-08T00:00:00')"),
+    end_date: Optional[datetime] = Query(None, description="End date for filtering orders (e.g., '2025-09-08T23:59:59')"),
+    sort_order: str = Query("desc", description="Sort order for orders ('asc', 'desc', or 'relevance' when searching)"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page's next_cursor; pass an empty value to start cursor paging")
+):
+    """
+    List all orders with server-side processing, optional filtering, and sorting.
+    """
+    fast = fast_json.enabled()
+    orders_data = await list_orders(
+        db,
+        start=start,
+        length=length,
+        search=search,
+        status_id=status_id,
+        start_date=start_date,
+        end_date=end_date,
+        sort_order=sort_order,
+        cursor=cursor,
+        as_dicts=fast
+    )
+    page = {
+        "draw": draw,
+        "recordsTotal": orders_data["recordsTotal"],
+        "recordsFiltered": orders_data["recordsFiltered"],
+        "data": orders_data["data"],
+        "next_cursor": orders_data["next_cursor"],
+    }
+    if fast:
+        return fast_json.api_response(page, status.HTTP_200_OK, Message.Success.ORDER_RETRIEVED)
+    return OrderListResponse(
+        data=page,
+        statusCode=status.HTTP_200_OK,
+        message=Message.Success.ORDER_RETRIEVED,
+        technicalMessage=None
+    )
+
+@router.put("/{order_id}", response_model=APIResponse)
+@query_budget(12)
+async def update_order_endpoint(
+    order_id: int,
+    payload: OrderUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    user: dict = Depends(AsyncStaffOnly)
+):
+    """Update order details (Staff only)"""
+    await update_order(db, order_id, **payload.model_dump(exclude_unset=True))
+    order = await get_order_with_details(db, order_id)
+    return APIResponse(
+        data=OrderWithItemsRead.model_validate(order),
+        statusCode=status.HTTP_200_OK,
+        message=Message.Success.ORDER_UPDATED,
+        technicalMessage=None
+    )
+
+@router.delete("/{order_id}", response_model=APIResponse)
+@query_budget(8)
+async def delete_order_endpoint(
+    order_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user: dict = Depends(AsyncAdminOnly)
+):
+    """Delete an order (Admin only)"""
+    await hard_delete_order(db, order_id)
+    return APIResponse(
+        data={"order_id": order_id},
+        statusCode=status.HTTP_200_OK,
+        message=Message.Success.ORDER_DELETED,
+        technicalMessage=None
+    )
@@ -1,21 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from app.dto.auth_dto import *
 from app.services.auth_service import authenticate, signup
 from app.dto.base_response import APIResponse
 from app.messages.messages import Message
 from app.db.session import get_db
+from app.db.query_budget import query_budget
+from app.core.login_throttle import client_address
 from sqlalchemy.orm import Session
 
 router = APIRouter()
 
 @router.post("/login", response_model=APIResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
-    auth = authenticate(payload.email, payload.password, db)
+@query_budget(2)
+async def login(payload: LoginRequest, request: Request, db: Session = Depends(get_db)):
+    auth = await authenticate(payload.email, payload.password, db, client_address(request))
     if not auth:
         return APIResponse(
             data=None,
             statusCode=401,
-            message=Message.Error.AUTH_FAILED,
+            message=Message.Error.INVALID_CREDENTIALS,
             technicalMessage=None,
         )
     return APIResponse(
@@ -27,8 +30,8 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/signup", response_model=APIResponse)
-def signup_user(payload: SignupRequest, db: Session = Depends(get_db)):
-    user_data = signup(payload, db)
+async def signup_user(payload: SignupRequest, db: Session = Depends(get_db)):
+    user_data = await signup(payload, db)
     return APIResponse(
         data=SignupResponse.model_validate(user_data),
         statusCode=201,
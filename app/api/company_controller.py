@@ -11,10 +11,12 @@ from app.services.company_service import (
 from app.dependencies import get_db
 from app.core.role import AdminOnly, StaffOnly
 from app.messages.messages import Message
+from app.db.query_budget import query_budget
 
 router = APIRouter(prefix="/companies", tags=["companies"])
 
 @router.post("/", response_model=APIResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(3)
 def create_company_endpoint(
     payload: CompanyCreate, 
     db: Session = Depends(get_db), 
@@ -29,6 +31,7 @@ def create_company_endpoint(
     )
 
 @router.get("/all", response_model=APIResponse)
+@query_budget(2)
 def list_all_companies_endpoint(
     db: Session = Depends(get_db), 
     user: dict = Depends(StaffOnly)
@@ -36,12 +39,13 @@ def list_all_companies_endpoint(
     """List all companies for dropdowns (Staff only)"""
     companies = get_all_companies(db)
     return APIResponse(
-        data=[CompanyNameRead.from_orm(c) for c in companies],
+        data=[CompanyNameRead.model_validate(c) for c in companies],
         statusCode=status.HTTP_200_OK,
         message=Message.Success.COMPANY_RETRIEVED
     )
 
 @router.get("/{company_id}", response_model=APIResponse)
+@query_budget(2)
 def get_company(
     company_id: int,
     db: Session = Depends(get_db), 
@@ -56,6 +60,7 @@ def get_company(
     )
 
 @router.get("/", response_model=APIResponse)
+@query_budget(3)
 def list_companies_endpoint(
     skip: int = Query(0, ge=0, alias="start"),
     limit: int = Query(10, ge=1, le=100, alias="length"),
@@ -80,6 +85,7 @@ def list_companies_endpoint(
     )
 
 @router.put("/{company_id}", response_model=APIResponse)
+@query_budget(4)
 def update_company_endpoint(
     company_id: int,
     payload: CompanyUpdate,
@@ -1,24 +1,75 @@
-from fastapi import APIRouter, Depends, status
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.dependencies import get_db
 from app.core.role import AdminOnly
-from app.services.dashboard_service import get_dashboard_insights
+from app.services.dashboard_service import get_dashboard_snapshot, get_order_analytics
 from app.dto.base_response import APIResponse
-from app.dto.dashboard_dto import DashboardResponse, DashboardInsights
+from app.dto.dashboard_dto import DashboardResponse, DashboardInsights, OrderAnalytics
 from app.messages.messages import Message
+from app.utils.http_cache import cache_headers, etag_matches, not_modified
+from app.utils.order_rollup import IST
+from app.db.query_budget import query_budget
 
 router = APIRouter(tags=["dashboard"])
 
 
 @router.get("/", response_model=APIResponse, dependencies=[Depends(AdminOnly)])
-def get_dashboard_insights_endpoint(db: Session = Depends(get_db)):
+@query_budget(2)
+def get_dashboard_insights_endpoint(request: Request, response: Response, db: Session = Depends(get_db)):
     """
     Get insightful data for the admin dashboard.
+
+    Responses carry an ETag; a request whose If-None-Match still matches gets
+    304 from the in-memory snapshot without querying the database.
+    """
+    snapshot = get_dashboard_snapshot(db)
+    if etag_matches(request, snapshot.etag):
+        return not_modified(snapshot.etag)
+    response.headers.update(cache_headers(snapshot.etag))
+    return APIResponse(
+        data=DashboardInsights(**snapshot.insights),
+        statusCode=status.HTTP_200_OK,
+        message=Message.Success.FETCHED_SUCCESSFULLY
+    )
+
+
+@router.get("/analytics", response_model=APIResponse, dependencies=[Depends(AdminOnly)])
+@query_budget(3)
+def get_order_analytics_endpoint(
+    db: Session = Depends(get_db),
+    start_date: Optional[date] = Query(None, description="First day (default: 30 days before end_date)"),
+    end_date: Optional[date] = Query(None, description="Last day, inclusive (default: today)"),
+    granularity: str = Query("day", pattern="^(day|week|month)$", description="Bucket size: day, week or month"),
+    group_by: str = Query("company,gas", description="Comma-separated dimensions: company, area, gas, status"),
+    company_id: Optional[int] = Query(None, description="Only this company"),
+    area: Optional[str] = Query(None, description="Only this delivery area"),
+    gas_id: Optional[int] = Query(None, description="Only this gas"),
+    status_id: Optional[int] = Query(None, description="Only orders in this status"),
+):
     """
-    insights = get_dashboard_insights(db)
+    Gas volume over time for the dashboard, from the pre-aggregated order rollup.
+    """
+    end_date = end_date or datetime.now(IST).date()
+    start_date = start_date or end_date - timedelta(days=30)
+    dimensions = list(dict.fromkeys(name.strip() for name in group_by.split(",") if name.strip()))
+
+    analytics = get_order_analytics(
+        db,
+        start_date=start_date,
+        end_date=end_date,
+        granularity=granularity,
+        group_by=dimensions,
+        company_id=company_id,
+        area=area,
+        gas_id=gas_id,
+        status_id=status_id,
+    )
     return APIResponse(
-        data=DashboardInsights(**insights),
+        data=OrderAnalytics(**analytics),
         statusCode=status.HTTP_200_OK,
         message=Message.Success.FETCHED_SUCCESSFULLY
     )
@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.models.users import User
 
 from app.dto.base_response import APIResponse
 from app.dto.gas_dto import GasCreate, GasUpdate, GasRead
@@ -9,9 +8,10 @@ from app.services.gas_service import (
     create_gas, get_gas_by_id, list_gases, 
     update_gas, soft_delete_gas, search_gases
 )
-from app.dependencies import get_db, get_current_user
+from app.dependencies import get_db, get_current_user, CurrentUser
 from app.core.role import AdminOnly, StaffOnly
 from app.messages.messages import Message
+from app.db.query_budget import query_budget
 
 router = APIRouter(prefix="/gases", tags=["gases"])
 
@@ -31,6 +31,7 @@ def create_gas_endpoint(
     )
 
 @router.get("/{gas_id}", response_model=APIResponse)
+@query_budget(2)
 def get_gas(
     gas_id: int,
     db: Session = Depends(get_db), 
@@ -46,12 +47,13 @@ def get_gas(
     )
 
 @router.get("/", response_model=APIResponse)
+@query_budget(2)
 def list_gases_endpoint(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     name: Optional[str] = Query(None),
     db: Session = Depends(get_db), 
-    user: User = Depends(StaffOnly)
+    user: CurrentUser = Depends(StaffOnly)
 ):
     """List all gases with optional filtering (Staff only)"""
     if name:
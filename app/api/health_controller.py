@@ -1,8 +1,31 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import PlainTextResponse
 from app.dto.base_response import APIResponse
+from app.core import metrics
+from app.core.cache import cache_stats
+from app.utils.reference_data import reference_versions
+from app.messages.messages import Message
 
 router = APIRouter()
 
 @router.get("/ping", response_model=APIResponse)
 def ping():
     return APIResponse(data={"status": "ok"}, statusCode=200, message="pong", technicalMessage=None)
+
+@router.get("/cache", response_model=APIResponse)
+def cache_statistics():
+    """Hit/miss counters for the in-process caches and current reference data versions"""
+    return APIResponse(
+        data={"caches": cache_stats(), "reference_versions": reference_versions()},
+        statusCode=200,
+        message=Message.Success.CACHE_STATS_RETRIEVED,
+        technicalMessage=None
+    )
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics_exposition():
+    """Process metrics in the Prometheus text format (see app/core/metrics.py)"""
+    # async: the threadpool gauges are read on the event loop, and a scrape needs no free thread
+    if not metrics.enabled():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=Message.Error.METRICS_DISABLED)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,17 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 from app.dto.base_response import APIResponse
-from app.dto.order_dto import OrderCreate, OrderUpdate, OrderRead, OrderWithItemsRead
+from app.dto.order_dto import (
+    OrderCreate, OrderUpdate, OrderRead, OrderWithItemsRead, OrderImportReport, OrderBulkUpdate, OrderBulkUpdateReport,
+    OrderListResponse, OrderStreamToken,
+)
 from app.services.order_service import *
+from app.services.order_import_service import import_orders, FORMAT_CSV, FORMAT_NDJSON
+from app.core import fast_json
+from app.core.config import settings
+from app.core.security import create_stream_token
 from app.dependencies import get_db
-from app.core.role import AdminOnly, StaffOnly
+from app.core.role import AdminOnly, DriverOnly, StaffOnly, StreamStaffOnly
+from app.core.event_stream import sse_stream
 from app.messages.messages import Message
+from app.utils import order_events
+from app.db.query_budget import query_budget
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
 @router.post("/", response_model=APIResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(7)
 def create_order_endpoint(
     payload: OrderCreate, 
     db: Session = Depends(get_db), 
@@ -29,7 +41,103 @@ def create_order_endpoint(
         technicalMessage=None
     )
 
+@router.post("/bulk", response_model=APIResponse)
+async def bulk_import_orders_endpoint(
+    request: Request,
+    format: Optional[str] = Query(None, description="Upload format ('ndjson' or 'csv'); defaults from the Content-Type header"),
+    db: Session = Depends(get_db),
+    user: dict = Depends(AdminOnly)
+):
+    """Import many orders from a streamed NDJSON or CSV upload (Admin only)"""
+    if format is None:
+        format = FORMAT_CSV if "csv" in request.headers.get("content-type", "") else FORMAT_NDJSON
+
+    report = await import_orders(
+        db, user.id, request.stream(), format.lower(),
+        chunk_size=settings.ORDER_IMPORT_CHUNK_SIZE
+    )
+    return APIResponse(
+        data=OrderImportReport.model_validate(report),
+        statusCode=status.HTTP_200_OK,
+        message=Message.Success.ORDER_IMPORT_COMPLETED,
+        technicalMessage=None
+    )
+
+@router.patch("/bulk", response_model=APIResponse)
+@query_budget(8)
+def bulk_update_orders_endpoint(
+    payload: OrderBulkUpdate,
+    db: Session = Depends(get_db),
+    user: dict = Depends(StaffOnly)
+):
+    """
+    Set the status and/or driver of many orders at once (Staff only).
+
+    Send each order's updated_at as last read; orders changed since then
+    are listed as stale and left unchanged.
+    """
+    report = bulk_update_orders(db, payload.orders, payload.model_dump(exclude_unset=True, exclude={"orders"}))
+    return APIResponse(
+        data=OrderBulkUpdateReport.model_validate(report),
+        statusCode=status.HTTP_200_OK,
+        message=Message.Success.ORDERS_UPDATED,
+        technicalMessage=None
+    )
+
+@router.get("/stream")
+async def order_stream_endpoint(
+    request: Request,
+    user: dict = Depends(StreamStaffOnly)
+):
+    """
+    Live order changes as Server-Sent Events (Staff only).
+
+    Events: order.created, order.updated, order.deleted, orders.imported and
+    resync (see app/utils/order_events.py). Browsers cannot send an
+    Authorization header with EventSource; they pass ?stream_token= from
+    POST /orders/stream/token instead.
+    """
+    subscription = order_events.subscribe()
+    return StreamingResponse(
+        sse_stream(request, order_events.broker, subscription, settings.ORDER_STREAM_PING_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/stream/token", response_model=APIResponse)
+@query_budget(1)
+async def order_stream_token_endpoint(user: dict = Depends(StaffOnly)):
+    """
+    Issue a short-lived token that opens /orders/stream and nothing else
+    (Staff only). Only needed to connect: an open stream outlives it.
+    """
+    return APIResponse(
+        data=OrderStreamToken(
+            stream_token=create_stream_token(user.id, user.role_id),
+            expires_in=settings.ORDER_STREAM_TOKEN_SECONDS,
+        ),
+        statusCode=status.HTTP_200_OK,
+        message=Message.Success.STREAM_TOKEN_ISSUED,
+        technicalMessage=None
+    )
+
+@router.get("/my-deliveries", response_model=APIResponse)
+@query_budget(4)
+def my_deliveries_endpoint(
+    db: Session = Depends(get_db),
+    user: dict = Depends(DriverOnly)
+):
+    """Open orders assigned to the calling driver, with items (Driver only)"""
+    orders = get_driver_orders(db, user.id)
+    return APIResponse(
+        data=orders,
+        statusCode=status.HTTP_200_OK,
+        message=Message.Success.ORDER_RETRIEVED,
+        technicalMessage=None
+    )
+
 @router.get("/{order_id}", response_model=APIResponse)
+@query_budget(3)
 def get_order_endpoint(
     order_id: int,
     db: Session = Depends(get_db),
@@ -55,7 +163,8 @@ def get_order_endpoint(
     )
     
 
-@router.get("/", response_model=APIResponse)
+@router.get("/", response_model=OrderListResponse)
+@query_budget(6)
 def list_orders_endpoint(
     db: Session = Depends(get_db),
     user: dict = Depends(StaffOnly),
@@ -66,12 +175,14 @@ def list_orders_endpoint(
     status_id: Optional[int] = Query(None, description="Filter orders by status ID"),
     start_date: Optional[datetime] = Query(None, description="Start date for filtering orders (e.g., '2025-09-08T00:00:00')"),
     end_date: Optional[datetime] = Query(None, description="End date for filtering orders (e.g., '2025-09-08T23:59:59')"),
-    sort_order: str = Query("desc", description="Sort order for orders ('asc' or 'desc')")
+    sort_order: str = Query("desc", description="Sort order for orders ('asc', 'desc', or 'relevance' when searching)"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page's next_cursor; pass an empty value to start cursor paging")
 ):
     """
     List all orders with server-side processing, optional filtering, and sorting.
     """
     
+    fast = fast_json.enabled()
     orders_data = list_orders(
         db,
         start=start,
@@ -80,22 +191,28 @@ def list_orders_endpoint(
         status_id=status_id,
         start_date=start_date,
         end_date=end_date,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=cursor,
+        as_dicts=fast
     )
-    
-    return APIResponse(
-        data={
-            "draw": draw,
-            "recordsTotal": orders_data["recordsTotal"],
-            "recordsFiltered": orders_data["recordsFiltered"],
-            "data": orders_data["data"],
-        },
+    page = {
+        "draw": draw,
+        "recordsTotal": orders_data["recordsTotal"],
+        "recordsFiltered": orders_data["recordsFiltered"],
+        "data": orders_data["data"],
+        "next_cursor": orders_data["next_cursor"],
+    }
+    if fast:
+        return fast_json.api_response(page, status.HTTP_200_OK, Message.Success.ORDER_RETRIEVED)
+    return OrderListResponse(
+        data=page,
         statusCode=status.HTTP_200_OK,
         message=Message.Success.ORDER_RETRIEVED,
         technicalMessage=None
     )
 
 @router.put("/{order_id}", response_model=APIResponse)
+@query_budget(11)
 def update_order_endpoint(
     order_id: int,
     payload: OrderUpdate,
@@ -113,6 +230,7 @@ def update_order_endpoint(
     )
 
 @router.delete("/{order_id}", response_model=APIResponse)
+@query_budget(8)
 def delete_order_endpoint(
     order_id: int,
     db: Session = Depends(get_db), 
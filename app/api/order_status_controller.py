@@ -3,14 +3,16 @@ from sqlalchemy.orm import Session
 from typing import List
 from app.dto.base_response import APIResponse
 from app.dto.order_status_dto import OrderStatusRead
-from app.services.order_status_service import get_all_statuses
+from app.services.order_status_service import get_all_statuses, refresh_statuses
 from app.dependencies import get_db
-from app.core.role import StaffOnly
+from app.core.role import AdminOnly, StaffOnly
 from app.messages.messages import Message
+from app.db.query_budget import query_budget
 
 router = APIRouter(prefix="/order-statuses", tags=["order_statuses"])
 
 @router.get("/", response_model=APIResponse)
+@query_budget(2)
 def list_order_statuses_endpoint(
     db: Session = Depends(get_db),
     user: dict = Depends(StaffOnly)
@@ -23,3 +25,13 @@ def list_order_statuses_endpoint(
         message=Message.Success.ORDER_STATUS_RETRIEVED,
         technicalMessage=None
     )
+
+@router.post("/refresh", response_model=APIResponse)
+def refresh_order_statuses_endpoint(user: dict = Depends(AdminOnly)):
+    """Drop cached order statuses after they were changed directly in the database (Admin only)"""
+    refresh_statuses()
+    return APIResponse(
+        statusCode=status.HTTP_200_OK,
+        message=Message.Success.CACHE_REFRESHED,
+        technicalMessage=None
+    )
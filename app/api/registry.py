@@ -0,0 +1,148 @@
+"""
+Router Registry
+---------------
+Every API router the application serves, and how it is included:
+
+- ASYNC_ROUTERS selects routers whose async handlers (app/api/async_*.py)
+  replace the sync ones.
+- LAZY_ROUTERS defers importing rarely used controllers (and the services and
+  DTOs behind them) until the first request under their path, which keeps
+  them out of the cold-start import graph. The OpenAPI schema loads them all.
+"""
+
+import importlib
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import APIRouter, FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound
+
+from app.core.config import settings
+from app.db.session import is_serverless
+
+
+@dataclass(frozen=True)
+class RouterSpec:
+    name: str
+    module: str
+    prefix: str
+    tags: tuple
+    path: str                           # URL prefix served by the router
+    lazy: bool = False                  # rarely used; may be loaded on first request
+    async_module: Optional[str] = None  # async handlers selectable via ASYNC_ROUTERS
+
+
+ROUTERS = [
+    RouterSpec("auth", "app.api.auth_controller", "/api/auth", ("auth",), "/api/auth", lazy=True),
+    RouterSpec("dashboard", "app.api.dashboard_controller", "/api/dashboard", ("dashboard",), "/api/dashboard",
+               async_module="app.api.async_dashboard_controller"),
+    RouterSpec("companies", "app.api.company_controller", "/api", ("companies",), "/api/companies",
+               async_module="app.api.async_company_controller"),
+    RouterSpec("roles", "app.api.role_controller", "/api", ("roles",), "/api/roles", lazy=True),
+    RouterSpec("gases", "app.api.gas_controller", "/api", ("gases",), "/api/gases"),
+    RouterSpec("orders", "app.api.order_controller", "/api", ("orders",), "/api/orders",
+               async_module="app.api.async_order_controller"),
+    RouterSpec("order_items", "app.api.order_item_controller", "/api", ("order-items",), "/api/order-items", lazy=True),
+    RouterSpec("health", "app.api.health_controller", "/api/health", ("health",), "/api/health"),
+    RouterSpec("users", "app.api.user_controller", "/api", ("users",), "/api/users", lazy=True),
+    RouterSpec("order_statuses", "app.api.order_status_controller", "/api", ("order_statuses",), "/api/order-statuses", lazy=True),
+]
+
+
+def enabled_async_routers() -> set[str]:
+    names = {name.strip().lower() for name in settings.ASYNC_ROUTERS.split(",") if name.strip()}
+    unknown = names - {spec.name for spec in ROUTERS if spec.async_module}
+    if unknown:
+        raise ValueError(f"Unknown ASYNC_ROUTERS entries: {', '.join(sorted(unknown))}")
+    return names
+
+
+def lazy_routers_enabled() -> bool:
+    if settings.LAZY_ROUTERS == "auto":
+        return is_serverless()
+    return settings.LAZY_ROUTERS == "on"
+
+
+def with_async_routes(sync_router: APIRouter, async_router: APIRouter) -> APIRouter:
+    """
+    The sync router with every route the async router re-implements swapped
+    in place, so route order (literal paths before /{id}) is preserved.
+    """
+    overrides = {(route.path, frozenset(route.methods)): route for route in async_router.routes}
+    merged = APIRouter()
+    for route in sync_router.routes:
+        merged.routes.append(overrides.pop((route.path, frozenset(route.methods)), route))
+    merged.routes.extend(overrides.values())
+    return merged
+
+
+def load_router(spec: RouterSpec, async_names: set[str]) -> APIRouter:
+    router = importlib.import_module(spec.module).router
+    if spec.name in async_names:
+        router = with_async_routes(router, importlib.import_module(spec.async_module).router)
+    return router
+
+
+class LazyRouterRoute(BaseRoute):
+    """
+    Placeholder for a router that has not been imported yet. The first request
+    under its path imports and includes the router, removes the placeholder and
+    dispatches the request again.
+    """
+
+    def __init__(self, app: FastAPI, spec: RouterSpec, async_names: set[str], lock: threading.Lock):
+        self.app = app
+        self.spec = spec
+        self.async_names = async_names
+        self.lock = lock
+
+    def matches(self, scope):
+        if scope["type"] == "http":
+            path = scope["path"]
+            if path == self.spec.path or path.startswith(self.spec.path + "/"):
+                return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name, /, **path_params):
+        raise NoMatchFound(name, path_params)
+
+    def load(self):
+        with self.lock:
+            routes = self.app.router.routes
+            if self not in routes:
+                return
+            staging = APIRouter()
+            staging.include_router(load_router(self.spec, self.async_names), prefix=self.spec.prefix, tags=list(self.spec.tags))
+            index = routes.index(self)
+            routes[index:index + 1] = staging.routes
+            self.app.openapi_schema = None
+
+    async def handle(self, scope, receive, send):
+        self.load()
+        await self.app.router(scope, receive, send)
+
+
+def include_routers(app: FastAPI):
+    async_names = enabled_async_routers()
+    lazy = lazy_routers_enabled()
+    lock = threading.Lock()
+    placeholders = []
+
+    for spec in ROUTERS:
+        if lazy and spec.lazy:
+            placeholder = LazyRouterRoute(app, spec, async_names, lock)
+            app.router.routes.append(placeholder)
+            placeholders.append(placeholder)
+        else:
+            app.include_router(load_router(spec, async_names), prefix=spec.prefix, tags=list(spec.tags))
+
+    if placeholders:
+        build_openapi = app.openapi
+
+        def openapi():
+            for placeholder in placeholders:
+                placeholder.load()
+            return build_openapi()
+
+        app.openapi = openapi
@@ -3,19 +3,30 @@ from sqlalchemy.orm import Session
 from typing import List
 from app.dto.base_response import APIResponse
 from app.dto.role_dto import RoleRead
-from app.services.role_service import get_all_roles
+from app.services.role_service import get_all_roles, refresh_roles
 from app.dependencies import get_db
 from app.core.role import AdminOnly
 from app.messages.messages import Message
+from app.db.query_budget import query_budget
 
 router = APIRouter(prefix="/roles", tags=["roles"])
 
 @router.get("/", response_model=APIResponse)
+@query_budget(2)
 def list_roles_endpoint(db: Session = Depends(get_db), user: dict = Depends(AdminOnly)):
     """List all roles (Admin only)"""
     roles = get_all_roles(db)
     return APIResponse(
-        data=[RoleRead.from_orm(role) for role in roles],
+        data=[RoleRead.model_validate(role) for role in roles],
         statusCode=status.HTTP_200_OK,
         message=Message.Success.ROLE_RETRIEVED
     )
+
+@router.post("/refresh", response_model=APIResponse)
+def refresh_roles_endpoint(user: dict = Depends(AdminOnly)):
+    """Drop cached roles after they were changed directly in the database (Admin only)"""
+    refresh_roles()
+    return APIResponse(
+        statusCode=status.HTTP_200_OK,
+        message=Message.Success.CACHE_REFRESHED
+    )
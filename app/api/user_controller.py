@@ -8,10 +8,12 @@ from app.services.user_service import get_all_drivers, get_all_users, get_user,
 from app.dependencies import get_db
 from app.core.role import StaffOnly, AdminOnly
 from app.messages.messages import Message
+from app.db.query_budget import query_budget
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/all", response_model=APIResponse)
+@query_budget(3)
 def list_users_endpoint(
     db: Session = Depends(get_db),
     user: dict = Depends(AdminOnly),
@@ -22,9 +24,9 @@ def list_users_endpoint(
     sort_dir: str = Query("asc", regex="^(asc|desc)$")
 ):
     """List all users with optional pagination, searching, and sorting (Admin only)"""
-    users, total_records = get_all_users(db, start, length, search, sort_by, sort_dir)
+    users, total_records, filtered_records = get_all_users(db, start, length, search, sort_by, sort_dir)
     validated_users = [UserReadWithDetails.model_validate(user) for user in users]
-    response_data = DataTableResponse(data=validated_users, recordsFiltered=total_records, recordsTotal=total_records)
+    response_data = DataTableResponse(data=validated_users, recordsFiltered=filtered_records, recordsTotal=total_records)
     return APIResponse(
         data=response_data,
         statusCode=status.HTTP_200_OK,
@@ -32,6 +34,7 @@ def list_users_endpoint(
     )
 
 @router.get("/drivers", response_model=APIResponse)
+@query_budget(2)
 def list_drivers_endpoint(
     db: Session = Depends(get_db),
     user: dict = Depends(StaffOnly)
@@ -46,6 +49,7 @@ def list_drivers_endpoint(
     )
 
 @router.get("/{user_id}", response_model=APIResponse)
+@query_budget(2)
 def get_user_endpoint(
     user_id: int,
     db: Session = Depends(get_db),
@@ -0,0 +1,97 @@
+"""
+In-Process Cache
+----------------
+A small thread-safe TTL cache used for values that are expensive to compute
+and tolerate bounded staleness (record counts, reference data, ...). When
+`max_entries` is set it also evicts the least recently used entry.
+
+Every cache registers itself by name so hit/miss statistics can be reported
+from one place via `cache_stats()`.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+_registry: Dict[str, "TTLCache"] = {}
+
+
+class TTLCache:
+    def __init__(self, name: str, ttl_seconds: float, max_entries: Optional[int] = None):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        _registry[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or `default` if it is missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self.hits += 1
+                if self.max_entries is not None:
+                    self._data.move_to_end(key)
+                return entry[0]
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            if self.max_entries is not None:
+                self._data.move_to_end(key)
+                while len(self._data) > self.max_entries:
+                    self._data.popitem(last=False)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value, calling `loader` and caching its result on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def update(self, key: Hashable, fn: Callable[[Any], Any]) -> None:
+        """Apply `fn` to a cached value in place, keeping its expiry. No-op when not cached."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._data[key] = (fn(entry[0]), entry[1])
+
+    def invalidate(self, key: Hashable = _MISSING) -> None:
+        """Drop one key, or every key when called without arguments."""
+        with self._lock:
+            if key is _MISSING:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "size": len(self._data),
+        }
+
+
+def cache_stats() -> Dict[str, dict]:
+    """Hit/miss statistics for every registered cache, keyed by cache name."""
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+
+def invalidate_all() -> None:
+    """Empty every registered cache (for benchmarks and checks that need cold caches)."""
+    for cache in list(_registry.values()):
+        cache.invalidate()
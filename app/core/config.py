@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -9,16 +10,93 @@ class Settings(BaseSettings):
     # Database settings
     NEON_CONNECTION_STRING: str = Field(..., description="Neon Database connection string")
     DATABASE_URL: str = Field(..., description="Database connection string")
+
+    # Connection management (see app/db/session.py)
+    DB_POOL_STRATEGY: Literal["auto", "queue", "null"] = Field("auto", description="'queue' keeps a connection pool, 'null' opens a connection per checkout, 'auto' picks 'null' on serverless platforms")
+    DB_USE_NEON_POOLER: bool = Field(False, description="Connect through Neon's pooled (-pooler) endpoint")
+    DB_POOL_SIZE: int = Field(10, ge=1, description="Connections kept open by the queue pool")
+    DB_MAX_OVERFLOW: int = Field(5, ge=0, description="Extra connections the queue pool may open under load")
+    DB_POOL_TIMEOUT_SECONDS: int = Field(30, ge=1, description="How long a request waits for a pooled connection before failing")
+    DB_POOL_RECYCLE_SECONDS: int = Field(300, ge=-1, description="Replace pooled connections older than this (-1 never); keep below Neon's idle suspend")
+    DB_POOL_PRE_PING: bool = Field(True, description="Check a pooled connection is alive before handing it out")
+    DB_CONNECT_TIMEOUT_SECONDS: int = Field(10, ge=1, description="Timeout for opening a new Postgres connection")
+    DB_TCP_KEEPALIVE: bool = Field(True, description="Enable TCP keep-alives on Postgres connections")
+    DB_KEEPALIVE_IDLE_SECONDS: int = Field(30, ge=1, description="Idle seconds before the first TCP keep-alive probe")
+    DB_REPORT_ACQUIRE_TIMING: bool = Field(True, description="Report per-request connection acquire time in a Server-Timing header")
+    DB_SLOW_ACQUIRE_MS: float = Field(250, ge=0, description="Log requests that spent at least this long acquiring connections")
+    DB_REQUEST_STATS: bool = Field(False, description="Count statements, database and serialization time per request; report them in Server-Timing and an INFO log line")
+
+    # Query budgets (see app/db/query_budget.py)
+    QUERY_BUDGETS: Literal["off", "warn", "enforce"] = Field("off", description="Check each request's statement count against its endpoint's budget: 'warn' logs overruns, 'enforce' turns them into 500s (for tests)")
+    QUERY_BUDGET_DEFAULT: int = Field(0, ge=0, description="Budget for endpoints that declare none (0 leaves them unchecked)")
+    QUERY_REPEAT_THRESHOLD: int = Field(3, ge=2, description="Flag a request that runs the same statement shape this many times (likely N+1)")
+
+    # Metrics (see app/core/metrics.py)
+    METRICS_ENABLED: bool = Field(True, description="Record request, threadpool, pool, bcrypt and cache metrics and serve them at /api/health/metrics")
     
     # JWT settings
     JWT_SECRET: str = Field(..., min_length=16, description="Secret key for JWT encoding")
     JWT_ALGORITHM: str = Field("HS256", description="Algorithm used for JWT encoding")
     JWT_EXPIRE_MINUTES: int = Field(30, description="JWT token expiration time in minutes")
+
+    # Authenticated principal caching
+    AUTH_TRUST_TOKEN_CLAIMS: bool = Field(False, description="Authorize from verified token claims without loading the user from the database")
+    PRINCIPAL_CACHE_TTL_SECONDS: int = Field(60, ge=0, description="How long an authenticated user is cached after its database lookup")
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = Field(1024, ge=1, description="Maximum number of cached principals (least recently used are evicted)")
     
+    # Password hashing (see app/core/password_hashing.py)
+    BCRYPT_ROUNDS: int = Field(12, ge=4, le=31, description="bcrypt cost factor for new hashes; older hashes are upgraded on login")
+    PASSWORD_HASH_EXECUTOR: Literal["auto", "process", "thread"] = Field("auto", description="Worker pool for bcrypt; 'auto' uses threads on serverless platforms and processes elsewhere")
+    PASSWORD_HASH_WORKERS: int = Field(0, ge=0, description="Hashing workers (0 uses the CPU count)")
+    PASSWORD_HASH_MAX_PENDING: int = Field(32, ge=0, description="Hashing jobs allowed to wait for a worker before requests get 503")
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = Field(1, ge=1, description="Retry-After sent with 503 when the hashing pool is full")
+
+    # Login throttling (see app/core/login_throttle.py)
+    LOGIN_MAX_FAILURES: int = Field(5, ge=1, description="Failed logins per email before further attempts are refused")
+    LOGIN_MAX_FAILURES_PER_IP: int | None = Field(None, ge=1, description="Failed logins per client address before further attempts are refused (unset: no per-address limit)")
+    LOGIN_TRUSTED_PROXIES: str = Field("", description="Comma-separated addresses or networks of the reverse proxies in front of the app, whose X-Forwarded-For is trusted; '*' trusts whichever peer connects (Vercel)")
+    LOGIN_LOCKOUT_SECONDS: int = Field(300, ge=1, description="How long logins stay refused after the last counted failure")
+    LOGIN_THROTTLE_MAX_ENTRIES: int = Field(10000, ge=1, description="Maximum number of tracked emails and addresses")
+
     # Optional settings with defaults
     DEBUG: bool = Field(False, description="Enable debug mode")
     HOST: str = Field("0.0.0.0", description="Host to bind the application to")
     PORT: int = Field(8000, description="Port to run the application on")
+
+    # DataTables record counts
+    COUNT_CACHE_TTL_SECONDS: int = Field(60, ge=0, description="How long cached recordsTotal values are served before recounting")
+    COUNT_ESTIMATE_MIN_ROWS: int = Field(0, ge=0, description="Serve recordsFiltered from the Postgres planner estimate once it reaches this many rows (0 always counts exactly)")
+
+    # Reference data cache (gases, statuses, roles, companies)
+    REFERENCE_CACHE_TTL_SECONDS: int = Field(300, ge=0, description="How long reference data is served from memory before reloading")
+
+    # Admin dashboard
+    DASHBOARD_SOURCE: Literal["stats", "live"] = Field("stats", description="'stats' reads the dashboard_stats totals, 'live' aggregates orders on each load")
+    DASHBOARD_CACHE_TTL_SECONDS: int = Field(15, ge=0, description="How long dashboard insights are served from memory; writes in this process refresh them sooner")
+
+    # Bulk order import
+    ORDER_IMPORT_CHUNK_SIZE: int = Field(500, ge=1, description="Orders inserted per batch by the bulk import endpoint")
+
+    # Bulk order updates
+    ORDER_BULK_UPDATE_MAX_ORDERS: int = Field(500, ge=1, description="Most orders one PATCH /api/orders/bulk may change")
+
+    # Live order stream (see app/utils/order_events.py)
+    ORDER_EVENTS_TRANSPORT: Literal["auto", "local", "postgres"] = Field("auto", description="'local' streams changes made in this process, 'postgres' relays them between instances with LISTEN/NOTIFY, 'auto' picks 'postgres' on a Postgres database")
+    ORDER_STREAM_MAX_CLIENTS: int = Field(200, ge=1, description="Open order streams allowed per process before new ones get 503")
+    ORDER_STREAM_QUEUE_SIZE: int = Field(100, ge=1, description="Events buffered per stream; a client further behind is told to resync")
+    ORDER_STREAM_PING_SECONDS: int = Field(15, ge=1, description="Idle interval after which a keep-alive comment is sent on the stream")
+    ORDER_STREAM_TOKEN_SECONDS: int = Field(60, ge=1, description="How long a stream token from POST /api/orders/stream/token can open the stream")
+
+    # Response serialization (see app/core/fast_json.py)
+    RESPONSE_SERIALIZATION: Literal["fast", "pydantic"] = Field("fast", description="'fast' writes hot list responses straight from SQL rows with orjson, 'pydantic' validates them through the response models")
+
+    # Startup
+    LAZY_ROUTERS: Literal["auto", "on", "off"] = Field("auto", description="Import rarely used routers on their first request; 'auto' enables it on serverless platforms")
+
+    # Async database stack
+    ASYNC_ROUTERS: str = Field("", description="Comma-separated routers served by async handlers on the AsyncEngine (orders, dashboard, companies)")
+    ASYNC_DB_POOL_SIZE: int = Field(20, ge=1, description="Connections kept open by the async engine")
+    ASYNC_DB_MAX_OVERFLOW: int = Field(10, ge=0, description="Extra connections the async engine may open under load")
     
     # Configuration for loading environment variables
     class Config:
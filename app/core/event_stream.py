@@ -0,0 +1,186 @@
+"""
+Event Stream
+------------
+In-process publish/subscribe behind the Server-Sent Events endpoints.
+
+- A `Broker` fans each published event out to every subscriber in this
+  process. `publish` may be called from any thread (sync routes run in the
+  threadpool); delivery is handed to each subscriber's event loop.
+- Subscribers are bounded queues. One that falls more than its queue size
+  behind gets a single RESYNC event instead of the backlog, so a slow client
+  never holds memory or slows down publishers. The number of subscribers is
+  capped too; beyond it `subscribe` answers 503.
+- `PostgresRelay` carries events between instances: writers NOTIFY a channel
+  inside their transaction (delivered only if it commits) and a listener
+  thread in every instance publishes what it receives to the local broker.
+  After a lost connection it reconnects and publishes RESYNC, since
+  notifications sent meanwhile are gone.
+"""
+
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from typing import AsyncIterator, Callable, Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.messages.messages import Message
+
+logger = logging.getLogger(__name__)
+
+# Sent when a subscriber may have missed events; clients reload their data
+RESYNC = {"type": "resync"}
+
+# Client reconnect delay announced in the stream
+RETRY_MILLISECONDS = 3000
+
+
+class Subscription:
+    """One client's queue of pending events. Create it on the event loop."""
+
+    def __init__(self, max_pending: int):
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(max_pending)
+
+    def deliver(self, event: dict):
+        """Runs on `self.loop`."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def next(self, timeout: float) -> Optional[dict]:
+        """The next event, or None if none arrived within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broker:
+    def __init__(self, name: str, max_subscribers: int, max_pending: int):
+        self.name = name
+        self.max_subscribers = max_subscribers
+        self.max_pending = max_pending
+        self._subscribers: set = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, retry_after: int) -> Subscription:
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=Message.Error.STREAM_BUSY,
+                    headers={"Retry-After": str(retry_after)},
+                )
+            subscription = Subscription(self.max_pending)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: dict):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # Its loop has shut down; the stream's cleanup never ran
+                self.unsubscribe(subscription)
+
+
+def sse_frame(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, separators=(',', ':'), default=str)}\n\n"
+
+
+async def sse_stream(
+    request: Request, broker: Broker, subscription: Subscription, ping_seconds: float
+) -> AsyncIterator[str]:
+    """
+    Server-Sent Events for `subscription` until the client disconnects. A
+    comment line is sent when nothing happened for `ping_seconds`, which keeps
+    proxies from closing the idle connection and notices departed clients.
+    """
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        while True:
+            event = await subscription.next(ping_seconds)
+            if event is not None:
+                yield sse_frame(event)
+            elif await request.is_disconnected():
+                break
+            else:
+                yield ": ping\n\n"
+    finally:
+        broker.unsubscribe(subscription)
+
+
+class PostgresRelay:
+    """
+    LISTEN on `channel` in a daemon thread and publish each notification's
+    JSON payload to `broker`. `connect` returns a new psycopg2 connection;
+    it must reach Postgres directly, since LISTEN does not work through a
+    transaction-mode pooler such as PgBouncer.
+    """
+
+    POLL_SECONDS = 5
+    RECONNECT_SECONDS = 5
+
+    def __init__(self, broker: Broker, channel: str, connect: Callable):
+        self.broker = broker
+        self.channel = channel
+        self.connect = connect
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"{self.broker.name}-relay", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        reconnecting = False
+        while True:
+            connection = None
+            try:
+                connection = self.connect()
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{self.channel}"')
+                if reconnecting:
+                    self.broker.publish(RESYNC)
+                reconnecting = True
+                self._listen(connection)
+            except Exception:
+                logger.warning("%s relay lost its Postgres connection; reconnecting", self.broker.name, exc_info=True)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+            time.sleep(self.RECONNECT_SECONDS)
+
+    def _listen(self, connection):
+        while True:
+            if select.select([connection], [], [], self.POLL_SECONDS) == ([], [], []):
+                continue
+            connection.poll()
+            while connection.notifies:
+                notification = connection.notifies.pop(0)
+                try:
+                    self.broker.publish(json.loads(notification.payload))
+                except ValueError:
+                    logger.warning("%s relay ignored a malformed payload", self.broker.name)
@@ -0,0 +1,65 @@
+"""
+Fast JSON Responses
+-------------------
+Hot read endpoints can build their APIResponse envelope from plain dicts and
+write it with orjson in one step, instead of validating a Pydantic model per
+row, wrapping them in APIResponse(data=Any) and having FastAPI validate and
+serialize the envelope again through response_model.
+
+FastAPI returns a Response instance as it is, so the route's response_model
+still documents the payload in OpenAPI but is not applied. Callers are
+responsible for producing exactly what that model would: the services'
+`to_*_dicts` row builders mirror their response models field for field, and
+scripts/bench_serialization.py checks both paths give the same JSON.
+
+RESPONSE_SERIALIZATION=pydantic turns the fast path off.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+import orjson
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.db.instrumentation import record_serialization
+
+# Asia/Kolkata has no daylight saving; a fixed offset converts several times faster than ZoneInfo
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+def enabled() -> bool:
+    return settings.RESPONSE_SERIALIZATION == "fast"
+
+
+def ist(moment: datetime) -> datetime:
+    """A timestamp as the response models serialize it: naive means UTC, shown in IST."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(IST)
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content)
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        started = time.perf_counter()
+        try:
+            return dumps(content)
+        finally:
+            record_serialization(time.perf_counter() - started)
+
+
+def api_response(data: Any, status_code: int, message: str, technical_message: Optional[str] = None) -> FastJSONResponse:
+    """The APIResponse envelope around `data` (plain dicts, lists and datetimes)."""
+    return FastJSONResponse(
+        {"data": data, "statusCode": status_code, "message": message, "technicalMessage": technical_message},
+        status_code=status_code,
+    )
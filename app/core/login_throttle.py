@@ -0,0 +1,91 @@
+"""
+Login Throttling
+----------------
+Counts failed logins per email and per client address in memory. Once
+either reaches its limit, further attempts are refused with 429 until
+LOGIN_LOCKOUT_SECONDS have passed since the last failure, before any
+password is hashed. A successful login clears the email's counter.
+
+Counters are per process, so on several instances the effective limit is
+the configured one times the instance count.
+
+The per-address limit is off unless LOGIN_MAX_FAILURES_PER_IP is set. Behind
+a reverse proxy every request arrives from the proxy's address, so set
+LOGIN_TRUSTED_PROXIES as well: the client address is then read from
+X-Forwarded-For, right to left, skipping the trusted proxies. Entries added
+before the first trusted hop are client-supplied and never used. '*' trusts
+the peer whatever its address (Vercel) and takes the hop it appended.
+"""
+
+import ipaddress
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.messages.messages import Message
+
+_failures = TTLCache("login_failures", settings.LOGIN_LOCKOUT_SECONDS, max_entries=settings.LOGIN_THROTTLE_MAX_ENTRIES)
+
+
+def _parse_trusted_proxies(value: str):
+    entries = [entry.strip() for entry in value.split(",") if entry.strip()]
+    if "*" in entries:
+        return "*"
+    return [ipaddress.ip_network(entry, strict=False) for entry in entries]
+
+
+_trusted_proxies = _parse_trusted_proxies(settings.LOGIN_TRUSTED_PROXIES)
+
+
+def _is_trusted_proxy(address: str) -> bool:
+    if _trusted_proxies == "*":
+        return True
+    try:
+        parsed = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(parsed in network for network in _trusted_proxies)
+
+
+def client_address(request: Request) -> Optional[str]:
+    """
+    The address failures are counted against: the peer, or when the peer is a
+    trusted proxy, the nearest X-Forwarded-For hop that is not one.
+    """
+    if not request.client:
+        return None
+    hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    address = request.client.host
+    while hops and _is_trusted_proxy(address):
+        address = hops.pop()
+        if _trusted_proxies == "*":
+            break   # only the peer is known to be a proxy; the hop it appended is the client
+    return address
+
+
+def _keys(email: str, client_ip: Optional[str]) -> list[tuple[tuple, int]]:
+    keys = [(("email", email.lower()), settings.LOGIN_MAX_FAILURES)]
+    if client_ip and settings.LOGIN_MAX_FAILURES_PER_IP is not None:
+        keys.append((("ip", client_ip), settings.LOGIN_MAX_FAILURES_PER_IP))
+    return keys
+
+
+def check_login_allowed(email: str, client_ip: Optional[str]):
+    for key, limit in _keys(email, client_ip):
+        if _failures.get(key, 0) >= limit:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=Message.Error.TOO_MANY_LOGIN_ATTEMPTS,
+                headers={"Retry-After": str(settings.LOGIN_LOCKOUT_SECONDS)},
+            )
+
+
+def record_login_failure(email: str, client_ip: Optional[str]):
+    for key, _ in _keys(email, client_ip):
+        _failures.set(key, _failures.get(key, 0) + 1)
+
+
+def record_login_success(email: str):
+    _failures.invalidate(("email", email.lower()))
@@ -0,0 +1,314 @@
+"""
+Metrics
+-------
+Process metrics in the Prometheus text format, served by
+GET /api/health/metrics:
+
+- quickgas_http_request_duration_seconds   latency histogram per route template
+- quickgas_http_requests_total             requests per route and status
+- quickgas_http_requests_in_flight         requests being served
+- quickgas_threadpool_*                    sync endpoint threadpool: busy threads, tasks waiting
+- quickgas_db_pool_*                       SQLAlchemy pool: size, checked out, overflow
+- quickgas_password_hash_*                 bcrypt job latency (queue wait + hashing) and 503s
+- quickgas_cache_*                         in-process cache hits, misses, hit ratio and size
+
+Counters and histograms are sharded per thread: a thread only ever writes its
+own shard and a scrape sums them, so recording takes no lock and concurrent
+requests never contend on a metric. Gauges of other components (pools,
+caches) are read when scraped, so they cost nothing in between.
+
+METRICS_ENABLED=false removes the middleware and makes the endpoint 404.
+"""
+
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+# Seconds; request latency spans cached reads (~1 ms) to cold serverless starts
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# bcrypt at BCRYPT_ROUNDS 10-14 takes 50 ms - 1.5 s, plus queueing
+HASH_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]   # (suffix, labels, value)
+
+_registry: List["Metric"] = []
+
+
+class _Shards:
+    """One value per thread, created on first use; readers see every thread's shard."""
+
+    def __init__(self, factory: Callable):
+        self._factory = factory
+        self._local = threading.local()
+        self._all: list = []    # appended once per thread; list.append is atomic
+
+    def mine(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = self._factory()
+            self._all.append(shard)
+        return shard
+
+    def snapshot(self) -> list:
+        return [shard.copy() for shard in list(self._all)]
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        _registry.append(self)
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """A value per label set that threads add to; with negative amounts it doubles as a gauge."""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), kind: Optional[str] = None):
+        super().__init__(name, help, labelnames)
+        if kind is not None:
+            self.kind = kind
+        self._shards = _Shards(dict)
+
+    def inc(self, labels: Labels = (), amount: float = 1):
+        shard = self._shards.mine()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def dec(self, labels: Labels = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+    def values(self) -> Dict[Labels, float]:
+        totals: Dict[Labels, float] = {}
+        for shard in self._shards.snapshot():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in sorted(self.values().items()):
+            yield "", dict(zip(self.labelnames, labels)), value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        self._shards = _Shards(dict)
+
+    def observe(self, value: float, labels: Labels = ()):
+        shard = self._shards.mine()
+        counts = shard.get(labels)
+        if counts is None:
+            # one slot per bucket, then +Inf, then the sum
+            counts = shard[labels] = [0] * (len(self.buckets) + 2)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def samples(self) -> Iterable[Sample]:
+        totals: Dict[Labels, list] = {}
+        for shard in self._shards.snapshot():
+            for labels, counts in shard.items():
+                merged = totals.setdefault(labels, [0] * len(counts))
+                for index, count in enumerate(list(counts)):
+                    merged[index] += count
+        for labels, counts in sorted(totals.items()):
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield "_bucket", {**base, "le": _format_value(bound)}, cumulative
+            yield "_count", base, cumulative
+            yield "_sum", base, counts[-1]
+
+
+class ScrapedMetric(Metric):
+    """A metric whose samples are read from another component when scraped."""
+
+    def __init__(self, name: str, help: str, read: Callable[[], Iterable[Tuple[Dict[str, str], float]]],
+                 kind: str = "gauge"):
+        super().__init__(name, help)
+        self.kind = kind
+        self._read = read
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in self._read():
+            yield "", labels, value
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        key + '="' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def render() -> str:
+    """Every registered metric in the Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for metric in _registry:
+        samples = list(metric.samples())
+        if not samples:
+            continue
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for suffix, labels, value in samples:
+            lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# --- HTTP requests (MetricsMiddleware) ---
+
+REQUEST_DURATION = Histogram("quickgas_http_request_duration_seconds", "Time to serve a request, by route template",
+                             ("method", "route"))
+REQUESTS = Counter("quickgas_http_requests_total", "Requests served, by route template and status",
+                   ("method", "route", "status"))
+IN_FLIGHT = Counter("quickgas_http_requests_in_flight", "Requests being served", kind="gauge")
+
+
+def route_template(scope) -> str:
+    """The matched route's path template with its router prefix (/api/orders/{order_id}), or "unmatched"."""
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    path = scope.get("path", "")
+    try:
+        rendered = template.format(**{key: str(value) for key, value in scope.get("path_params", {}).items()})
+    except (KeyError, IndexError, ValueError):
+        return template
+    # Routers are included under a prefix the route itself does not carry
+    return path[:-len(rendered)] + template if rendered and path.endswith(rendered) else template
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and in-flight count of every HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            IN_FLIGHT.dec()
+            method, route = scope.get("method", ""), route_template(scope)
+            REQUEST_DURATION.observe(time.perf_counter() - started, (method, route))
+            REQUESTS.inc((method, route, str(status["code"])))
+
+
+# --- Request threadpool (sync endpoints and dependencies run here) ---
+
+def _threadpool():
+    """anyio's default thread limiter; readable only from the event loop (the metrics endpoint is async)."""
+    from anyio import to_thread
+    try:
+        return to_thread.current_default_thread_limiter().statistics()
+    except RuntimeError:
+        return None
+
+
+def _threadpool_gauge(field: str):
+    def read():
+        statistics = _threadpool()
+        return [({}, getattr(statistics, field))] if statistics is not None else []
+    return read
+
+
+ScrapedMetric("quickgas_threadpool_threads", "Threads the request threadpool may use",
+               _threadpool_gauge("total_tokens"))
+ScrapedMetric("quickgas_threadpool_threads_busy", "Request threadpool threads running a task",
+               _threadpool_gauge("borrowed_tokens"))
+ScrapedMetric("quickgas_threadpool_tasks_waiting", "Tasks queued for a free request threadpool thread",
+               _threadpool_gauge("tasks_waiting"))
+
+
+# --- Database connection pools ---
+
+def _pools():
+    """(engine label, pool) of the engines created so far; scraping never creates one."""
+    from app.db import async_session, session
+
+    engines = [("sync", session.existing_engine())]
+    async_engine = async_session.existing_engine()
+    engines.append(("async", async_engine.sync_engine if async_engine is not None else None))
+    # NullPool keeps no connections and has no size to report
+    return [(label, engine.pool) for label, engine in engines
+            if engine is not None and hasattr(engine.pool, "checkedout")]
+
+
+def _pool_gauge(read_pool: Callable) -> Callable:
+    return lambda: [({"engine": label}, read_pool(pool)) for label, pool in _pools()]
+
+
+ScrapedMetric("quickgas_db_pool_size", "Connections the pool keeps open", _pool_gauge(lambda pool: pool.size()))
+ScrapedMetric("quickgas_db_pool_checked_out", "Connections in use by requests",
+               _pool_gauge(lambda pool: pool.checkedout()))
+ScrapedMetric("quickgas_db_pool_checked_in", "Idle connections in the pool", _pool_gauge(lambda pool: pool.checkedin()))
+ScrapedMetric("quickgas_db_pool_overflow", "Connections open beyond the pool size (DB_MAX_OVERFLOW)",
+               _pool_gauge(lambda pool: max(pool.overflow(), 0)))
+
+
+# --- Password hashing (app/core/password_hashing.py) ---
+
+PASSWORD_HASH_DURATION = Histogram("quickgas_password_hash_seconds",
+                                   "bcrypt job latency from submission to result, queue wait included",
+                                   ("operation",), HASH_BUCKETS)
+PASSWORD_HASH_REJECTED = Counter("quickgas_password_hash_rejected_total",
+                                 "bcrypt jobs refused with 503 because the hashing pool was full", ("operation",))
+PASSWORD_HASH_IN_FLIGHT = Counter("quickgas_password_hash_in_flight", "bcrypt jobs queued or running", kind="gauge")
+
+
+# --- In-process caches (app/core/cache.py) ---
+
+def _cache_gauge(field: str, transform: Callable = lambda value: value) -> Callable:
+    def read():
+        from app.core.cache import cache_stats
+        return [({"cache": name}, transform(stats[field])) for name, stats in sorted(cache_stats().items())
+                if stats[field] is not None]
+    return read
+
+
+ScrapedMetric("quickgas_cache_hits_total", "Cache lookups served from memory", _cache_gauge("hits"), "counter")
+ScrapedMetric("quickgas_cache_misses_total", "Cache lookups that had to load", _cache_gauge("misses"), "counter")
+ScrapedMetric("quickgas_cache_hit_ratio", "Hits over lookups since the process started", _cache_gauge("hit_ratio"))
+ScrapedMetric("quickgas_cache_entries", "Entries held", _cache_gauge("size"))
+
+
+def enabled() -> bool:
+    return settings.METRICS_ENABLED
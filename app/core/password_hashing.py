@@ -0,0 +1,188 @@
+"""
+Password Hashing
+----------------
+bcrypt hashing and verification run on a dedicated worker pool instead of
+the request threads, so a burst of logins cannot starve the threadpool (or,
+with threads, the GIL) that every other endpoint is served from.
+
+- PASSWORD_HASH_EXECUTOR picks the pool: "process" scales across cores,
+  "thread" suits platforms without multiprocessing support (bcrypt releases
+  the GIL while hashing), "auto" uses threads on serverless platforms.
+- Work is bounded: at most PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_PENDING
+  jobs are accepted at once. Beyond that callers get 503 with Retry-After
+  instead of queueing without limit.
+- A process pool whose worker died (OOM kill, crash) refuses every job after
+  it. Jobs it lost get 503 and the next one replaces the pool, so logins
+  recover without a restart.
+- BCRYPT_ROUNDS sets the cost of new hashes. `needs_rehash()` reports hashes
+  made with a different cost so login can upgrade them transparently.
+
+Async handlers await the `*_async` functions; sync code (services running
+in the request threadpool) calls the blocking ones.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_DURATION, PASSWORD_HASH_IN_FLIGHT, PASSWORD_HASH_REJECTED
+from app.messages.messages import Message
+
+_executor: Optional[Executor] = None
+_slots: Optional[threading.BoundedSemaphore] = None
+_executor_lock = threading.Lock()
+
+
+# Worker-side functions: module level so a process pool can pickle them.
+
+@lru_cache(maxsize=None)
+def _bcrypt(rounds: int):
+    from passlib.hash import bcrypt
+    return bcrypt.using(rounds=rounds)
+
+
+def _hash(password: str, rounds: int) -> str:
+    return _bcrypt(rounds).hash(password)
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    from passlib.hash import bcrypt
+    return bcrypt.verify(password, hashed_password)
+
+
+def worker_count() -> int:
+    return settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+
+
+def executor_kind() -> str:
+    kind = settings.PASSWORD_HASH_EXECUTOR
+    if kind == "auto":
+        from app.db.session import is_serverless
+        return "thread" if is_serverless() else "process"
+    return kind
+
+
+def _get_executor() -> tuple[Executor, threading.BoundedSemaphore]:
+    """Return the process-wide executor and its admission slots, creating them on first use."""
+    global _executor, _slots
+    # Under the lock so the pair is never read halfway through a replacement
+    with _executor_lock:
+        if _executor is None:
+            workers = worker_count()
+            if executor_kind() == "process":
+                # forkserver: workers do not inherit the server's threads and sockets
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+            else:
+                executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+            _slots = threading.BoundedSemaphore(workers + settings.PASSWORD_HASH_MAX_PENDING)
+            _executor = executor
+        return _executor, _slots
+
+
+def _discard_executor(broken: Executor):
+    """Drop a broken pool so the next job creates a fresh one (unless another thread already did)."""
+    global _executor, _slots
+    with _executor_lock:
+        if _executor is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            _executor = _slots = None
+
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=Message.Error.AUTH_BUSY,
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+    )
+
+
+def _submit(fn, *args) -> Future:
+    """Queue a hashing job, or raise 503 when the pool is saturated."""
+    operation = (fn.__name__.lstrip("_"),)   # "hash" or "verify"
+    for _ in range(2):
+        executor, slots = _get_executor()
+        if not slots.acquire(blocking=False):
+            PASSWORD_HASH_REJECTED.inc(operation)
+            raise _busy()
+        started = time.perf_counter()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died since the last job: replace the pool and resubmit once
+            slots.release()
+            _discard_executor(executor)
+            continue
+        except BaseException:
+            slots.release()
+            raise
+        PASSWORD_HASH_IN_FLIGHT.inc()
+
+        def finished(_, slots=slots, started=started):
+            slots.release()
+            PASSWORD_HASH_IN_FLIGHT.dec()
+            PASSWORD_HASH_DURATION.observe(time.perf_counter() - started, operation)
+
+        future.add_done_callback(finished)
+        return future
+    raise _busy()
+
+
+def _result(future: Future):
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        # The job was running when a worker died; the next _submit replaces the pool
+        raise _busy()
+
+
+async def _result_async(future: Future):
+    try:
+        return await asyncio.wrap_future(future)
+    except BrokenProcessPool:
+        raise _busy()
+
+
+def hash_password(password: str) -> str:
+    return _result(_submit(_hash, password, settings.BCRYPT_ROUNDS))
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    return _result(_submit(_verify, password, hashed_password))
+
+
+async def hash_password_async(password: str) -> str:
+    return await _result_async(_submit(_hash, password, settings.BCRYPT_ROUNDS))
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    return await _result_async(_submit(_verify, password, hashed_password))
+
+
+def hash_rounds(hashed_password: str) -> Optional[int]:
+    """Cost factor of a bcrypt hash ($2b$12$...), or None if it is not one."""
+    parts = hashed_password.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    return hash_rounds(hashed_password) != settings.BCRYPT_ROUNDS
+
+
+def shutdown():
+    global _executor, _slots
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = _slots = None
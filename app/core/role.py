@@ -1,7 +1,6 @@
 from fastapi import HTTPException, status , Depends
-from app.models.users import User
 from app.messages.messages import Message
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_current_user_async, get_stream_user, CurrentUser
 
 class Role:
     ADMIN = 1
@@ -9,8 +8,11 @@ class Role:
     DRIVER = 3
     CUSTOMER = 4
 
-def require_role(required_role: int):
-    def role_checker(current_user: User = Depends(get_current_user)):
+# The checkers are async so they run on the event loop; `user_dependency`
+# selects how the principal is resolved (sync session or async stack).
+
+def require_role(required_role: int, user_dependency=get_current_user):
+    async def role_checker(current_user: CurrentUser = Depends(user_dependency)):
         if current_user.role_id != required_role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -25,8 +27,8 @@ DispatcherOnly = require_role(Role.DISPATCHER)
 DriverOnly = require_role(Role.DRIVER)
 CustomerOnly = require_role(Role.CUSTOMER)
 
-def require_roles(required_roles: list[int]):
-    def roles_checker(current_user: User = Depends(get_current_user)):
+def require_roles(required_roles: list[int], user_dependency=get_current_user):
+    async def roles_checker(current_user: CurrentUser = Depends(user_dependency)):
         if current_user.role_id not in required_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -37,4 +39,11 @@ def require_roles(required_roles: list[int]):
 
 # Common role combinations
 AdminOrDispatcher = require_roles([Role.ADMIN, Role.DISPATCHER])
-StaffOnly = require_roles([Role.ADMIN, Role.DISPATCHER, Role.DRIVER])
\ No newline at end of file
+StaffOnly = require_roles([Role.ADMIN, Role.DISPATCHER, Role.DRIVER])
+
+# Same checks for async routers
+AsyncAdminOnly = require_role(Role.ADMIN, get_current_user_async)
+AsyncStaffOnly = require_roles([Role.ADMIN, Role.DISPATCHER, Role.DRIVER], get_current_user_async)
+
+# Long-lived streams (token may come from the query string, no session held)
+StreamStaffOnly = require_roles([Role.ADMIN, Role.DISPATCHER, Role.DRIVER], get_stream_user)
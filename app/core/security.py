@@ -1,9 +1,13 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import logging
 import jwt
 from app.core.config import settings
-from passlib.context import CryptContext
+from app.core import password_hashing
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
+
+# `scope` claim of tokens that only open the order stream (see create_stream_token)
+STREAM_TOKEN_SCOPE = "order_stream"
 
 def create_access_token(user: dict, expires_minutes: int | None = None) -> str:
     expire = datetime.now() + timedelta(minutes=(expires_minutes or settings.JWT_EXPIRE_MINUTES))
@@ -17,22 +21,36 @@ def create_access_token(user: dict, expires_minutes: int | None = None) -> str:
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
+def create_stream_token(user_id: int, role_id: int) -> str:
+    """
+    A short-lived token that can only open the order stream. EventSource sends
+    it in the URL, where it may be logged, so it is useless as a bearer token
+    and expires after ORDER_STREAM_TOKEN_SECONDS.
+    """
+    to_encode = {
+        "sub": str(user_id),
+        "role_id": role_id,
+        "scope": STREAM_TOKEN_SCOPE,
+        "exp": datetime.now(timezone.utc) + timedelta(seconds=settings.ORDER_STREAM_TOKEN_SECONDS),
+    }
+    return jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+
 def decode_token(token: str):
     try:
         payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
         return payload
     except jwt.ExpiredSignatureError:
-        print("Token expired")
+        logger.debug("Token expired")
         return None
     except jwt.InvalidTokenError:
-        print("Invalid token")
+        logger.debug("Invalid token")
         return None
     except jwt.PyJWTError: 
         return None
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_hashing.hash_password(password)
 
 def verify_password_hash(password: str,hashed_password: str) -> bool:
-    return pwd_context.verify(password, hashed_password)
+    return password_hashing.verify_password(password, hashed_password)
 
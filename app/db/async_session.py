@@ -0,0 +1,92 @@
+"""
+Async Database Session
+----------------------
+AsyncEngine and AsyncSession factory for routers served by the async stack
+(see ASYNC_ROUTERS in settings).
+
+The engine talks to the same database as app/db/session.py, through asyncpg
+for Postgres (aiosqlite for local SQLite URLs). It is created on first use,
+so the async driver is only needed when an async router is enabled.
+"""
+
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.db.instrumentation import TimedAsyncAdaptedQueuePool, TimedNullPool, count_new_connection, listen_for_statements, statement_hooks_enabled
+from app.db.session import POOL_NULL, database_url, pool_strategy
+
+# libpq connection options asyncpg does not understand
+_LIBPQ_ONLY_OPTIONS = ("sslmode", "channel_binding")
+
+_engine: Optional[AsyncEngine] = None
+
+
+def async_database_url(url: str | URL) -> tuple[URL, dict]:
+    """
+    Convert a sync connection string to its async driver, returning the URL
+    and the connect_args it needs.
+
+    Neon strings carry `sslmode=require&channel_binding=require`, which asyncpg
+    rejects as keyword arguments; sslmode is passed as asyncpg's `ssl` instead.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    connect_args = {}
+
+    if backend == "postgresql":
+        sslmode = url.query.get("sslmode")
+        url = url.set(drivername="postgresql+asyncpg").difference_update_query(_LIBPQ_ONLY_OPTIONS)
+        if sslmode:
+            connect_args["ssl"] = sslmode
+    elif backend == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+
+    return url, connect_args
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Return the process-wide AsyncEngine, creating it on first use. It follows
+    the sync engine's URL (including DB_USE_NEON_POOLER) and DB_POOL_STRATEGY.
+    """
+    global _engine
+    if _engine is None:
+        url, connect_args = async_database_url(database_url())
+        options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+        if pool_strategy() == POOL_NULL:
+            options["poolclass"] = TimedNullPool
+        else:
+            options.update(
+                poolclass=TimedAsyncAdaptedQueuePool,
+                pool_size=settings.ASYNC_DB_POOL_SIZE,
+                max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+                pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            )
+        _engine = create_async_engine(url, connect_args=connect_args, echo=False, **options)
+        event.listen(_engine.sync_engine, "connect", count_new_connection)
+        if statement_hooks_enabled():
+            listen_for_statements(_engine.sync_engine)
+    return _engine
+
+
+def existing_engine() -> Optional[AsyncEngine]:
+    """The engine if it has been created, without creating it (for metrics)."""
+    return _engine
+
+
+class _LazyAsyncSessionmaker(async_sessionmaker):
+    """async_sessionmaker that binds to the engine from get_async_engine()."""
+
+    def __call__(self, **local_kw):
+        local_kw.setdefault("bind", get_async_engine())
+        return super().__call__(**local_kw)
+
+
+# expire_on_commit=False: attribute access after commit would otherwise need
+# an implicit (and, under asyncio, illegal) refresh.
+AsyncSessionLocal = _LazyAsyncSessionmaker(autoflush=False, expire_on_commit=False)
@@ -1,4 +1,12 @@
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.sql import functions
 
 class Base(DeclarativeBase):
-    pass
\ No newline at end of file
+    pass
+
+@compiles(functions.now, "sqlite")
+def _sqlite_now(element, compiler, **kw):
+    # CURRENT_TIMESTAMP has whole-second resolution; updated_at doubles as
+    # the version checked by bulk order updates, so keep milliseconds
+    return "strftime('%Y-%m-%d %H:%M:%f', 'now')"
@@ -0,0 +1,268 @@
+"""
+Database Request Instrumentation
+--------------------------------
+Per-request accounting of how long the request waited to get database
+connections, reported as a `Server-Timing` header and logged when slow.
+
+Connection acquisition is timed by the pool classes below (used by the
+engines in app/db/session.py and app/db/async_session.py). The time covers
+waiting for a pooled connection, or opening a new one (TCP + TLS + auth)
+when the pool has none or is a NullPool.
+
+With DB_REQUEST_STATS on, the engines also get cursor hooks that count the
+statements a request runs and the time spent executing them, responses
+written by app/core/fast_json.py record their serialization time, and
+every request is reported:
+
+    Server-Timing: db;dur=4.1;desc="6 statements", db-acquire;dur=0.2;desc="1 acquires, 0 new",
+                   serialize;dur=0.9, total;dur=9.8
+
+plus one "request stats" log line at INFO with the same numbers as
+key=value pairs (and as `request_stats` on the record for JSON log
+formatters). The same hooks feed the per-endpoint query budgets of
+app/db/query_budget.py (QUERY_BUDGETS). With both off the hooks are never
+installed, so statements pay nothing.
+"""
+
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from app.core.config import settings
+from app.db.query_budget import endpoint_budget, evaluate, statement_shape
+from app.messages.messages import Message
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestDBStats:
+    """Database usage of one request. Mutated in place by the pool and cursor hooks."""
+    acquires: int = 0
+    new_connections: int = 0
+    acquire_seconds: float = 0.0
+    statements: int = 0
+    statement_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+    shapes: Optional[Counter] = None     # statement shape -> count, kept when QUERY_BUDGETS is on
+
+
+# Set by DBTimingMiddleware for the duration of a request. Worker threads and
+# greenlets inherit a copy of the context, which still points at the same object.
+_current: ContextVar[Optional[RequestDBStats]] = ContextVar("db_request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestDBStats]:
+    return _current.get()
+
+
+@contextmanager
+def collecting(stats: RequestDBStats):
+    """Charge database work done inside the block to `stats`."""
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+class _AcquireTimingMixin:
+    """Times Pool.connect() and charges it to the current request, if any."""
+
+    def connect(self):
+        stats = _current.get()
+        if stats is None:
+            return super().connect()
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            stats.acquires += 1
+            stats.acquire_seconds += time.perf_counter() - started
+
+
+class TimedQueuePool(_AcquireTimingMixin, QueuePool):
+    pass
+
+
+class TimedNullPool(_AcquireTimingMixin, NullPool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_AcquireTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def count_new_connection(dbapi_connection, connection_record):
+    """Pool 'connect' event listener: a physical connection was opened."""
+    stats = _current.get()
+    if stats is not None:
+        stats.new_connections += 1
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current.get() is not None:
+        context._stats_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_stats_started", None)
+    if stats is not None and started is not None:
+        stats.statements += 1
+        stats.statement_seconds += time.perf_counter() - started
+        if stats.shapes is not None:
+            stats.shapes[statement_shape(statement)] += 1
+
+
+def statement_hooks_enabled() -> bool:
+    return settings.DB_REQUEST_STATS or settings.QUERY_BUDGETS != "off"
+
+
+def listen_for_statements(engine):
+    """Install the statement hooks on a sync Engine (or an AsyncEngine's sync_engine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def record_serialization(seconds: float):
+    stats = _current.get()
+    if stats is not None:
+        stats.serialize_seconds += seconds
+
+
+class DBTimingMiddleware:
+    """
+    ASGI middleware that collects RequestDBStats for each HTTP request and adds
+
+        Server-Timing: db-acquire;dur=<ms>;desc="<acquires> acquires, <new> new"
+
+    to the response (with DB_REQUEST_STATS, the fuller header and log line
+    described above). Requests whose acquire time exceeds DB_SLOW_ACQUIRE_MS
+    are logged at WARNING, as are requests that break their query budget.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.full = settings.DB_REQUEST_STATS
+        self.budgets = settings.QUERY_BUDGETS
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestDBStats(shapes=Counter() if self.budgets != "off" else None)
+        token = _current.set(stats)
+        started = time.perf_counter()
+        response = {"status": None, "total": None, "replacement": None}
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                budget = None
+                if self.budgets != "off":
+                    report = budget_report(scope, stats)
+                    budget = report.budget
+                    if self.budgets == "enforce" and not report.ok:
+                        message, response["replacement"] = budget_exceeded_response(report)
+                response["status"] = message["status"]
+                response["total"] = time.perf_counter() - started
+                timing = server_timing(stats, response["total"] if self.full else None, budget)
+                if timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", timing.encode("latin-1")))
+                    message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body" and response["replacement"] is not None:
+                if message.get("more_body", False):
+                    return
+                message = {"type": "http.response.body", "body": response["replacement"]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            acquire_ms = stats.acquire_seconds * 1000
+            if stats.acquires and acquire_ms >= settings.DB_SLOW_ACQUIRE_MS:
+                logger.warning(
+                    "slow db acquire: %s %s acquire_ms=%.1f acquires=%d new_connections=%d",
+                    scope.get("method"), scope.get("path"), acquire_ms,
+                    stats.acquires, stats.new_connections,
+                )
+            if self.budgets != "off":
+                report = budget_report(scope, stats)
+                if not report.ok:
+                    logger.warning(
+                        "query budget exceeded: %s %s (%s) %s",
+                        scope.get("method"), scope.get("path"),
+                        getattr(getattr(scope.get("route"), "endpoint", None), "__name__", None), report.describe(),
+                    )
+            if self.full:
+                log_request_stats(scope, response["status"], response["total"], stats)
+
+
+def budget_report(scope, stats: RequestDBStats):
+    budget = endpoint_budget(getattr(scope.get("route"), "endpoint", None))
+    return evaluate(stats.statements, stats.shapes, budget)
+
+
+def budget_exceeded_response(report) -> tuple:
+    """Start message and body of the 500 that replaces a response under QUERY_BUDGETS=enforce."""
+    body = json.dumps({
+        "data": {"statements": report.statements, "budget": report.budget,
+                 "repeated": [{"count": count, "statement": shape} for count, shape in report.repeated]},
+        "statusCode": 500,
+        "message": Message.Error.QUERY_BUDGET_EXCEEDED,
+        "technicalMessage": report.describe(),
+    }).encode()
+    start = {
+        "type": "http.response.start",
+        "status": 500,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    }
+    return start, body
+
+
+def server_timing(stats: RequestDBStats, total_seconds: Optional[float] = None, budget: Optional[int] = None) -> str:
+    """Server-Timing header value; `total_seconds` is given when DB_REQUEST_STATS is on."""
+    metrics = []
+    if total_seconds is not None:
+        statements = f"{stats.statements} statements" + (f", budget {budget}" if budget is not None else "")
+        metrics.append(f'db;dur={stats.statement_seconds * 1000:.1f};desc="{statements}"')
+    if stats.acquires:
+        metrics.append(
+            f'db-acquire;dur={stats.acquire_seconds * 1000:.1f};'
+            f'desc="{stats.acquires} acquires, {stats.new_connections} new"'
+        )
+    if total_seconds is not None:
+        if stats.serialize_seconds:
+            metrics.append(f"serialize;dur={stats.serialize_seconds * 1000:.1f}")
+        metrics.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(metrics)
+
+
+def log_request_stats(scope, status_code: Optional[int], total_seconds: Optional[float], stats: RequestDBStats):
+    fields = {
+        "method": scope.get("method"),
+        "path": scope.get("path"),
+        "status": status_code,
+        "total_ms": round((total_seconds or 0) * 1000, 1),
+        "statements": stats.statements,
+        "db_ms": round(stats.statement_seconds * 1000, 1),
+        "acquires": stats.acquires,
+        "acquire_ms": round(stats.acquire_seconds * 1000, 1),
+        "new_connections": stats.new_connections,
+        "serialize_ms": round(stats.serialize_seconds * 1000, 1),
+    }
+    logger.info(
+        "request stats: %s", " ".join(f"{key}={value}" for key, value in fields.items()),
+        extra={"request_stats": fields},
+    )
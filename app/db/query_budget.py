@@ -0,0 +1,112 @@
+"""
+Query Budgets
+-------------
+Endpoints declare the most SQL statements one request may run:
+
+    @router.put("/{order_id}", response_model=APIResponse)
+    @query_budget(6)
+    def update_order_endpoint(...):
+
+and every request is checked against its budget (QUERY_BUDGET_DEFAULT for
+endpoints that declare none) and for N+1 patterns: the same statement shape
+(the SQL text with literals and IN-lists collapsed) run QUERY_REPEAT_THRESHOLD
+times or more. Statements are counted by the cursor hooks in
+app/db/instrumentation.py; DBTimingMiddleware applies the check.
+
+QUERY_BUDGETS selects what happens to a request that breaks its budget:
+
+- off:     nothing is counted (the default)
+- warn:    a WARNING is logged with the statement count and repeated shapes
+- enforce: the response is replaced by a 500 APIResponse naming the problem,
+           for test runs (scripts/check_query_budgets.py drives every route
+           this way) so regressions fail before they reach the database
+
+Outside a request, `statement_budget` applies the same check to a block of
+code and raises QueryBudgetExceeded.
+"""
+
+import re
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from app.core.config import settings
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAMETER_LISTS = re.compile(r"\(\s*(?:\?|%\(\w+\)s|%s|\$\d+|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|%s|\$\d+|:\w+))*\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def query_budget(max_statements: int) -> Callable:
+    """Declare the most statements one request to the decorated endpoint may run."""
+    def decorate(endpoint):
+        endpoint.query_budget = max_statements
+        return endpoint
+    return decorate
+
+
+def statement_shape(statement: str) -> str:
+    """The statement with literals and parameter lists collapsed, so repeats of one query compare equal."""
+    shape = _LITERALS.sub("?", statement)
+    shape = _PARAMETER_LISTS.sub("(?)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+@dataclass
+class BudgetReport:
+    statements: int
+    budget: Optional[int]
+    repeated: List[tuple] = field(default_factory=list)   # (count, shape), most repeated first
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.statements > self.budget
+
+    @property
+    def ok(self) -> bool:
+        return not self.over_budget and not self.repeated
+
+    def describe(self) -> str:
+        problems = []
+        if self.over_budget:
+            problems.append(f"{self.statements} statements, budget {self.budget}")
+        for count, shape in self.repeated:
+            problems.append(f"{count}x {shape[:200]}")
+        return "; ".join(problems)
+
+
+class QueryBudgetExceeded(Exception):
+    def __init__(self, report: BudgetReport):
+        super().__init__(report.describe())
+        self.report = report
+
+
+def endpoint_budget(endpoint) -> Optional[int]:
+    budget = getattr(endpoint, "query_budget", None)
+    if budget is None and settings.QUERY_BUDGET_DEFAULT:
+        budget = settings.QUERY_BUDGET_DEFAULT
+    return budget
+
+
+def evaluate(statements: int, shapes: Counter, budget: Optional[int]) -> BudgetReport:
+    threshold = settings.QUERY_REPEAT_THRESHOLD
+    repeated = [(count, shape) for shape, count in shapes.most_common() if count >= threshold]
+    return BudgetReport(statements, budget, repeated)
+
+
+@contextmanager
+def statement_budget(max_statements: Optional[int]):
+    """
+    Count the statements run inside the block (on engines with the statement
+    hooks installed) and raise QueryBudgetExceeded if there are more than
+    `max_statements` or a shape repeats QUERY_REPEAT_THRESHOLD times.
+    """
+    from app.db.instrumentation import RequestDBStats, collecting
+
+    stats = RequestDBStats(shapes=Counter())
+    with collecting(stats):
+        yield stats
+    report = evaluate(stats.statements, stats.shapes, max_statements)
+    if not report.ok:
+        raise QueryBudgetExceeded(report)
@@ -1,28 +1,127 @@
-from sqlalchemy import create_engine
+"""
+Database Session
+----------------
+Sync engine and session factory.
+
+The engine is created on first use rather than at import, so a cold start
+that never touches the database (health checks, static files) opens no
+connections. How connections are pooled is chosen by DB_POOL_STRATEGY:
+
+- "queue": a QueuePool sized by DB_POOL_SIZE / DB_MAX_OVERFLOW, for
+  long-running servers.
+- "null": a NullPool that closes each connection after use, for serverless
+  instances (Vercel). Pair it with DB_USE_NEON_POOLER so the short-lived
+  connections land on Neon's PgBouncer endpoint instead of Postgres itself.
+- "auto" (default): "null" when running on Vercel or AWS Lambda, else "queue".
+"""
+
+import os
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
 from sqlalchemy.orm import sessionmaker
+
 from app.core.config import settings
+from app.db.instrumentation import TimedNullPool, TimedQueuePool, count_new_connection, listen_for_statements, statement_hooks_enabled
+
+POOL_QUEUE = "queue"
+POOL_NULL = "null"
+
+_engine: Optional[Engine] = None
+
+
+def is_serverless() -> bool:
+    return bool(os.environ.get("VERCEL") or os.environ.get("AWS_LAMBDA_FUNCTION_NAME"))
+
+
+def pool_strategy() -> str:
+    strategy = settings.DB_POOL_STRATEGY
+    if strategy == "auto":
+        return POOL_NULL if is_serverless() else POOL_QUEUE
+    return strategy
+
+
+def neon_pooler_url(url: URL) -> URL:
+    """
+    Point a Neon URL at the pooled endpoint of the same compute:
+    ep-name-123.region.aws.neon.tech -> ep-name-123-pooler.region.aws.neon.tech
+    Other hosts are returned unchanged.
+    """
+    host = url.host or ""
+    endpoint, _, domain = host.partition(".")
+    if not endpoint.startswith("ep-") or endpoint.endswith("-pooler") or not domain.endswith("neon.tech"):
+        return url
+    return url.set(host=f"{endpoint}-pooler.{domain}")
+
+
+def database_url() -> URL:
+    url = make_url(settings.NEON_CONNECTION_STRING)
+    if settings.DB_USE_NEON_POOLER:
+        url = neon_pooler_url(url)
+    return url
+
+
+def _connect_args(url: URL) -> dict:
+    """libpq connect timeout and TCP keep-alives (psycopg2 / psycopg)."""
+    if url.get_backend_name() != "postgresql" or url.get_driver_name() not in ("psycopg2", "psycopg"):
+        return {}
+    connect_args = {"connect_timeout": settings.DB_CONNECT_TIMEOUT_SECONDS}
+    if settings.DB_TCP_KEEPALIVE:
+        connect_args.update(
+            keepalives=1,
+            keepalives_idle=settings.DB_KEEPALIVE_IDLE_SECONDS,
+            keepalives_interval=10,
+            keepalives_count=3,
+        )
+    return connect_args
+
+
+def get_engine() -> Engine:
+    """Return the process-wide engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        url = database_url()
+        options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+        if pool_strategy() == POOL_NULL:
+            options["poolclass"] = TimedNullPool
+        else:
+            options.update(
+                poolclass=TimedQueuePool,
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+                pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            )
+        _engine = create_engine(url, connect_args=_connect_args(url), echo=False, future=True, **options)
+        event.listen(_engine, "connect", count_new_connection)
+        if statement_hooks_enabled():
+            listen_for_statements(_engine)
+    return _engine
+
+
+def existing_engine() -> Optional[Engine]:
+    """The engine if it has been created, without creating it (for metrics)."""
+    return _engine
+
+
+def __getattr__(name):
+    # `from app.db.session import engine` keeps working without creating the
+    # engine at import time.
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(name)
 
-DATABASE_URL = settings.DATABASE_URL
-NEON_CONNECTION_STRING = settings.NEON_CONNECTION_STRING
 
-from sqlalchemy.pool import NullPool
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker that binds to the engine from get_engine()."""
 
-engine = create_engine(
-    NEON_CONNECTION_STRING,
-    echo=False,
-    future=True,
-    pool_size=10,       # max connections in pool
-    max_overflow=5      # extra connections allowed
-)
+    def __call__(self, **local_kw):
+        local_kw.setdefault("bind", get_engine())
+        return super().__call__(**local_kw)
 
-# engine = create_engine(
-#     DATABASE_URL,
-#     connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
-#     echo=False,
-#     future=True
-# )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False, future=True)
 
 # Dependency for FastAPI routes
 def get_db():
@@ -30,4 +129,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
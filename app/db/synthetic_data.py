@@ -0,0 +1,314 @@
+"""
+Synthetic Data
+--------------
+Deterministic, production-shaped datasets for benchmarks, load tests and the
+query-plan checks (scripts/seed_synthetic_data.py is the command line).
+init_data.py stays the bootstrap of a real deployment.
+
+The same DatasetSpec (including `seed` and `end`) always produces the same
+rows, except for the password hash when none is given (see
+unusable_password_hash). Distributions follow what the live data looks like:
+
+- order frequency per company is Zipf-like: a few companies place most orders
+- created_at spreads over `days`, denser towards `end` (the business grows),
+  mostly in business hours (IST) and rarely on Sundays; ids follow created_at
+- status depends on age: recent orders are pending or out for delivery,
+  older ones completed, with a few cancelled or overdue; a small share is
+  soft-deleted
+- each order has 1-4 items, gases drawn from a weighted mix (oxygen most)
+- some drivers and areas are much busier than others
+
+Rows go in with explicit ids, in chunks: COPY on Postgres, multi-row INSERTs
+elsewhere. dashboard_stats and order_rollup are rebuilt at the end, so the
+dashboard and analytics read the generated orders, and the tables analyzed so
+planner statistics match the data.
+"""
+
+import csv
+import io
+import random
+import secrets
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Callable, Iterable, List, Optional, Sequence
+
+from sqlalchemy import Table, func, select, text
+from sqlalchemy.orm import Session
+
+from app.core import password_hashing
+from app.core.config import settings
+from app.models import Company, Gas, Order, OrderItem, OrderStatus, Role, User
+from app.utils import dashboard_stats, order_rollup
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+ROLES = ["ADMIN", "DISPATCHER", "DRIVER", "CUSTOMER"]
+STATUSES = ["PENDING", "OUT_FOR_DELIVERY", "COMPLETED", "OVERDUE", "DELETED", "CANCELLED"]
+
+# (name, unit, weight in the item mix)
+GASES = [
+    ("Oxygen", "Cubic Meters", 40), ("Nitrogen", "Cubic Meters", 22), ("Carbon Dioxide", "Cubic Meters", 14),
+    ("Argon", "Cubic Meters", 12), ("Acetylene", "Kilograms", 5), ("Helium", "Cubic Meters", 3),
+    ("Hydrogen", "Cubic Meters", 2), ("LPG", "Kilograms", 2),
+]
+AREAS = [
+    "Udhna", "Adajan", "Varachha", "Katargam", "Piplod", "Vesu", "Athwa", "Rander", "Althan", "Bhatar",
+    "Pandesara", "Sachin", "Hazira", "Ichchhapor", "Kamrej", "Limbayat", "Dindoli", "Palsana", "Kadodara", "Olpad",
+    "Magdalla", "Pal", "Jahangirpura", "Bhestan", "Amroli", "Kosad", "Puna", "Sarthana", "Nana Varachha", "Mota Varachha",
+]
+COMPANY_PREFIXES = ["Shree", "Surat", "Gujarat", "Tapi", "Diamond", "Hazira", "Navkar", "Om", "Jay", "Krishna"]
+COMPANY_KINDS = ["Fabricators", "Hospital", "Engineering Works", "Textiles", "Steel", "Chemicals", "Labs", "Foods"]
+FIRST_NAMES = ["Amit", "Bhavesh", "Chirag", "Dhruv", "Hardik", "Jignesh", "Kalpesh", "Mehul", "Nilesh", "Paresh",
+               "Rakesh", "Sanjay", "Tushar", "Vipul", "Yogesh", "Asha", "Hetal", "Komal", "Nisha", "Priya"]
+LAST_NAMES = ["Patel", "Shah", "Desai", "Mehta", "Vasani", "Joshi", "Parmar", "Solanki", "Rana", "Chauhan"]
+
+# Order item count mix and how status depends on age (days) of the order
+ITEM_COUNTS, ITEM_COUNT_WEIGHTS = [1, 2, 3, 4], [55, 28, 12, 5]
+STATUS_BY_AGE = [
+    # (younger than days, weights for PENDING, OUT_FOR_DELIVERY, COMPLETED, OVERDUE, DELETED, CANCELLED)
+    (1, [50, 35, 10, 0, 0, 5]),
+    (3, [10, 25, 50, 10, 0, 5]),
+    (None, [1, 1, 88, 4, 0, 6]),
+]
+HOUR_WEIGHTS = [0, 0, 0, 0, 0, 0, 1, 3, 8, 12, 13, 12, 9, 10, 12, 11, 9, 6, 3, 2, 1, 1, 0, 0]
+SUNDAY_SHARE = 0.3      # orders placed on Sundays relative to a weekday
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    companies: int = 300
+    orders: int = 100_000
+    admins: int = 2
+    dispatchers: int = 5
+    drivers: int = 40
+    customers_per_company: int = 1
+    days: int = 730
+    deleted_share: float = 0.02
+    company_skew: float = 1.1       # Zipf exponent of orders per company
+    seed: int = 7
+    end: Optional[datetime] = None  # newest created_at; defaults to midnight UTC today
+    password_hash: Optional[str] = None  # stored for every user; None: nobody can log in
+    chunk_size: int = 20_000
+
+
+@lru_cache(maxsize=None)
+def unusable_password_hash() -> str:
+    """
+    A bcrypt hash of a random secret nobody knows, computed once per process.
+    Logins as generated users then fail with 401 like any wrong password,
+    where a placeholder that is not a bcrypt hash would fail to verify (500).
+    """
+    return password_hashing._hash(secrets.token_urlsafe(32), settings.BCRYPT_ROUNDS)
+
+
+@dataclass
+class Dataset:
+    company_ids: List[int]
+    gas_ids: List[int]
+    admin_ids: List[int]
+    dispatcher_ids: List[int]
+    driver_ids: List[int]
+    customer_ids: List[int]
+    orders: int
+    items: int
+    admin_email: str
+    seconds: float
+
+
+def _end_of(spec: DatasetSpec) -> datetime:
+    if spec.end is not None:
+        return spec.end if spec.end.tzinfo else spec.end.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _weighted_picker(rng: random.Random, values: Sequence, weights: Sequence[float]) -> Callable[[], object]:
+    cumulative, total = [], 0.0
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+    return lambda: rng.choices(values, cum_weights=cumulative)[0]
+
+
+def _order_times(rng: random.Random, spec: DatasetSpec, end: datetime) -> List[datetime]:
+    """`spec.orders` sorted timestamps, denser towards `end`, in business hours, few on Sundays."""
+    start_day = (end - timedelta(days=spec.days)).astimezone(IST).replace(hour=0, minute=0, second=0, microsecond=0)
+    hour = _weighted_picker(rng, range(24), HOUR_WEIGHTS)
+    times = []
+    while len(times) < spec.orders:
+        # density grows linearly over the period: the day is days * sqrt(u)
+        day = start_day + timedelta(days=int(spec.days * rng.random() ** 0.5))
+        if day.weekday() == 6 and rng.random() > SUNDAY_SHARE:
+            continue
+        moment = day + timedelta(hours=hour(), seconds=rng.randrange(3600))
+        if moment < end:
+            times.append(moment.astimezone(timezone.utc))
+    times.sort()
+    return times
+
+
+def _status_for(age_days: float, pickers: list) -> int:
+    for (younger_than, _), picker in zip(STATUS_BY_AGE, pickers):
+        if younger_than is None or age_days < younger_than:
+            return picker()
+    raise AssertionError("STATUS_BY_AGE must end with a catch-all row")
+
+
+def _copy_rows(db: Session, table: Table, columns: Sequence[str], rows: Iterable[tuple]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["\\N" if value is None else value for value in row])
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer
+        )
+    finally:
+        cursor.close()
+
+
+def load_rows(db: Session, table: Table, columns: Sequence[str], rows: List[tuple]):
+    """Bulk-load rows (tuples in `columns` order): COPY on Postgres, multi-row INSERTs elsewhere."""
+    if not rows:
+        return
+    if db.get_bind().dialect.name == "postgresql":
+        _copy_rows(db, table, columns, rows)
+    else:
+        db.execute(table.insert(), [dict(zip(columns, row)) for row in rows])
+
+
+def _reset_sequences(db: Session):
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for model in (Company, Gas, User, Order, OrderItem, Role, OrderStatus):
+        table = model.__table__.name
+        db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        ))
+
+
+def is_empty(db: Session) -> bool:
+    return not any(db.execute(select(func.count()).select_from(model)).scalar() for model in (Company, User, Order))
+
+
+def clear(db: Session):
+    """Delete every generated row (child tables first) and commit."""
+    for table in ("order_items", "orders", "users", "companies", "gases", "order_status", "roles",
+                  "dashboard_stats", "order_rollup"):
+        db.execute(text(f"DELETE FROM {table}"))
+    db.commit()
+
+
+def generate(db: Session, spec: DatasetSpec, progress: Optional[Callable[[str], None]] = None) -> Dataset:
+    """Load the dataset described by `spec` into an empty database and commit."""
+    started = time.perf_counter()
+    report = progress or (lambda message: None)
+    rng = random.Random(spec.seed)
+    end = _end_of(spec)
+    founded = end - timedelta(days=spec.days + 1)   # created_at of companies, gases and users
+
+    # --- Reference data (migrations may have inserted roles and statuses already) ---
+    for model, names in ((Role, ROLES), (OrderStatus, STATUSES)):
+        existing = set(db.execute(select(model.id)).scalars())
+        load_rows(db, model.__table__, ("id", "name"),
+                  [(row_id, name) for row_id, name in enumerate(names, start=1) if row_id not in existing])
+    gas_ids = list(range(1, len(GASES) + 1))
+    load_rows(db, Gas.__table__, ("id", "name", "unit", "is_deleted", "created_at", "updated_at"),
+              [(gas_id, name, unit, False, founded, founded) for gas_id, (name, unit, _) in zip(gas_ids, GASES)])
+
+    company_ids = list(range(1, spec.companies + 1))
+    company_areas = {company_id: rng.choice(AREAS) for company_id in company_ids}
+    load_rows(db, Company.__table__, ("id", "name", "address", "is_deleted", "created_at", "updated_at"), [
+        (company_id,
+         f"{COMPANY_PREFIXES[company_id % len(COMPANY_PREFIXES)]} {COMPANY_KINDS[company_id // len(COMPANY_PREFIXES) % len(COMPANY_KINDS)]} {company_id}",
+         f"Plot {rng.randint(1, 400)}, {company_areas[company_id]}, Surat", False, founded, founded)
+        for company_id in company_ids
+    ])
+
+    # --- Users: staff and drivers belong to the first company, customers to theirs ---
+    users, next_id = [], 1
+    password_hash = spec.password_hash or unusable_password_hash()
+    ids_by_role = {1: [], 2: [], 3: [], 4: []}
+
+    def add_user(role_id: int, company_id: int, label: str):
+        nonlocal next_id
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        users.append((next_id, name, f"{label}{len(ids_by_role[role_id]) + 1}@quickgas.example.com",
+                      f"+91-9{rng.randrange(10 ** 9):09d}", company_areas[company_id] + ", Surat",
+                      company_id, role_id, password_hash, False, founded, founded))
+        ids_by_role[role_id].append(next_id)
+        next_id += 1
+
+    for _ in range(spec.admins):
+        add_user(1, company_ids[0], "admin")
+    for _ in range(spec.dispatchers):
+        add_user(2, company_ids[0], "dispatcher")
+    for _ in range(spec.drivers):
+        add_user(3, company_ids[0], "driver")
+    for company_id in company_ids:
+        for _ in range(spec.customers_per_company):
+            add_user(4, company_id, "customer")
+    load_rows(db, User.__table__, ("id", "name", "email", "phone", "address", "company_id", "role_id",
+                                   "password_hash", "is_deleted", "created_at", "updated_at"), users)
+    report(f"reference data: {len(gas_ids)} gases, {len(company_ids)} companies, {len(users)} users")
+
+    # --- Orders and items ---
+    ranks = list(range(1, len(company_ids) + 1))
+    rng.shuffle(ranks)
+    pick_company = _weighted_picker(rng, company_ids, [1 / rank ** spec.company_skew for rank in ranks])
+    driver_ids = ids_by_role[3] or [None]
+    pick_driver = _weighted_picker(rng, driver_ids, [rng.paretovariate(2.0) for _ in driver_ids])
+    pick_admin = _weighted_picker(rng, ids_by_role[1] + ids_by_role[2], [3] * len(ids_by_role[1]) + [1] * len(ids_by_role[2]))
+    pick_area = _weighted_picker(rng, AREAS, [1 / (rank + 1) for rank in range(len(AREAS))])
+    pick_item_count = _weighted_picker(rng, ITEM_COUNTS, ITEM_COUNT_WEIGHTS)
+    gas_weights = [weight for _, _, weight in GASES]
+    status_pickers = [_weighted_picker(rng, range(1, len(STATUSES) + 1), weights) for _, weights in STATUS_BY_AGE]
+
+    order_columns = ("id", "company_id", "status_id", "admin_id", "driver_id", "area", "mobile_no", "notes",
+                     "is_deleted", "created_at", "updated_at")
+    item_columns = ("id", "order_id", "gas_id", "quantity")
+    times = _order_times(rng, spec, end)
+    item_id = 0
+    for offset in range(0, spec.orders, spec.chunk_size):
+        orders, items = [], []
+        for order_id in range(offset + 1, min(offset + spec.chunk_size, spec.orders) + 1):
+            created = times[order_id - 1]
+            age_days = (end - created).total_seconds() / 86400
+            status_id = _status_for(age_days, status_pickers)
+            company_id = pick_company()
+            area = company_areas[company_id] if rng.random() < 0.8 else pick_area()
+            updated = created if status_id == 1 else min(end, created + timedelta(hours=rng.uniform(1, 30)))
+            orders.append((
+                order_id, company_id, status_id, pick_admin(), None if status_id == 1 else pick_driver(), area,
+                f"9{rng.randrange(10 ** 9):09d}" if rng.random() < 0.6 else None,
+                "Deliver before noon" if rng.random() < 0.05 else None,
+                rng.random() < spec.deleted_share, created, updated,
+            ))
+            count = pick_item_count()
+            chosen = set()
+            while len(chosen) < count:
+                chosen.add(rng.choices(gas_ids, gas_weights)[0])
+            for gas_id in sorted(chosen):
+                item_id += 1
+                items.append((item_id, order_id, gas_id, max(1, min(60, int(rng.lognormvariate(1.6, 0.7))))))
+        load_rows(db, Order.__table__, order_columns, orders)
+        load_rows(db, OrderItem.__table__, item_columns, items)
+        report(f"orders: {offset + len(orders)}/{spec.orders}, items: {item_id}")
+
+    _reset_sequences(db)
+    db.commit()
+
+    dashboard_stats.rebuild(db)
+    order_rollup.rebuild(db)
+    db.execute(text("ANALYZE"))
+    db.commit()
+    report("dashboard_stats and order_rollup rebuilt, statistics analyzed")
+
+    return Dataset(
+        company_ids=company_ids, gas_ids=gas_ids, admin_ids=ids_by_role[1], dispatcher_ids=ids_by_role[2],
+        driver_ids=ids_by_role[3], customer_ids=ids_by_role[4], orders=spec.orders, items=item_id,
+        admin_email="admin1@quickgas.example.com", seconds=time.perf_counter() - started,
+    )
@@ -0,0 +1,37 @@
+"""
+Counter Upserts
+---------------
+INSERT ... ON CONFLICT DO UPDATE that adds to existing counters, for the
+pre-aggregated tables (dashboard_stats, order_rollup). Supported on
+Postgres and SQLite.
+"""
+
+from typing import List
+
+from sqlalchemy.orm import Session
+
+
+def _dialect_insert(dialect_name: str):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"counter upserts are not supported on {dialect_name}")
+    return insert
+
+
+def add_to_counters(db: Session, model, measures: List[str], rows: List[dict]):
+    """
+    Insert `rows` into `model`, or add their `measures` to the existing row
+    with the same primary key. Callers pass rows sorted by key so concurrent
+    writers lock them in the same order.
+    """
+    if not rows:
+        return
+    stmt = _dialect_insert(db.get_bind().dialect.name)(model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(model.__table__.primary_key.columns),
+        set_={name: getattr(model, name) + stmt.excluded[name] for name in measures},
+    )
+    db.execute(stmt, rows)
@@ -5,19 +5,48 @@ This module provides FastAPI dependencies for database sessions and authenticati
 These dependencies are injected into route handlers to provide required functionality.
 """
 
-from fastapi import Depends, HTTPException, Security
+from dataclasses import dataclass
+from fastapi import Depends, HTTPException, Query, Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
-from sqlalchemy import text
-from typing import Generator
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncGenerator, Generator, Optional
 
 from app.db.session import SessionLocal
-from app.core.security import decode_token
+from app.db.async_session import AsyncSessionLocal
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import STREAM_TOKEN_SCOPE, decode_token
 from app.messages.messages import Message
 from app.models.users import User
 
 # HTTP Bearer security scheme for token authentication
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """The authenticated principal handed to route handlers and role checks."""
+    id: int
+    role_id: int
+    name: str
+    email: Optional[str] = None
+    company_id: Optional[int] = None
+
+
+# Recently authenticated users, keyed by user id
+_principals = TTLCache(
+    "principals",
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+)
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Forget a cached principal after the user was changed or deleted."""
+    _principals.invalidate(int(user_id))
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -38,32 +67,133 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+def _unauthorized() -> HTTPException:
+    return HTTPException(
+        status_code=401,
+        detail=Message.Error.UNAUTHORIZED,
+        headers={"WWW-Authenticate": "Bearer"}
+    )
+
+def _resolve_token(token: str, scope: Optional[str] = None) -> tuple[int, Optional[CurrentUser]]:
+    """
+    Return the user id in the token and the principal, if it is known without a
+    lookup. The token's `scope` claim must equal `scope`: session tokens have
+    none, so a stream token is refused as a bearer token and vice versa.
+    """
+    payload = decode_token(token)
+
+    if not payload or payload.get("scope") != scope:
+        raise _unauthorized()
+
+    try:
+        user_id = int(payload.get("sub"))
+    except (TypeError, ValueError):
+        raise _unauthorized()
+
+    if settings.AUTH_TRUST_TOKEN_CLAIMS:
+        if payload.get("role_id") is None:
+            raise _unauthorized()
+        return user_id, CurrentUser(
+            id=user_id,
+            role_id=payload["role_id"],
+            name=payload.get("name"),
+            email=payload.get("email"),
+        )
+
+    return user_id, _principals.get(user_id)
+
+def _remember_principal(user: Optional[User]) -> CurrentUser:
+    if not user:
+        raise _unauthorized()
+
+    principal = CurrentUser(
+        id=user.id,
+        role_id=user.role_id,
+        name=user.name,
+        email=user.email,
+        company_id=user.company_id,
+    )
+    _principals.set(user.id, principal)
+    return principal
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Security(security),
     db: Session = Depends(get_db)
-) -> User:
-    token = credentials.credentials
-    payload = decode_token(token)
+) -> CurrentUser:
+    """
+    Current User Dependency
+    -----------------------
+    Resolves the bearer token to a CurrentUser.
 
-    if not payload:
-        raise HTTPException(
-            status_code=401,
-            detail=Message.Error.UNAUTHORIZED,
-            headers={"WWW-Authenticate": "Bearer"}
-        )
-    
-    user_id = payload.get("sub")
+    Note:
+        - With AUTH_TRUST_TOKEN_CLAIMS enabled the principal is built from the
+          verified token claims and the database is never touched; role or
+          account changes then take effect when the token expires.
+        - Otherwise the user row is looked up once and cached for
+          PRINCIPAL_CACHE_TTL_SECONDS. The session is only connected on a miss.
+    """
+    user_id, principal = _resolve_token(credentials.credentials)
+    if principal is not None:
+        return principal
 
     user = db.query(User).filter(
         User.id == user_id,
         User.is_deleted == False
     ).first()
+    return _remember_principal(user)
 
-    if not user:
-        raise HTTPException(
-            status_code=401,
-            detail=Message.Error.UNAUTHORIZED,
-            headers={"WWW-Authenticate": "Bearer"}
-        )
+def get_stream_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Security(optional_security),
+    stream_token: Optional[str] = Query(None, description="Token from POST /api/orders/stream/token, for EventSource clients that cannot send headers")
+) -> CurrentUser:
+    """
+    Current user for long-lived streaming responses.
+
+    Note:
+        - Accepts the bearer token from the Authorization header, or a
+          short-lived stream token in the stream_token query parameter, since
+          browsers' EventSource cannot set headers. Session tokens are never
+          taken from the URL, where access logs and history would keep them.
+        - Looks the user up (on a principal cache miss) with its own short
+          session instead of get_db, so no connection is held for the life of
+          the stream.
+    """
+    if credentials is not None:
+        user_id, principal = _resolve_token(credentials.credentials)
+    elif stream_token:
+        user_id, principal = _resolve_token(stream_token, STREAM_TOKEN_SCOPE)
+    else:
+        raise _unauthorized()
+    if principal is not None:
+        return principal
+
+    with SessionLocal() as db:
+        user = db.query(User).filter(
+            User.id == user_id,
+            User.is_deleted == False
+        ).first()
+        return _remember_principal(user)
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async Database Session Dependency
+    ---------------------------------
+    Provides an AsyncSession for routes served by the async stack
+    (see app/db/async_session.py). Closed after the request completes.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Security(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> CurrentUser:
+    """Async counterpart of get_current_user, sharing its principal cache."""
+    user_id, principal = _resolve_token(credentials.credentials)
+    if principal is not None:
+        return principal
 
-    return user
+    user = (await db.execute(
+        select(User).where(User.id == user_id, User.is_deleted == False)
+    )).scalars().first()
+    return _remember_principal(user)
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Dict
+from typing import Dict, List, Optional
+from datetime import date
 
 class DashboardInsights(BaseModel):
     total_pending_orders: int
@@ -10,3 +11,23 @@ class DashboardInsights(BaseModel):
 class DashboardResponse(BaseModel):
     data: DashboardInsights
     message: str
+
+
+class AnalyticsBucket(BaseModel):
+    period: date                      # first day of the day/week/month bucket
+    company_id: Optional[int] = None
+    company_name: Optional[str] = None
+    area: Optional[str] = None
+    gas_id: Optional[int] = None
+    gas_name: Optional[str] = None
+    status_id: Optional[int] = None
+    status_name: Optional[str] = None
+    quantity: int
+    items: int
+
+class OrderAnalytics(BaseModel):
+    start_date: date
+    end_date: date
+    granularity: str
+    group_by: List[str]
+    buckets: List[AnalyticsBucket]
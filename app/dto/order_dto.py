@@ -1,11 +1,21 @@
-from pydantic import BaseModel, field_serializer
+from pydantic import BaseModel, Field, field_serializer
 from typing import Optional, List
 from datetime import datetime
+from app.dto.base_response import APIResponse
 from app.dto.order_item_dto import OrderItemRead
 from zoneinfo import ZoneInfo
 
 IST = ZoneInfo('Asia/Kolkata')
 
+class ISTTimestamps(BaseModel):
+    """Serializes created_at / updated_at in IST; naive values are taken as UTC."""
+
+    @field_serializer('created_at', 'updated_at', check_fields=False)
+    def serialize_dt(self, dt: datetime, _info):
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=ZoneInfo("UTC"))
+        return dt.astimezone(IST).isoformat()
+
 class OrderItemCreate(BaseModel):
     gas_id: int
     quantity: int
@@ -24,11 +34,11 @@ class OrderUpdate(BaseModel):
     mobile_no: Optional[str] = None
     notes: Optional[str] = None
 
-class OrderRead(BaseModel):
+class OrderRead(ISTTimestamps):
     id: int
     company_id: int
     company_name: str
-    company_address: str
+    company_address: Optional[str] = None
     status_id: int
     status_name: str
     admin_id: int
@@ -41,14 +51,72 @@ class OrderRead(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    @field_serializer('created_at', 'updated_at')
-    def serialize_dt(self, dt: datetime, _info):
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=ZoneInfo("UTC"))
-        return dt.astimezone(IST).isoformat()
-
     class Config:
         from_attributes = True
 
 class OrderWithItemsRead(OrderRead):
-    items: List[OrderItemRead] = []
\ No newline at end of file
+    items: List[OrderItemRead] = []
+
+class OrderPage(BaseModel):
+    draw: int
+    recordsTotal: int
+    recordsFiltered: int
+    data: List[OrderWithItemsRead]
+    next_cursor: Optional[str] = None
+
+class OrderListResponse(APIResponse):
+    """Documents GET /api/orders/ in OpenAPI; the route writes it via app/core/fast_json.py."""
+    data: OrderPage
+
+class DriverOrderRead(ISTTimestamps):
+    """An order in a driver's delivery feed."""
+    id: int
+    company_id: int
+    company_name: str
+    company_address: Optional[str] = None
+    status_id: int
+    status_name: str
+    area: str
+    mobile_no: Optional[str]
+    notes: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+    items: List[OrderItemRead] = []
+
+class OrderVersion(BaseModel):
+    id: int
+    updated_at: Optional[datetime] = None  # as last read; the order is skipped if it changed since
+
+class OrderBulkUpdate(BaseModel):
+    orders: List[OrderVersion] = Field(..., min_length=1)
+    status_id: Optional[int] = None
+    driver_id: Optional[int] = None  # null unassigns the driver
+
+class OrderBulkUpdateRow(ISTTimestamps):
+    id: int
+    status_id: int
+    status_name: Optional[str]
+    driver_id: Optional[int]
+    driver_name: Optional[str]
+    updated_at: datetime
+
+class OrderBulkUpdateReport(BaseModel):
+    updated: List[OrderBulkUpdateRow]
+    stale: List[int]      # changed by someone else since the client read them
+    not_found: List[int]  # missing or deleted
+
+class OrderStreamToken(BaseModel):
+    stream_token: str  # pass as ?stream_token= to GET /api/orders/stream
+    expires_in: int    # seconds left to open the stream with it
+
+class OrderImportRowResult(BaseModel):
+    row: int
+    status: str
+    order_id: Optional[int] = None
+    errors: List[str] = []
+
+class OrderImportReport(BaseModel):
+    total_rows: int
+    created: int
+    failed: int
+    results: List[OrderImportRowResult]
@@ -18,6 +18,9 @@ class Message:
         ORDER_UPDATED = "Order updated successfully."
         ORDER_DELETED = "Order deleted successfully."
         ORDER_RETRIEVED = "Order retrieved successfully."
+        ORDER_IMPORT_COMPLETED = "Order import completed."
+        ORDERS_UPDATED = "Orders updated successfully."
+        STREAM_TOKEN_ISSUED = "Stream token issued."
         # Order Item
         ORDER_ITEM_CREATED = "Order item created successfully."
         ORDER_ITEM_UPDATED = "Order item updated successfully."
@@ -25,6 +28,8 @@ class Message:
         ORDER_ITEM_RETRIEVED = "Order item retrieved successfully."
         # Health
         HEALTH_OK = "Service is running."
+        CACHE_STATS_RETRIEVED = "Cache statistics retrieved successfully."
+        CACHE_REFRESHED = "Cached data has been refreshed."
 
         # Order Status
         ORDER_STATUS_RETRIEVED = "Order statuses retrieved successfully."
@@ -49,6 +54,9 @@ class Message:
         NOT_FOUND = "Resource not found."
         INTERNAL_SERVER_ERROR = "Internal server error."
         REQUIRED_FIELD = "This field is required."
+        VALUE_TOO_LONG = "Value is too long."
+        QUERY_BUDGET_EXCEEDED = "Query budget exceeded."
+        METRICS_DISABLED = "Metrics are disabled."
 
         # Auth
         INVALID_CREDENTIALS = "Invalid credentials provided."
@@ -56,6 +64,8 @@ class Message:
         INVALID_TOKEN = "Invalid or expired token."
         EMAIL_ALREADY_EXISTS = "Email is already registered."
         MOBILE_ALREADY_EXISTS = "Mobile number is already registered."
+        TOO_MANY_LOGIN_ATTEMPTS = "Too many failed login attempts. Please try again later."
+        AUTH_BUSY = "Authentication is busy. Please try again shortly."
 
         # Roles & Permissions
         NOT_ADMIN = "Action requires administrator privileges."
@@ -77,13 +87,26 @@ class Message:
         # Order
         ORDER_NOT_FOUND = "Order not found."
         MINIMUM_ITEM_REQUIRED = "At least one item is required in an order."
+        INVALID_CURSOR = "Invalid pagination cursor."
+        ORDER_IMPORT_INVALID_ROW = "Row could not be parsed."
+        ORDER_IMPORT_UNSUPPORTED_FORMAT = "Unsupported import format, use ndjson or csv."
+        ORDER_IMPORT_INVALID_ENCODING = "Upload is not valid UTF-8 text."
+        BULK_UPDATE_TOO_LARGE = "Too many orders in one bulk update."
+        STREAM_BUSY = "Too many live connections. Please try again shortly."
+
+        # Analytics
+        INVALID_DATE_RANGE = "start_date must not be after end_date."
+        INVALID_ANALYTICS_GROUP = "group_by accepts company, area, gas and status."
         
         # Order Item
         ORDER_ITEM_NOT_FOUND = "Order item not found."
         ORDER_ITEM_INVALID = "Invalid order item."
+        INVALID_QUANTITY = "Quantity must be greater than zero."
+        QUANTITY_TOO_LARGE = "Quantity is too large."
 
         # User
         USER_NOT_FOUND = "User not found."
+        ROLE_NOT_FOUND = "Role not found."
         
         # Status
         STATUS_NOT_FOUND = "Order status not found."
@@ -1,9 +1,11 @@
 from .company import Company
+from .dashboard_stat import DashboardStat
 from .gas import Gas
 from .order import Order
 from .order_item import OrderItem
+from .order_rollup import OrderRollup
 from .order_status import OrderStatus 
 from .role import Role
 from .users import User 
 
-__all__ = ["Company", "Gas", "Role", "User", "OrderStatus", "Order", "OrderItem"]
\ No newline at end of file
+__all__ = ["Company", "Gas", "Role", "User", "OrderStatus", "Order", "OrderItem", "DashboardStat", "OrderRollup"]
\ No newline at end of file
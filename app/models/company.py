@@ -1,11 +1,18 @@
 from sqlalchemy import (
-    Column, Integer, String, Boolean, TIMESTAMP, func
+    Column, Integer, String, Boolean, TIMESTAMP, Index, func
 )
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
 class Company(Base):
     __tablename__ = "companies"
+    __table_args__ = (
+        # Trigram indexes for substring search (see app/utils/search.py)
+        Index("ix_companies_name_trgm", "name", postgresql_using="gin",
+              postgresql_ops={"name": "gin_trgm_ops"}).ddl_if(dialect="postgresql"),
+        Index("ix_companies_address_trgm", "address", postgresql_using="gin",
+              postgresql_ops={"address": "gin_trgm_ops"}).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(255), nullable=False, unique=True)
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String, BigInteger
+from app.db.base import Base
+
+class DashboardStat(Base):
+    """Running dashboard totals, maintained by app/utils/dashboard_stats.py."""
+    __tablename__ = "dashboard_stats"
+
+    kind = Column(String(32), primary_key=True)    # "order_status" or "pending_gas"
+    ref_id = Column(Integer, primary_key=True)     # order_status.id or gases.id
+    value = Column(BigInteger, nullable=False, default=0)
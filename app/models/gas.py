@@ -1,11 +1,16 @@
 from sqlalchemy import (
-    Column, Integer, String, Boolean, TIMESTAMP, func
+    Column, Integer, String, Boolean, TIMESTAMP, Index, func
 )
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
 class Gas(Base):
     __tablename__ = "gases"
+    __table_args__ = (
+        # Trigram indexes for substring search (see app/utils/search.py)
+        Index("ix_gases_name_trgm", "name", postgresql_using="gin",
+              postgresql_ops={"name": "gin_trgm_ops"}).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(100), nullable=False, unique=True)
@@ -7,6 +7,8 @@ from sqlalchemy import (
     func,
     String,
     Text,
+    Index,
+    text,
 )
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -14,6 +16,20 @@ from app.db.base import Base
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_created_at_id", "created_at", "id"),  # keyset pagination
+        # Driver feed: open assignments only (see order_service.get_driver_orders)
+        Index("ix_orders_driver_open", "driver_id", "status_id",
+              postgresql_where=text("is_deleted = false"), sqlite_where=text("is_deleted = 0"),
+              postgresql_include=["created_at"]),
+        # Listing filtered by status and the per-status aggregates, over active orders
+        Index("ix_orders_status_created_active", "status_id", "created_at", "id",
+              postgresql_where=text("is_deleted = false"), sqlite_where=text("is_deleted = 0")),
+        # Foreign keys checked when a company or user is permanently deleted
+        Index("ix_orders_company_id", "company_id"),
+        Index("ix_orders_admin_id", "admin_id"),
+        Index("ix_orders_driver_id", "driver_id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
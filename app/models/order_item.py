@@ -1,11 +1,14 @@
 from sqlalchemy import (
-    Column, Integer, ForeignKey
+    Column, Integer, ForeignKey, Index
 )
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
 class OrderItem(Base):
     __tablename__ = "order_items"
+    __table_args__ = (
+        Index("ix_order_items_order_id", "order_id"),  # items of a page of orders
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"), nullable=False)
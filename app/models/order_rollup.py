@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, BigInteger, Date
+from app.db.base import Base
+
+class OrderRollup(Base):
+    """
+    Gas volume per day, company, area, gas and status for active orders,
+    maintained by app/utils/order_rollup.py.
+    """
+    __tablename__ = "order_rollup"
+
+    day = Column(Date, primary_key=True)              # order created_at, business timezone
+    company_id = Column(Integer, primary_key=True)
+    area = Column(String(255), primary_key=True)
+    gas_id = Column(Integer, primary_key=True)
+    status_id = Column(Integer, primary_key=True)
+    quantity = Column(BigInteger, nullable=False, default=0)
+    items = Column(Integer, nullable=False, default=0)     # order item rows
@@ -1,11 +1,20 @@
 from sqlalchemy import (
-    Column, Integer, String, Boolean, ForeignKey, TIMESTAMP, func
+    Column, Integer, String, Boolean, ForeignKey, TIMESTAMP, Index, func
 )
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Trigram indexes for substring search (see app/utils/search.py)
+        Index("ix_users_name_trgm", "name", postgresql_using="gin",
+              postgresql_ops={"name": "gin_trgm_ops"}).ddl_if(dialect="postgresql"),
+        Index("ix_users_email_trgm", "email", postgresql_using="gin",
+              postgresql_ops={"email": "gin_trgm_ops"}).ddl_if(dialect="postgresql"),
+        Index("ix_users_role_id", "role_id"),        # driver lists
+        Index("ix_users_company_id", "company_id"),  # company permanent delete
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(255), nullable=False)
@@ -0,0 +1,157 @@
+"""
+Async Company Service
+---------------------
+AsyncSession versions of app/services/company_service.py for the async
+companies router. Cache maintenance (record counts, reference data) is the
+same as in the sync service.
+"""
+
+from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.company import Company
+from app.messages.messages import Message
+from app.utils import record_counts, reference_data
+from app.utils.record_counts import cached_total, filtered_count
+from app.utils.search import build_search
+from app.services.company_service import COMPANY_SEARCH_FIELDS
+from fastapi import HTTPException, status
+
+
+def _invalidate_company_caches():
+    record_counts.invalidate_total(record_counts.COMPANIES)
+    reference_data.invalidate(reference_data.COMPANIES)
+
+
+async def create_company(db: AsyncSession, name: str, address: str | None = None) -> Company:
+    """
+    Create a new company or restore a soft-deleted one with the same name.
+    """
+    try:
+        company = Company(name=name.strip(), address=address)
+        db.add(company)
+        await db.commit()
+        await db.refresh(company)
+        _invalidate_company_caches()
+        return company
+    except IntegrityError:
+        await db.rollback()
+        existing = (await db.execute(
+            select(Company).where(Company.name == name.strip(), Company.is_deleted == True)
+        )).scalars().first()
+        if existing:
+            existing.is_deleted = False
+            existing.address = address
+            await db.commit()
+            await db.refresh(existing)
+            _invalidate_company_caches()
+            return existing
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=Message.Error.DUPLICATE_ENTRY
+        )
+
+
+async def get_company_by_id(db: AsyncSession, company_id: int) -> Company:
+    """
+    Retrieve a company by its ID, excluding soft-deleted records.
+    """
+    company = (await db.execute(
+        select(Company).where(Company.id == company_id, Company.is_deleted == False)
+    )).scalars().first()
+    if not company:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=Message.Error.NOT_FOUND
+        )
+    return company
+
+
+async def list_companies(db: AsyncSession, skip: int = 0, limit: int = 10, search: str = "") -> tuple[list[Company], int, int]:
+    """
+    List active companies with pagination, search, and counts for server-side processing.
+    """
+    query = select(Company).where(Company.is_deleted == False)
+
+    total_records = await db.run_sync(
+        cached_total, record_counts.COMPANIES,
+        select(func.count(Company.id)).where(Company.is_deleted == False)
+    )
+
+    filtered_records = total_records
+    company_search = await db.run_sync(build_search, search, COMPANY_SEARCH_FIELDS)
+    if company_search is not None:
+        query = query.where(company_search.filter).order_by(company_search.rank.desc(), Company.id)
+        filtered_records = await db.run_sync(
+            filtered_count, select(Company.id).where(Company.is_deleted == False, company_search.filter)
+        )
+
+    companies = (await db.execute(query.offset(skip).limit(limit))).scalars().all()
+    return companies, total_records, filtered_records
+
+
+async def update_company(db: AsyncSession, company_id: int, name: str | None, address: str | None) -> Company:
+    """
+    Update company details with duplicate name validation.
+    """
+    if name:
+        existing = (await db.execute(
+            select(Company.id).where(
+                Company.name == name.strip(),
+                Company.is_deleted == False,
+                Company.id != company_id
+            )
+        )).first()
+        if existing:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=Message.Error.DUPLICATE_ENTRY
+            )
+
+    company = await get_company_by_id(db, company_id)
+
+    if name is not None:
+        company.name = name.strip()
+    if address is not None:
+        company.address = address
+
+    await db.commit()
+    await db.refresh(company)
+    reference_data.invalidate(reference_data.COMPANIES)
+    return company
+
+
+async def soft_delete_company(db: AsyncSession, company_id: int) -> Company:
+    """
+    Soft delete a company by marking it as deleted (is_deleted = True).
+    """
+    company = await get_company_by_id(db, company_id)
+    company.is_deleted = True
+    await db.commit()
+    await db.refresh(company)
+    _invalidate_company_caches()
+    return company
+
+
+async def permanent_delete_company(db: AsyncSession, company_id: int) -> None:
+    """
+    Permanently delete a company from the database (IRREVERSIBLE).
+    """
+    company = await db.get(Company, company_id)
+    if not company:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=Message.Error.NOT_FOUND
+        )
+
+    await db.delete(company)
+    await db.commit()
+    _invalidate_company_caches()
+
+
+async def get_all_companies(db: AsyncSession) -> list[dict]:
+    """
+    Retrieve all non-deleted companies (id, name, address) from the reference cache.
+    """
+    snapshot = await db.run_sync(reference_data.get_reference, reference_data.COMPANIES)
+    return list(snapshot.rows)
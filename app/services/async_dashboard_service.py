@@ -0,0 +1,26 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.utils import dashboard_stats
+from app.utils.dashboard_stats import DashboardSnapshot
+from app.services.dashboard_service import STATUS_TOTALS_SELECT, GAS_REQUIREMENTS_SELECT, live_insights
+
+
+async def get_dashboard_insights(db: AsyncSession):
+    """
+    Async version of dashboard_service.get_dashboard_insights.
+    """
+    if settings.DASHBOARD_SOURCE == "live":
+        status_totals = (await db.execute(STATUS_TOTALS_SELECT)).one()
+        return live_insights(status_totals, (await db.execute(GAS_REQUIREMENTS_SELECT)).all())
+
+    rows = (await db.execute(dashboard_stats.dashboard_stats_select())).all()
+    return dashboard_stats.insights_from_rows(rows)
+
+
+async def get_dashboard_snapshot(db: AsyncSession) -> DashboardSnapshot:
+    """Async version of dashboard_service.get_dashboard_snapshot."""
+    snapshot = dashboard_stats.cached_snapshot()
+    if snapshot is None:
+        generation = dashboard_stats.snapshot_generation()
+        snapshot = dashboard_stats.remember_snapshot(await get_dashboard_insights(db), generation)
+    return snapshot
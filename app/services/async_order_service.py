@@ -0,0 +1,208 @@
+"""
+Async Order Service
+-------------------
+AsyncSession versions of the order operations used by the async orders router.
+
+SQL is built by the same helpers as app/services/order_service.py, so both
+stacks return identical results. Helpers that take a sync Session (search,
+cached counts, reference-data validation) are called through
+`AsyncSession.run_sync`, which runs them on the event loop over the async
+connection rather than on a worker thread.
+"""
+
+from typing import List, Optional
+from dataclasses import replace
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.company import Company
+from app.models.order_status import OrderStatus
+from app.models.users import User
+from app.messages.messages import Message
+from app.dto.order_dto import OrderItemCreate
+from app.utils import order_events, record_counts
+from app.utils.order_aggregates import load_order_facts, record_order_change, item_totals_select, order_facts, totals_from_rows
+from app.utils.db_validation import require
+from app.utils.record_counts import cached_total, filtered_count
+from app.utils.search import build_search
+from app.services.order_service import (
+    ACTIVE_ORDER_COUNT,
+    validate_new_order, order_context_select, validate_order_context,
+    new_order_insert, order_item_params, new_order_read,
+    new_order_facts, AGGREGATED_FIELDS, aggregated_values, validate_order_changes, order_change_requirements,
+    apply_bulk_order_update,
+    order_columns, order_search_fields, order_items_select, group_order_items, to_order_with_items, to_order_dicts,
+    order_listing_filters, filtered_order_ids_select, order_page_select, split_order_page,
+)
+
+
+async def create_order(
+    db: AsyncSession,
+    company_id: int,
+    admin_id: int,
+    area: str,
+    mobile_no: str,
+    notes: str,
+    items: List[OrderItemCreate],
+):
+    """Create an order and all of its items in a single transaction."""
+    validate_new_order(area, items)
+
+    context = (await db.execute(order_context_select(company_id, admin_id, {item.gas_id for item in items}))).first()
+    validate_order_context(context)
+
+    area = area.strip()
+    mobile_no = mobile_no.strip() if mobile_no else None
+    notes = notes.strip() if notes else None
+
+    try:
+        created = (await db.execute(
+            new_order_insert(company_id, admin_id, area, mobile_no, notes)
+        )).one()
+        await db.execute(insert(OrderItem), order_item_params(created.id, items))
+        await db.run_sync(record_order_change, None, new_order_facts(created, company_id, area, items))
+        order = new_order_read(created, context, company_id, admin_id, area, mobile_no, notes)
+        order_events.queue_event(db, await db.run_sync(order_events.created_event, order, items))
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    record_counts.adjust_total(record_counts.ORDERS, 1)
+    return order
+
+
+async def get_order_with_details(db: AsyncSession, order_id: int):
+    AdminUser = aliased(User)
+    DriverUser = aliased(User)
+
+    result = (await db.execute(
+        select(*order_columns(AdminUser, DriverUser))
+        .join(Company, Company.id == Order.company_id)
+        .join(OrderStatus, OrderStatus.id == Order.status_id)
+        .join(AdminUser, AdminUser.id == Order.admin_id)
+        .outerjoin(DriverUser, DriverUser.id == Order.driver_id)
+        .where(Order.id == order_id, Order.is_deleted == False)
+    )).first()
+
+    # Validate order exists
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=Message.Error.ORDER_NOT_FOUND
+        )
+
+    items = (await db.execute(order_items_select([order_id]))).all()
+    return to_order_with_items(result, group_order_items(items).get(order_id, []))
+
+
+async def list_orders(
+    db: AsyncSession,
+    start: int = 0,
+    length: int = 10,
+    search: str = None,
+    status_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    sort_order: str = "desc",
+    cursor: Optional[str] = None,
+    as_dicts: bool = False
+):
+    """List orders for DataTables; see order_service.list_orders."""
+    AdminUser = aliased(User)
+    DriverUser = aliased(User)
+
+    search_query = await db.run_sync(build_search, search, order_search_fields(DriverUser), [Order.is_deleted == False])
+    filters = order_listing_filters(search_query, status_id, start_date, end_date)
+
+    total_records = await db.run_sync(cached_total, record_counts.ORDERS, ACTIVE_ORDER_COUNT)
+    if search_query is not None and search_query.matches_nothing:
+        return {"recordsTotal": total_records, "recordsFiltered": 0, "data": [], "next_cursor": None}
+    if len(filters) == 1:
+        filtered_records = total_records
+    else:
+        filtered_records = await db.run_sync(
+            filtered_count, filtered_order_ids_select(filters)
+        )
+
+    page = order_page_select(db, AdminUser, DriverUser, filters, search_query, sort_order, cursor, start, length)
+    results, next_cursor = split_order_page((await db.execute(page)).all(), length, cursor)
+
+    order_ids = [row.id for row in results]
+    items_map = {}
+    if order_ids:
+        items_map = group_order_items((await db.execute(order_items_select(order_ids))).all())
+
+    if as_dicts:
+        orders = to_order_dicts(results, items_map)
+    else:
+        orders = [to_order_with_items(result, items_map.get(result.id, [])) for result in results]
+    return {
+        "recordsTotal": total_records,
+        "recordsFiltered": filtered_records,
+        "data": orders,
+        "next_cursor": next_cursor,
+    }
+
+
+async def update_order(db: AsyncSession, order_id: int, **kwargs):
+    validate_order_changes(kwargs)
+
+    order = (await db.execute(
+        select(Order).where(Order.id == order_id, Order.is_deleted == False).with_for_update()
+    )).scalars().first()
+    if not order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=Message.Error.ORDER_NOT_FOUND
+        )
+
+    await db.run_sync(require, *order_change_requirements(kwargs))
+
+    before = aggregated_values(order)
+    for key, value in kwargs.items():
+        setattr(order, key, value)
+
+    if aggregated_values(order) != before:
+        after = order_facts(order, totals_from_rows((await db.execute(item_totals_select(order_id))).all()))
+        await db.run_sync(record_order_change, replace(after, **dict(zip(AGGREGATED_FIELDS, before))), after)
+
+    order_events.queue_event(db, await db.run_sync(order_events.updated_event, order, kwargs))
+    await db.commit()
+    await db.refresh(order)
+    return order
+
+
+async def bulk_update_orders(db: AsyncSession, versions: list, changes: dict) -> dict:
+    """Set the status and/or driver of many orders; see order_service.apply_bulk_order_update."""
+    try:
+        report = await db.run_sync(apply_bulk_order_update, versions, changes)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return report
+
+
+async def hard_delete_order(db: AsyncSession, order_id: int):
+    order = await db.get(Order, order_id, with_for_update=True)
+    if not order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=Message.Error.ORDER_NOT_FOUND
+        )
+
+    was_active = not order.is_deleted
+    if was_active:
+        await db.run_sync(record_order_change, await db.run_sync(load_order_facts, order), None)
+        order_events.queue_event(db, order_events.deleted_event(order_id))
+    await db.delete(order)
+    await db.commit()
+    if was_active:
+        record_counts.adjust_total(record_counts.ORDERS, -1)
@@ -1,27 +1,56 @@
-from app.core.security import create_access_token, verify_password_hash
+from app.core.security import create_access_token
+from app.core.login_throttle import check_login_allowed, record_login_failure, record_login_success
+from app.core.password_hashing import hash_password_async, needs_rehash, verify_password_async
 from app.messages.messages import Message
 from sqlalchemy.orm import Session
 from app.models.users import User
-from fastapi import HTTPException, status 
-from app.core.security import get_password_hash, create_access_token
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from app.dto.auth_dto import SignupRequest , SignupResponse
 from app.utils.db_validation import *
+from app.utils import record_counts
+
+# Password hashing runs on the hashing pool while the handler awaits it. The
+# database work around it runs in the threadpool and ends its transaction
+# first, so no connection is held while bcrypt runs.
+
+def _login_candidate(db: Session, email: str):
+    user = db.query(User.id, User.role_id, User.email, User.name, User.password_hash).filter(
+        User.email == email, User.is_deleted == False
+    ).first()
+    db.rollback()
+    return user
+
+def _store_password_hash(db: Session, user_id: int, old_hash: str, new_hash: str):
+    # Skipped if the password changed while the new hash was computed
+    db.query(User).filter(User.id == user_id, User.password_hash == old_hash).update(
+        {User.password_hash: new_hash}, synchronize_session=False
+    )
+    db.commit()
+
+async def authenticate(email: str, password: str, db: Session, client_ip: str | None = None):
+    check_login_allowed(email, client_ip)
 
-def authenticate(email: str, password: str, db: Session):
     # Find user by email
-    user = db.query(User).filter(User.email == email, User.is_deleted == False).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=Message.Error.AUTH_FAILED
-        )
+    user = await run_in_threadpool(_login_candidate, db, email)
     # Verify password hash
-    if not verify_password_hash(password, user.password_hash):
+    if not user or not await verify_password_async(password, user.password_hash):
+        record_login_failure(email, client_ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=Message.Error.AUTH_FAILED
+            detail=Message.Error.INVALID_CREDENTIALS
         )
+    record_login_success(email)
+
+    # Upgrade hashes made with a different BCRYPT_ROUNDS; best effort, the
+    # login succeeds either way
+    if needs_rehash(user.password_hash):
+        try:
+            new_hash = await hash_password_async(password)
+        except HTTPException:
+            new_hash = None
+        if new_hash:
+            await run_in_threadpool(_store_password_hash, db, user.id, user.password_hash, new_hash)
 
     token_payload = {
         "user_id": user.id,
@@ -33,13 +62,13 @@ def authenticate(email: str, password: str, db: Session):
     token = create_access_token(user=token_payload)
     return {"access_token": token, "token_type": "bearer"}
 
-def signup(data:SignupRequest, db:Session):
+def _validate_signup(db: Session, data: SignupRequest):
     # check if user already exists
-    existing_user = db.query(User).filter(User.email == data.email, User.is_deleted == False).first()
+    existing_user = db.query(User.id).filter(User.email == data.email, User.is_deleted == False).first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=Message.Error.EMAIL_ALREADY_EXSIST
+            detail=Message.Error.EMAIL_ALREADY_EXISTS
         )
     
     if not company_exists(db = db,company_id = data.company_id):
@@ -53,8 +82,9 @@ def signup(data:SignupRequest, db:Session):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=Message.Error.ROLE_NOT_FOUND
         )
+    db.rollback()
 
-    # create new user
+def _create_user(db: Session, data: SignupRequest, password_hash: str) -> User:
     new_user = User(
         name=data.name,
         email=data.email,
@@ -62,15 +92,28 @@ def signup(data:SignupRequest, db:Session):
         address=data.address,
         company_id=data.company_id or 2,
         role_id=data.role_id or 4,
-        password_hash=get_password_hash(data.password)
+        password_hash=password_hash
     )
 
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
+    record_counts.invalidate_total(record_counts.USERS)
+    return new_user
+
+async def signup(data:SignupRequest, db:Session):
+    await run_in_threadpool(_validate_signup, db, data)
+    password_hash = await hash_password_async(data.password)
+    # create new user
+    new_user = await run_in_threadpool(_create_user, db, data, password_hash)
 
     # generate token (optional - auto login after signup)
-    token = create_access_token(subject=str(new_user.id))
+    token = create_access_token(user={
+        "user_id": new_user.id,
+        "role_id": new_user.role_id,
+        "email": new_user.email,
+        "name": new_user.name
+    })
 
     data = {
         "id": new_user.id,
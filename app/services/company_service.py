@@ -6,12 +6,20 @@ Handles CRUD operations, soft delete/restore, search, and integrity constraints.
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import select, func
 from sqlalchemy.exc import IntegrityError
 from app.models.company import Company
 from app.messages.messages import Message
+from app.utils import record_counts, reference_data
+from app.utils.record_counts import cached_total, filtered_count
+from app.utils.search import build_search, SearchField
 from fastapi import HTTPException, status
 
+COMPANY_SEARCH_FIELDS = [
+    SearchField(Company.name, Company.id, "companies_fts"),
+    SearchField(Company.address, Company.id, "companies_fts"),
+]
+
 def create_company(db: Session, name: str, address: str | None = None) -> Company:
     """
     Create a new company or restore a soft-deleted one with the same name.
@@ -21,6 +29,8 @@ def create_company(db: Session, name: str, address: str | None = None) -> Compan
         db.add(company)
         db.commit()
         db.refresh(company)
+        record_counts.invalidate_total(record_counts.COMPANIES)
+        reference_data.invalidate(reference_data.COMPANIES)
         return company
     except IntegrityError:
         db.rollback()
@@ -33,6 +43,8 @@ def create_company(db: Session, name: str, address: str | None = None) -> Compan
             existing.address = address
             db.commit()
             db.refresh(existing)
+            record_counts.invalidate_total(record_counts.COMPANIES)
+            reference_data.invalidate(reference_data.COMPANIES)
             return existing
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -69,19 +81,19 @@ def list_companies(db: Session, skip: int = 0, limit: int = 10, search: str = ""
     """
     base_query = db.query(Company).filter(Company.is_deleted == False)
     
-    total_records = base_query.count()
+    total_records = cached_total(
+        db, record_counts.COMPANIES,
+        select(func.count(Company.id)).where(Company.is_deleted == False)
+    )
     
     search_query = base_query
-    if search:
-        search_term = f"%{search.strip()}%"
-        search_query = base_query.filter(
-            or_(
-                Company.name.ilike(search_term),
-                Company.address.ilike(search_term)
-            )
+    filtered_records = total_records
+    company_search = build_search(db, search, COMPANY_SEARCH_FIELDS)
+    if company_search is not None:
+        search_query = base_query.filter(company_search.filter).order_by(company_search.rank.desc(), Company.id)
+        filtered_records = filtered_count(
+            db, select(Company.id).where(Company.is_deleted == False, company_search.filter)
         )
-        
-    filtered_records = search_query.count()
     
     companies = search_query.offset(skip).limit(limit).all()
     
@@ -112,6 +124,7 @@ def update_company(db: Session, company_id: int, name: str | None, address: str
         
     db.commit()
     db.refresh(company)
+    reference_data.invalidate(reference_data.COMPANIES)
     return company
 
 def search_companies(db: Session, search_term: str, skip: int = 0, limit: int = 20) -> list[Company]:
@@ -124,10 +137,11 @@ def search_companies(db: Session, search_term: str, skip: int = 0, limit: int =
             detail="Search term must be at least 2 characters"
         )
     
+    name_search = build_search(db, search_term, [COMPANY_SEARCH_FIELDS[0]])
     companies = db.query(Company).filter(
-        Company.name.ilike(f"%{search_term.strip()}%"),
+        name_search.filter,
         Company.is_deleted == False
-    ).offset(skip).limit(limit).all()
+    ).order_by(name_search.rank.desc(), Company.id).offset(skip).limit(limit).all()
     
     return companies
 
@@ -138,6 +152,8 @@ def soft_delete_company(db: Session, company_id: int) -> Company:
     company = get_company_by_id(db, company_id)
     company.is_deleted = True
     db.commit()
+    record_counts.invalidate_total(record_counts.COMPANIES)
+    reference_data.invalidate(reference_data.COMPANIES)
     return company
 
 def permanent_delete_company(db: Session, company_id: int) -> None:
@@ -153,9 +169,11 @@ def permanent_delete_company(db: Session, company_id: int) -> None:
     
     db.delete(company)
     db.commit()
+    record_counts.invalidate_total(record_counts.COMPANIES)
+    reference_data.invalidate(reference_data.COMPANIES)
 
-def get_all_companies(db: Session) -> list[Company]:
+def get_all_companies(db: Session) -> list[dict]:
     """
-    Retrieve all non-deleted companies.
+    Retrieve all non-deleted companies (id, name, address) from the reference cache.
     """
-    return db.query(Company).filter(Company.is_deleted == False).all()
\ No newline at end of file
+    return list(reference_data.get_reference(db, reference_data.COMPANIES).rows)
\ No newline at end of file
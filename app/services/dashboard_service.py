@@ -1,53 +1,150 @@
+from datetime import date
+from typing import List, Optional
+from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, func, select
+from app.core.config import settings
+from app.messages.messages import Message
 from app.models.order import Order
 from app.models.order_item import OrderItem
+from app.models.order_rollup import OrderRollup
 from app.models.gas import Gas
-from app.models.order_status import OrderStatus
+from app.utils import dashboard_stats, order_rollup, reference_data
+from app.utils.dashboard_stats import (
+    DashboardSnapshot, PENDING_STATUS_ID, OUT_FOR_DELIVERY_STATUS_ID, COMPLETED_STATUS_ID
+)
+
+def _status_count(status_id: int):
+    return func.count(case((Order.status_id == status_id, Order.id)))
+
+# DASHBOARD_SOURCE=live: every counter from one conditional-aggregation scan
+STATUS_TOTALS_SELECT = select(
+    _status_count(PENDING_STATUS_ID).label("total_pending_orders"),
+    _status_count(COMPLETED_STATUS_ID).label("total_completed_orders"),
+    _status_count(OUT_FOR_DELIVERY_STATUS_ID).label("total_out_for_delivery_orders"),
+).where(Order.is_deleted == False)
+
+GAS_REQUIREMENTS_SELECT = (
+    select(Gas.name, func.sum(OrderItem.quantity))
+    .join(OrderItem, Gas.id == OrderItem.gas_id)
+    .join(Order, OrderItem.order_id == Order.id)
+    .where(Order.status_id == PENDING_STATUS_ID, Order.is_deleted == False)
+    .group_by(Gas.name)
+)
+
+def live_insights(status_totals, gas_rows) -> dict:
+    return {
+        "total_pending_orders": status_totals.total_pending_orders,
+        "gas_requirements": {name: quantity for name, quantity in gas_rows},
+        "total_completed_orders": status_totals.total_completed_orders,
+        "total_out_for_delivery_orders": status_totals.total_out_for_delivery_orders,
+    }
 
 def get_dashboard_insights(db: Session):
     """
     Gathers all the insightful data for the admin dashboard.
+
+    By default the totals come from the dashboard_stats table, which order and
+    order item writes keep current, so this is a single read of a small table.
+    DASHBOARD_SOURCE=live aggregates the orders instead, in two statements.
+    """
+    if settings.DASHBOARD_SOURCE == "live":
+        return live_insights(db.execute(STATUS_TOTALS_SELECT).one(), db.execute(GAS_REQUIREMENTS_SELECT).all())
+
+    rows = db.execute(dashboard_stats.dashboard_stats_select()).all()
+    return dashboard_stats.insights_from_rows(rows)
+
+def get_dashboard_snapshot(db: Session) -> DashboardSnapshot:
+    """Dashboard insights and their ETag, served from memory when cached."""
+    snapshot = dashboard_stats.cached_snapshot()
+    if snapshot is None:
+        generation = dashboard_stats.snapshot_generation()
+        snapshot = dashboard_stats.remember_snapshot(get_dashboard_insights(db), generation)
+    return snapshot
+
+
+# --- Order analytics (order_rollup) ---
+
+ANALYTICS_GROUPS = {
+    "company": (OrderRollup.company_id, reference_data.COMPANIES),
+    "area": (OrderRollup.area, None),
+    "gas": (OrderRollup.gas_id, reference_data.GASES),
+    "status": (OrderRollup.status_id, reference_data.ORDER_STATUSES),
+}
+
+def get_order_analytics(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    granularity: str,
+    group_by: List[str],
+    company_id: Optional[int] = None,
+    area: Optional[str] = None,
+    gas_id: Optional[int] = None,
+    status_id: Optional[int] = None,
+):
+    """
+    Gas quantity and item count per day/week/month between two dates
+    (inclusive), split by any of company, area, gas and status.
+
+    Reads the order_rollup table, so the cost follows the number of buckets
+    returned rather than the number of orders. Week buckets start on Monday;
+    the first and last bucket only cover days inside the range.
     """
-    
-    # --- Status IDs ---
-    PENDING_STATUS_ID = 1
-    OUT_FOR_DELIVERY_STATUS_ID = 2
-    COMPLETED_STATUS_ID = 3
-
-    # 1. Total Pending Orders
-    total_pending_orders = db.query(func.count(Order.id)).filter(
-        Order.status_id == PENDING_STATUS_ID,
-        Order.is_deleted == False
-    ).scalar()
-
-    # 2. Gas requirements for pending orders
-    gas_requirements_query = (
-        db.query(Gas.name, func.sum(OrderItem.quantity))
-        .join(OrderItem, Gas.id == OrderItem.gas_id)
-        .join(Order, OrderItem.order_id == Order.id)
-        .filter(Order.status_id == PENDING_STATUS_ID, Order.is_deleted == False)
-        .group_by(Gas.name)
-        .all()
-    )
-    
-    gas_requirements = {name: quantity for name, quantity in gas_requirements_query}
-
-    # 3. Total Completed Orders
-    total_completed_orders = db.query(func.count(Order.id)).filter(
-        Order.status_id == COMPLETED_STATUS_ID,
-        Order.is_deleted == False
-    ).scalar()
-
-    # 4. Total "Out for Delivery" Orders
-    total_out_for_delivery_orders = db.query(func.count(Order.id)).filter(
-        Order.status_id == OUT_FOR_DELIVERY_STATUS_ID,
-        Order.is_deleted == False
-    ).scalar()
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=Message.Error.INVALID_DATE_RANGE
+        )
+    if set(group_by) - ANALYTICS_GROUPS.keys():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=Message.Error.INVALID_ANALYTICS_GROUP
+        )
+
+    period = order_rollup.period_start(db.get_bind().dialect.name, granularity, OrderRollup.day).label("period")
+    groups = [ANALYTICS_GROUPS[name][0] for name in group_by]
+
+    filters = [OrderRollup.day >= start_date, OrderRollup.day <= end_date]
+    for column, value in (
+        (OrderRollup.company_id, company_id),
+        (OrderRollup.area, area),
+        (OrderRollup.gas_id, gas_id),
+        (OrderRollup.status_id, status_id),
+    ):
+        if value is not None:
+            filters.append(column == value)
+
+    rows = db.execute(
+        select(period, *groups, func.sum(OrderRollup.quantity), func.sum(OrderRollup.items))
+        .where(*filters)
+        .group_by(period, *groups)
+        .having(func.sum(OrderRollup.items) > 0)
+        .order_by(period, *groups)
+    ).all()
+
+    # Names come from the reference data cache instead of joins
+    names = {
+        name: reference_data.get_reference(db, dataset).by_id
+        for name, (_, dataset) in ANALYTICS_GROUPS.items()
+        if dataset and name in group_by
+    }
+
+    buckets = []
+    for period_start, *values, quantity, items in rows:
+        bucket = {"period": period_start, "quantity": quantity, "items": items}
+        for name, value in zip(group_by, values):
+            if name == "area":
+                bucket["area"] = value
+            else:
+                bucket[f"{name}_id"] = value
+                bucket[f"{name}_name"] = names[name].get(value, {}).get("name")
+        buckets.append(bucket)
 
     return {
-        "total_pending_orders": total_pending_orders,
-        "gas_requirements": gas_requirements,
-        "total_completed_orders": total_completed_orders,
-        "total_out_for_delivery_orders": total_out_for_delivery_orders,
-    }
\ No newline at end of file
+        "start_date": start_date,
+        "end_date": end_date,
+        "granularity": granularity,
+        "group_by": group_by,
+        "buckets": buckets,
+    }
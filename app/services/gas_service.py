@@ -2,6 +2,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.models.gas import Gas
 from app.messages.messages import Message
+from app.utils.search import build_search, SearchField
+from app.utils import reference_data
 from fastapi import HTTPException, status
 
 def create_gas(db: Session, name: str, unit: str | None, description: str | None):
@@ -18,6 +20,7 @@ def create_gas(db: Session, name: str, unit: str | None, description: str | None
         existing_deleted.description = description
         db.commit()
         db.refresh(existing_deleted)
+        reference_data.invalidate(reference_data.GASES)
         return existing_deleted
     
     # Otherwise create new gas
@@ -26,6 +29,7 @@ def create_gas(db: Session, name: str, unit: str | None, description: str | None
         db.add(gas)
         db.commit()
         db.refresh(gas)
+        reference_data.invalidate(reference_data.GASES)
         return gas
     except IntegrityError:
         db.rollback()
@@ -50,7 +54,8 @@ def get_gas_by_id(db: Session, gas_id: int):
     return gas
 
 def list_gases(db: Session, skip: int = 0, limit: int = 50):
-    return db.query(Gas).filter(Gas.is_deleted == False).offset(skip).limit(limit).all()
+    gases = reference_data.get_reference(db, reference_data.GASES).rows
+    return list(gases[skip:skip + limit])
 
 def update_gas(db: Session, gas_id: int, name: str | None, unit: str | None, description: str | None):
     try:
@@ -65,6 +70,7 @@ def update_gas(db: Session, gas_id: int, name: str | None, unit: str | None, des
             
         db.commit()
         db.refresh(gas)
+        reference_data.invalidate(reference_data.GASES)
         return gas
     except IntegrityError:
         db.rollback()
@@ -86,6 +92,7 @@ def soft_delete_gas(db: Session, gas_id: int):
         gas = get_gas_by_id(db, gas_id)
         gas.is_deleted = True
         db.commit()
+        reference_data.invalidate(reference_data.GASES)
         return gas
     except HTTPException:
         raise
@@ -99,7 +106,8 @@ def soft_delete_gas(db: Session, gas_id: int):
 def search_gases(db: Session, name: str | None = None, skip: int = 0, limit: int = 50):
     query = db.query(Gas).filter(Gas.is_deleted == False)
     
-    if name:
-        query = query.filter(Gas.name.ilike(f"%{name}%"))
+    name_search = build_search(db, name, [SearchField(Gas.name, Gas.id, "gases_fts")])
+    if name_search is not None:
+        query = query.filter(name_search.filter).order_by(name_search.rank.desc(), Gas.id)
         
     return query.offset(skip).limit(limit).all()
\ No newline at end of file
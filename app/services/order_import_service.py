@@ -0,0 +1,349 @@
+"""
+Order Import Service
+--------------------
+Bulk ingest of order sheets uploaded as NDJSON or CSV.
+
+Rows are validated against company and gas lookup tables that are loaded once
+per import, then written in chunks (one multi-row INSERT ... RETURNING for the
+orders and one executemany for their items per chunk) inside a single
+transaction. Every input row gets an entry in the returned report.
+
+Row format (NDJSON, one object per line):
+    {"company_id": 3, "area": "Hazira", "mobile_no": "...", "notes": "...",
+     "items": [{"gas_id": 1, "quantity": 10}, {"gas": "Argon", "quantity": 2}]}
+
+Row format (CSV, header required):
+    company,area,mobile_no,notes,items
+    Hare Krishna Gas Agency,Hazira,,,"Oxygen:10;4:2"
+
+`company` may be a company id or name, and each gas in `items` may be a gas id
+or name. `company_id` is accepted as an alias of `company`.
+"""
+
+import csv
+import codecs
+import json
+from typing import AsyncIterator, Iterable, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.models.company import Company
+from app.models.gas import Gas
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.messages.messages import Message
+from app.services.order_service import PENDING_STATUS_ID
+from app.utils import order_events, record_counts
+from app.utils.order_aggregates import OrderChange, OrderFacts, item_totals
+from app.utils.order_rollup import rollup_day
+
+FORMAT_NDJSON = "ndjson"
+FORMAT_CSV = "csv"
+
+# Column limits, checked per row so one oversized cell fails its row instead
+# of the chunk INSERT (Postgres raises DataError; SQLite would store it)
+AREA_MAX_LENGTH = Order.__table__.c.area.type.length
+MOBILE_NO_MAX_LENGTH = Order.__table__.c.mobile_no.type.length
+MAX_QUANTITY = 2 ** 31 - 1  # order_items.quantity is a 32-bit Integer
+
+
+async def iter_upload_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split a streamed request body into text lines without buffering the whole upload.
+    A body that is not UTF-8 is rejected with 400.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    try:
+        async for chunk in chunks:
+            buffer += decoder.decode(chunk)
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                yield line.rstrip("\r")
+        buffer += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=Message.Error.ORDER_IMPORT_INVALID_ENCODING
+        )
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+def parse_ndjson_line(line: str):
+    """Parse one NDJSON line into a row dict, raising ValueError when it is not an object."""
+    row = json.loads(line)
+    if not isinstance(row, dict):
+        raise ValueError(Message.Error.ORDER_IMPORT_INVALID_ROW)
+    return row
+
+
+class CsvRowParser:
+    """
+    Incremental CSV parser fed one physical line at a time.
+
+    Quoted fields may span lines, so lines are held back until their quotes
+    balance. The first complete record is taken as the header.
+    """
+
+    def __init__(self):
+        self.header: Optional[List[str]] = None
+        self._pending = ""
+
+    def feed(self, line: str):
+        """Return a row dict once a full record is available, otherwise None."""
+        self._pending = f"{self._pending}\n{line}" if self._pending else line
+        if self._pending.count('"') % 2:
+            return None
+        record, self._pending = self._pending, ""
+        values = next(csv.reader([record]), [])
+        if self.header is None:
+            self.header = [value.strip().lower() for value in values]
+            return None
+        return dict(zip(self.header, values))
+
+    def finish(self):
+        if self._pending:
+            raise ValueError(Message.Error.ORDER_IMPORT_INVALID_ROW)
+
+
+class OrderImporter:
+    """
+    Validates and inserts imported orders for a single request.
+
+    Call `import_rows` with successive batches of `(row_number, row, error)`
+    tuples, then `finish` to commit and get the report. Nothing is committed
+    until `finish`, so a database failure rolls back the whole import.
+    """
+
+    def __init__(self, db: Session, admin_id: int, chunk_size: int = 500):
+        self.db = db
+        self.admin_id = admin_id
+        self.chunk_size = chunk_size
+        self.results: List[dict] = []
+        self.created = 0
+        self.failed = 0
+        self.aggregates = OrderChange()
+        self._load_lookups()
+
+    def _load_lookups(self):
+        self.company_ids = set()
+        self.company_names = {}
+        for company_id, name in self.db.query(Company.id, Company.name).filter(Company.is_deleted == False).all():
+            self.company_ids.add(company_id)
+            self.company_names[name.strip().lower()] = company_id
+
+        self.gas_ids = set()
+        self.gas_names = {}
+        for gas_id, name in self.db.query(Gas.id, Gas.name).filter(Gas.is_deleted == False).all():
+            self.gas_ids.add(gas_id)
+            self.gas_names[name.strip().lower()] = gas_id
+
+    def _resolve(self, value, ids: set, names: dict) -> Optional[int]:
+        if value is None:
+            return None
+        text = str(value).strip()
+        if text.isdigit():
+            return int(text) if int(text) in ids else None
+        return names.get(text.lower())
+
+    def _parse_items(self, raw_items) -> list:
+        """Normalise items to [(gas_ref, quantity)], accepting a list of dicts or 'gas:qty;gas:qty'."""
+        if isinstance(raw_items, str):
+            items = []
+            for part in filter(None, (p.strip() for p in raw_items.split(";"))):
+                gas_ref, _, quantity = part.rpartition(":")
+                items.append((gas_ref, quantity))
+            return items
+        if isinstance(raw_items, list):
+            return [
+                (item.get("gas_id", item.get("gas")), item.get("quantity"))
+                if isinstance(item, dict) else (None, None)
+                for item in raw_items
+            ]
+        return []
+
+    def _validate(self, row: dict):
+        """Return (order_params, item_params, errors) for one input row."""
+        errors = []
+
+        company_ref = row.get("company_id", row.get("company"))
+        company_id = self._resolve(company_ref, self.company_ids, self.company_names)
+        if company_id is None:
+            errors.append(Message.Error.COMPANY_NOT_FOUND)
+
+        area = str(row.get("area") or "").strip()
+        if not area:
+            errors.append(f"area: {Message.Error.REQUIRED_FIELD}")
+        elif len(area) > AREA_MAX_LENGTH:
+            errors.append(f"area: {Message.Error.VALUE_TOO_LONG} (max {AREA_MAX_LENGTH} characters)")
+
+        mobile_no = str(row.get("mobile_no") or "").strip() or None
+        if mobile_no is not None and len(mobile_no) > MOBILE_NO_MAX_LENGTH:
+            errors.append(f"mobile_no: {Message.Error.VALUE_TOO_LONG} (max {MOBILE_NO_MAX_LENGTH} characters)")
+
+        items = []
+        parsed_items = self._parse_items(row.get("items"))
+        if not parsed_items:
+            errors.append(Message.Error.MINIMUM_ITEM_REQUIRED)
+        for gas_ref, quantity in parsed_items:
+            gas_id = self._resolve(gas_ref, self.gas_ids, self.gas_names)
+            if gas_id is None:
+                errors.append(f"{Message.Error.GAS_NOT_FOUND} ({gas_ref})")
+                continue
+            try:
+                quantity = int(str(quantity).strip())
+            except ValueError:
+                quantity = 0
+            if quantity <= 0:
+                errors.append(Message.Error.INVALID_QUANTITY)
+                continue
+            if quantity > MAX_QUANTITY:
+                errors.append(f"{Message.Error.QUANTITY_TOO_LARGE} (max {MAX_QUANTITY})")
+                continue
+            items.append({"gas_id": gas_id, "quantity": quantity})
+
+        if errors:
+            return None, None, errors
+
+        notes = str(row.get("notes") or "").strip() or None
+        order_params = {
+            "company_id": company_id,
+            "admin_id": self.admin_id,
+            "area": area,
+            "mobile_no": mobile_no,
+            "notes": notes,
+            "status_id": PENDING_STATUS_ID,
+            "is_deleted": False,
+        }
+        return order_params, items, []
+
+    def import_rows(self, rows: Iterable[tuple]):
+        """
+        Validate a batch of `(row_number, row, parse_error)` tuples and insert
+        the valid ones in chunks of `chunk_size`.
+        """
+        pending = []
+        for row_number, row, parse_error in rows:
+            if parse_error:
+                self._fail(row_number, [parse_error])
+                continue
+            order_params, item_params, errors = self._validate(row)
+            if errors:
+                self._fail(row_number, errors)
+                continue
+            pending.append((row_number, order_params, item_params))
+            if len(pending) >= self.chunk_size:
+                self._insert_chunk(pending)
+                pending = []
+        if pending:
+            self._insert_chunk(pending)
+
+    def _fail(self, row_number: int, errors: List[str]):
+        self.failed += 1
+        self.results.append({"row": row_number, "status": "error", "order_id": None, "errors": errors})
+
+    def _insert_chunk(self, pending: list):
+        created = self.db.execute(
+            insert(Order).returning(Order.id, Order.created_at, sort_by_parameter_order=True),
+            [order_params for _, order_params, _ in pending],
+        ).all()
+        order_ids = [order.id for order in created]
+
+        item_params = [
+            {"order_id": order_id, **item}
+            for order_id, (_, _, items) in zip(order_ids, pending)
+            for item in items
+        ]
+        self.db.execute(insert(OrderItem), item_params)
+
+        for order, (_, order_params, items) in zip(created, pending):
+            self.aggregates.record(None, OrderFacts(
+                PENDING_STATUS_ID, order_params["company_id"], order_params["area"],
+                rollup_day(order.created_at), item_totals(items),
+            ))
+
+        for order_id, (row_number, _, _) in zip(order_ids, pending):
+            self.results.append({"row": row_number, "status": "created", "order_id": order_id, "errors": []})
+        self.created += len(order_ids)
+
+    def finish(self) -> dict:
+        """Commit the import and return the per-row report."""
+        self.aggregates.apply(self.db)
+        if self.created:
+            order_events.queue_event(self.db, order_events.imported_event(self.created))
+        self.db.commit()
+        record_counts.adjust_total(record_counts.ORDERS, self.created)
+        self.results.sort(key=lambda result: result["row"])
+        return {
+            "total_rows": self.created + self.failed,
+            "created": self.created,
+            "failed": self.failed,
+            "results": self.results,
+        }
+
+    def abort(self):
+        self.db.rollback()
+
+
+async def import_orders(
+    db: Session,
+    admin_id: int,
+    chunks: AsyncIterator[bytes],
+    upload_format: str,
+    chunk_size: int = 500,
+) -> dict:
+    """
+    Stream an NDJSON or CSV upload into the database and return the per-row report.
+
+    Parsing happens as the body arrives; database work is handed to the
+    threadpool one chunk at a time so the event loop is never blocked.
+    """
+    if upload_format not in (FORMAT_NDJSON, FORMAT_CSV):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=Message.Error.ORDER_IMPORT_UNSUPPORTED_FORMAT
+        )
+
+    importer = await run_in_threadpool(OrderImporter, db, admin_id, chunk_size)
+    csv_parser = CsvRowParser() if upload_format == FORMAT_CSV else None
+    batch = []
+    row_number = 0
+
+    try:
+        async for line in iter_upload_lines(chunks):
+            if csv_parser is None and not line.strip():
+                continue
+            try:
+                if csv_parser is not None:
+                    row = csv_parser.feed(line)
+                    if row is None or not any(value.strip() for value in row.values()):
+                        continue
+                else:
+                    row = parse_ndjson_line(line)
+                parse_error = None
+            except ValueError:
+                row, parse_error = None, Message.Error.ORDER_IMPORT_INVALID_ROW
+
+            row_number += 1
+            batch.append((row_number, row, parse_error))
+            if len(batch) >= chunk_size:
+                await run_in_threadpool(importer.import_rows, batch)
+                batch = []
+
+        if csv_parser is not None:
+            try:
+                csv_parser.finish()
+            except ValueError:
+                row_number += 1
+                batch.append((row_number, None, Message.Error.ORDER_IMPORT_INVALID_ROW))
+        if batch:
+            await run_in_threadpool(importer.import_rows, batch)
+
+        return await run_in_threadpool(importer.finish)
+    except Exception:
+        await run_in_threadpool(importer.abort)
+        raise
@@ -4,23 +4,22 @@ from app.models.gas import Gas
 from app.messages.messages import Message
 from app.models.order import Order
 from fastapi import HTTPException, status
-from app.utils.db_validation import order_exists, gas_exists
+from app.utils.db_validation import require, active_order, active_gases
+from app.utils.order_aggregates import item_change, order_facts, record_order_change
 from app.messages.messages import Message
 
+def _record_item_change(db: Session, order_id: int, gas_id: int, quantity_delta: int, items_delta: int):
+    """Add an item change to the order aggregates if its order is active."""
+    # Locked so a concurrent change of the order itself sees this item
+    order = db.query(Order.status_id, Order.company_id, Order.area, Order.created_at).filter(
+        Order.id == order_id, Order.is_deleted == False
+    ).with_for_update().first()
+    if order:
+        record_order_change(db, *item_change(order_facts(order, {}), gas_id, quantity_delta, items_delta))
+
 def create_order_item(db: Session, order_id: int, gas_id: int, quantity: int):
-    # Validate order exists and is not deleted
-    if not order_exists(db, order_id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=Message.Error.ORDER_NOT_FOUND
-        )
-    
-    # Validate gas exists and is not deleted
-    if not gas_exists(db, gas_id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=Message.Error.GAS_NOT_FOUND
-        )
+    # Validate order and gas exist and are not deleted, in one query
+    require(db, active_order(order_id), active_gases([gas_id]))
     
     # Validate quantity is positive
     if quantity <= 0:
@@ -32,12 +31,16 @@ def create_order_item(db: Session, order_id: int, gas_id: int, quantity: int):
     # Create new order item
     order_item = OrderItem(order_id=order_id, gas_id=gas_id, quantity=quantity)
     db.add(order_item)
+    _record_item_change(db, order_id, gas_id, quantity, 1)
     db.commit()
     db.refresh(order_item)
     return order_item
 
-def get_order_item_by_id(db: Session, order_item_id: int):
-    order_item = db.query(OrderItem).filter(OrderItem.id == order_item_id).first()
+def get_order_item_by_id(db: Session, order_item_id: int, for_update: bool = False):
+    query = db.query(OrderItem).filter(OrderItem.id == order_item_id)
+    if for_update:
+        query = query.with_for_update()
+    order_item = query.first()
     if not order_item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -49,14 +52,16 @@ def get_order_items_by_order(db: Session, order_id: int):
     return db.query(OrderItem).filter(OrderItem.order_id == order_id).all()
 
 def update_order_item_quantity(db: Session, order_item_id: int, quantity: int):
-    order_item = get_order_item_by_id(db, order_item_id)
+    order_item = get_order_item_by_id(db, order_item_id, for_update=True)
+    _record_item_change(db, order_item.order_id, order_item.gas_id, quantity - order_item.quantity, 0)
     order_item.quantity = quantity
     db.commit()
     db.refresh(order_item)
     return order_item
 
 def delete_order_item(db: Session, order_item_id: int):
-    order_item = get_order_item_by_id(db, order_item_id)
+    order_item = get_order_item_by_id(db, order_item_id, for_update=True)
+    _record_item_change(db, order_item.order_id, order_item.gas_id, -order_item.quantity, -1)
     db.delete(order_item)
     db.commit()
     return {"message": "Order item deleted", "id": order_item_id}
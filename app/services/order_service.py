@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session, aliased
-from sqlalchemy import func, or_
+from sqlalchemy import func, and_, insert, select, tuple_, update
 from app.models.order import Order
 from app.models.order_item import OrderItem
 from app.models.company import Company
@@ -9,16 +9,39 @@ from app.models.gas import Gas
 from app.messages.messages import Message
 from fastapi import HTTPException, status
 from typing import List, Optional
-from datetime import datetime
-import pytz
-from app.services.order_item_service import create_order_item
+from dataclasses import replace
+from datetime import datetime, timezone
+import base64
+import json
+from zoneinfo import ZoneInfo
 from app.utils.db_validation import (
-    order_exists, company_exists, user_exists, gas_exists, order_status_exists,
-    is_admin, is_driver
+    order_exists, require, active_company, active_gases, active_user, driver_user, order_status
 )
-from app.dto.order_dto import OrderRead, OrderWithItemsRead, OrderItemCreate
+from app.core import fast_json
+from app.core.config import settings
+from app.core.role import Role
+from app.utils import order_events, record_counts, reference_data
+from app.utils.order_aggregates import (
+    OrderChange, OrderFacts, load_order_facts, item_totals, record_order_change,
+    order_facts, orders_item_totals_select, totals_by_order,
+)
+from app.utils.order_rollup import rollup_day
+from app.utils.record_counts import cached_total, filtered_count
+from app.utils.search import build_search, SearchField
+from app.dto.order_dto import OrderRead, OrderWithItemsRead, OrderItemCreate, DriverOrderRead, OrderBulkUpdateRow, OrderVersion
 from app.dto.order_item_dto import OrderItemRead
 
+PENDING_STATUS_ID = 1
+OUT_FOR_DELIVERY_STATUS_ID = 2
+OVERDUE_STATUS_ID = 4
+
+# Statuses a driver still has work to do on (ix_orders_driver_open)
+DRIVER_OPEN_STATUS_IDS = (PENDING_STATUS_ID, OUT_FOR_DELIVERY_STATUS_ID, OVERDUE_STATUS_ID)
+
+IST = ZoneInfo('Asia/Kolkata')
+
+ACTIVE_ORDER_COUNT = select(func.count(Order.id)).where(Order.is_deleted == False)
+
 def create_order(
     db: Session,
     company_id: int,
@@ -28,124 +51,279 @@ def create_order(
     notes: str,
     items: List[OrderItemCreate],
 ):
+    """
+    Create an order and all of its items in a single transaction.
+
+    Validation is set-based (one query for company, admin, status and all gas
+    ids) and the items are written with a single executemany, so the number
+    of round trips does not grow with the number of items.
+    """
+    validate_new_order(area, items)
+
+    # Company, admin, default status and every gas in one round trip
+    context = db.execute(order_context_select(company_id, admin_id, {item.gas_id for item in items})).first()
+    validate_order_context(context)
+
+    area = area.strip()
+    mobile_no = mobile_no.strip() if mobile_no else None
+    notes = notes.strip() if notes else None
+
+    try:
+        # Create order, reading back generated id and timestamps
+        created = db.execute(
+            new_order_insert(company_id, admin_id, area, mobile_no, notes)
+        ).one()
+
+        # Add all order items in one executemany
+        db.execute(insert(OrderItem), order_item_params(created.id, items))
+        record_order_change(db, None, new_order_facts(created, company_id, area, items))
+        order = new_order_read(created, context, company_id, admin_id, area, mobile_no, notes)
+        order_events.queue_event(db, order_events.created_event(db, order, items))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    record_counts.adjust_total(record_counts.ORDERS, 1)
+    return order
+
+# --- Statement and row helpers shared with async_order_service ---
+
+def validate_new_order(area: str, items: List[OrderItemCreate]):
+    """Input checks for a new order that need no database access."""
+    # Validate area is provided
+    if not area or not area.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=Message.Error.REQUIRED_FIELD
+        )
+    
+    # Validate items are provided
+    if not items or len(items) == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=Message.Error.MINIMUM_ITEM_REQUIRED
+        )
+
+    # Validate quantities are positive
+    if any(item.quantity <= 0 for item in items):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=Message.Error.INVALID_QUANTITY
+        )
+
+def order_context_select(company_id: int, admin_id: int, gas_ids):
+    """
+    Company, admin and pending status for a new order, and whether all of
+    `gas_ids` are active, in one row (None if the company is missing).
+    """
+    AdminUser = aliased(User)
+    return (
+        select(
+            Company.name.label("company_name"),
+            Company.address.label("company_address"),
+            AdminUser.name.label("admin_name"),
+            AdminUser.role_id.label("admin_role_id"),
+            OrderStatus.name.label("status_name"),
+            active_gases(gas_ids).test.label("gases_active"),
+        )
+        .select_from(Company)
+        .outerjoin(AdminUser, and_(AdminUser.id == admin_id, AdminUser.is_deleted == False))
+        .outerjoin(OrderStatus, OrderStatus.id == PENDING_STATUS_ID)
+        .where(Company.id == company_id, Company.is_deleted == False)
+    )
+
+def validate_order_context(context):
+    """Raise the matching error for a row from order_context_select."""
     # Validate company exists
-    if not company_exists(db, company_id):
+    if context is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=Message.Error.COMPANY_NOT_FOUND
         )
     
-    # Validate admin exists and is actually an admin
-    if not user_exists(db, admin_id):
+    # Validate admin exists
+    if context.admin_name is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=Message.Error.USER_NOT_FOUND
         )
     
     # Validate weather the user is admin or not
-    if not is_admin(db, admin_id):
+    if context.admin_role_id != Role.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=Message.Error.NOT_ADMIN
         )
-    
-    # Validate area is provided
-    if not area or not area.strip():
+
+    # Validate every gas exists and is not deleted
+    if not context.gases_active:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=Message.Error.REQUIRED_FIELD
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=Message.Error.GAS_NOT_FOUND
         )
-    
-    # Validate items are provided
-    if not items or len(items) == 0:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=Message.Error.MINIMUM_ITEM_REQUIRED
+
+def new_order_insert(company_id: int, admin_id: int, area: str, mobile_no: Optional[str], notes: Optional[str]):
+    """INSERT for a pending order returning its generated id and timestamps."""
+    return (
+        insert(Order)
+        .values(
+            company_id=company_id,
+            admin_id=admin_id,
+            area=area,
+            mobile_no=mobile_no,
+            notes=notes,
+            status_id=PENDING_STATUS_ID,
+            is_deleted=False,
         )
+        .returning(Order.id, Order.created_at, Order.updated_at)
+    )
+
+def new_order_facts(created, company_id: int, area: str, items: List[OrderItemCreate]) -> OrderFacts:
+    return OrderFacts(PENDING_STATUS_ID, company_id, area, rollup_day(created.created_at), item_totals(items))
+
+# Order fields the pre-aggregated tables are keyed by (see app/utils/order_aggregates.py)
+AGGREGATED_FIELDS = ("status_id", "company_id", "area")
 
-    # Create order
-    order = Order(
+def aggregated_values(order) -> tuple:
+    return tuple(getattr(order, field) for field in AGGREGATED_FIELDS)
+
+def order_item_params(order_id: int, items: List[OrderItemCreate]) -> List[dict]:
+    return [
+        {"order_id": order_id, "gas_id": item.gas_id, "quantity": item.quantity}
+        for item in items
+    ]
+
+def new_order_read(created, context, company_id, admin_id, area, mobile_no, notes) -> OrderRead:
+    return OrderRead(
+        id=created.id,
         company_id=company_id,
+        company_name=context.company_name,
+        company_address=context.company_address,
+        status_id=PENDING_STATUS_ID,
+        status_name=context.status_name,
         admin_id=admin_id,
-        area=area.strip(),
-        mobile_no=mobile_no.strip() if mobile_no else None,
-        notes=notes.strip() if notes else None,
-        status_id=1,  # Default: PENDING
+        admin_name=context.admin_name,
+        driver_id=None,
+        driver_name=None,
+        area=area,
+        mobile_no=mobile_no,
+        notes=notes,
+        created_at=created.created_at,
+        updated_at=created.updated_at,
     )
-    db.add(order)
-    db.commit()
-    db.refresh(order)
-
-    # Add order items
-    for item in items:
-        create_order_item(
-            db=db,
-            order_id=order.id,
-            gas_id=item.gas_id,
-            quantity=item.quantity,
-        )
-    
-    db.commit()
-    db.refresh(order)
 
+def order_columns(AdminUser, DriverUser) -> tuple:
+    """Columns of an order row as returned by the listing and detail endpoints."""
+    return (
+        Order.id,
+        Order.company_id,
+        Company.name.label("company_name"),
+        Company.address.label("company_address"),
+        Order.status_id,
+        OrderStatus.name.label("status_name"),
+        Order.admin_id,
+        AdminUser.name.label("admin_name"),
+        Order.driver_id,
+        DriverUser.name.label("driver_name"),
+        Order.area,
+        Order.mobile_no,
+        Order.notes,
+        Order.created_at,
+        Order.updated_at,
+    )
+
+def order_search_fields(DriverUser) -> List[SearchField]:
+    """Matched through orders' foreign keys, so each table is searched by its own index (see app/utils/search.py)"""
+    return [
+        SearchField(Company.name, Company.id, "companies_fts", via=Order.company_id),
+        SearchField(User.name, User.id, "users_fts", via=Order.driver_id, key_filter=(User.role_id == Role.DRIVER,),
+                    ranked=DriverUser.name),
+        SearchField(OrderStatus.name, OrderStatus.id, via=Order.status_id),
+    ]
+
+def order_items_select(order_ids):
+    return (
+        select(OrderItem, Gas.name, Gas.unit)
+        .join(Gas, OrderItem.gas_id == Gas.id)
+        .where(OrderItem.order_id.in_(order_ids))
+    )
+
+def group_order_items(item_rows) -> dict:
+    """Map order id -> list of item dicts from rows of order_items_select."""
+    items_map = {}
+    for item in item_rows:
+        item_data = {
+            "id": item.OrderItem.id, "order_id": item.OrderItem.order_id,
+            "gas_id": item.OrderItem.gas_id, "quantity": item.OrderItem.quantity,
+            "gas_name": item.name, "gas_unit": item.unit,
+        }
+        if item.OrderItem.order_id not in items_map:
+            items_map[item.OrderItem.order_id] = []
+        items_map[item.OrderItem.order_id].append(item_data)
+    return items_map
+
+def to_order_with_items(row, items: List[dict]) -> OrderWithItemsRead:
+    """Build the response model for an order row (see order_columns) and its items."""
+    order_dict = row._asdict()
+    order_dict['created_at'] = fast_json.ist(order_dict['created_at'])
+    order_dict['updated_at'] = fast_json.ist(order_dict['updated_at'])
+
+    order_read = OrderWithItemsRead.model_validate(order_dict)
+    order_read.items = [OrderItemRead.model_validate(item) for item in items]
+    return order_read
+
+def to_order_dicts(results, items_map: dict) -> List[dict]:
+    """A page of order rows as plain dicts for fast_json: to_order_with_items' fields, no validation."""
+    if not results:
+        return []
+    fields = results[0]._fields
+    orders = []
+    for row in results:
+        order_dict = dict(zip(fields, row))
+        order_dict['created_at'] = fast_json.ist(order_dict['created_at'])
+        order_dict['updated_at'] = fast_json.ist(order_dict['updated_at'])
+        order_dict['items'] = items_map.get(order_dict['id'], [])
+        orders.append(order_dict)
+    return orders
+
+def get_order_with_details(db: Session, order_id: int):
     # Aliases for users (since admin and driver both reference users table)
     AdminUser = aliased(User)
     DriverUser = aliased(User)
 
-    # Fetch full order with joins
+    # --- Fetch the main order details ---
     query = (
-        db.query(
-            Order.id,
-            Order.company_id,
-            Company.name.label("company_name"),
-            Company.address.label("company_address"),
-            Order.status_id,
-            OrderStatus.name.label("status_name"),
-            Order.admin_id,
-            AdminUser.name.label("admin_name"),
-            Order.driver_id,
-            DriverUser.name.label("driver_name"),
-            Order.area,
-            Order.mobile_no,
-            Order.notes,
-            Order.created_at,
-            Order.updated_at,
-        )
+        db.query(*order_columns(AdminUser, DriverUser))
         .join(Company, Company.id == Order.company_id)
         .join(OrderStatus, OrderStatus.id == Order.status_id)
         .join(AdminUser, AdminUser.id == Order.admin_id)
-        .outerjoin(DriverUser, DriverUser.id == Order.driver_id)  # driver optional
-        .filter(Order.id == order.id)
+        .outerjoin(DriverUser, DriverUser.id == Order.driver_id)
+        .filter(Order.id == order_id, Order.is_deleted == False)
     )
 
     result = query.first()
 
-    return OrderRead(**result._asdict())
-
-def get_order_with_details(db: Session, order_id: int):
     # Validate order exists
-    if not order_exists(db, order_id):
+    if result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=Message.Error.ORDER_NOT_FOUND
         )
-    # Aliases for users (since admin and driver both reference users table)
-    AdminUser = aliased(User)
-    DriverUser = aliased(User)
 
-    # --- Fetch the main order details ---
-    query = (
-        db.query(
+    # --- Fetch the order items and attach them ---
+    items = db.execute(order_items_select([order_id])).all()
+    return to_order_with_items(result, group_order_items(items).get(order_id, []))
+
+def driver_orders_select(driver_id: int):
+    """A driver's open orders, answered from the partial index ix_orders_driver_open."""
+    return (
+        select(
             Order.id,
             Order.company_id,
             Company.name.label("company_name"),
             Company.address.label("company_address"),
             Order.status_id,
-            OrderStatus.name.label("status_name"),
-            Order.admin_id,
-            AdminUser.name.label("admin_name"),
-            Order.driver_id,
-            DriverUser.name.label("driver_name"),
             Order.area,
             Order.mobile_no,
             Order.notes,
@@ -153,46 +331,130 @@ def get_order_with_details(db: Session, order_id: int):
             Order.updated_at,
         )
         .join(Company, Company.id == Order.company_id)
-        .join(OrderStatus, OrderStatus.id == Order.status_id)
-        .join(AdminUser, AdminUser.id == Order.admin_id)
-        .outerjoin(DriverUser, DriverUser.id == Order.driver_id)
-        .filter(Order.id == order_id)
+        .where(
+            Order.driver_id == driver_id,
+            Order.is_deleted == False,
+            Order.status_id.in_(DRIVER_OPEN_STATUS_IDS),
+        )
+        .order_by(Order.created_at, Order.id)
     )
 
-    result = query.first()
-
-    # Convert to dictionary
-    order_dict = result._asdict()
+def get_driver_orders(db: Session, driver_id: int) -> List[DriverOrderRead]:
+    """
+    Open orders (pending, out for delivery, overdue) assigned to a driver,
+    oldest first, with their items.
+
+    Two indexed queries whatever the driver's history: deleted orders are
+    outside the partial index, and its status_id key narrows the scan to the
+    open statuses, so completed orders are skipped rather than read.
+    Status names come from the reference data cache.
+    """
+    rows = db.execute(driver_orders_select(driver_id)).all()
+    if not rows:
+        return []
+
+    items_map = group_order_items(db.execute(order_items_select([row.id for row in rows])).all())
+    statuses = reference_data.get_reference(db, reference_data.ORDER_STATUSES).by_id
+
+    orders = []
+    for row in rows:
+        order = DriverOrderRead.model_validate({
+            **row._asdict(),
+            "status_name": statuses.get(row.status_id, {}).get("name"),
+            "items": items_map.get(row.id, []),
+        })
+        orders.append(order)
+    return orders
+
+def encode_order_cursor(created_at: datetime, order_id: int) -> str:
+    """Encode an opaque keyset cursor pointing at (created_at, id)."""
+    raw = json.dumps([created_at.isoformat(), order_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_order_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by encode_order_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, order_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(order_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=Message.Error.INVALID_CURSOR
+        )
 
-    # Timezone conversion
-    ist = pytz.timezone('Asia/Kolkata')
-    order_dict['created_at'] = order_dict['created_at'].astimezone(ist)
-    order_dict['updated_at'] = order_dict['updated_at'].astimezone(ist)
+def _keyset_predicate(db: Session, cursor: str, descending: bool):
+    """Rows strictly after the cursor in (created_at, id) order."""
+    created_at, order_id = decode_order_cursor(cursor)
+    key = tuple_(Order.created_at, Order.id)
+    value = tuple_(created_at, order_id)
+    if db.get_bind().dialect.name == "sqlite":
+        # SQLite stores CURRENT_TIMESTAMP as text without fractional seconds,
+        # so compare normalised text on both sides.
+        key = tuple_(func.datetime(Order.created_at), Order.id)
+        value = tuple_(func.datetime(created_at), order_id)
+    return key < value if descending else key > value
+
+def order_listing_filters(search_query, status_id=None, start_date=None, end_date=None) -> list:
+    """WHERE clauses of the order listing; the first is always the active-orders filter."""
+    filters = [Order.is_deleted == False]
 
-    # Convert the main order row to a Pydantic object
-    order_read = OrderWithItemsRead.model_validate(order_dict)
+    # Search functionality
+    if search_query is not None:
+        filters.append(search_query.filter)
 
-    # --- New Query to Fetch Order Items ---
-    items = db.query(OrderItem, Gas.name, Gas.unit).join(
-        Gas, OrderItem.gas_id == Gas.id
-    ).filter(OrderItem.order_id == order_id).all()
-    
-    items_result = [{
-        "id": item.OrderItem.id,
-        "order_id": item.OrderItem.order_id,
-        "gas_id": item.OrderItem.gas_id,
-        "quantity": item.OrderItem.quantity,
-        "gas_name": item.name,
-        "gas_unit": item.unit
-    } for item in items]
+    # Add optional filtering by status_id
+    if status_id is not None:
+        filters.append(Order.status_id == status_id)
 
-    # Convert each OrderItem row to an OrderItemRead Pydantic model
-    order_items_list = [OrderItemRead.model_validate(item) for item in items_result]
+    # Add optional filtering by date range
+    if start_date:
+        filters.append(Order.created_at >= start_date)
+    if end_date:
+        filters.append(Order.created_at <= end_date)
+    return filters
+
+def filtered_order_ids_select(filters: list):
+    """Narrow SELECT of order ids for recordsFiltered; search filters reach other tables through subqueries."""
+    return select(Order.id).where(*filters)
+
+def order_page_select(db, AdminUser, DriverUser, filters: list, search_query,
+                      sort_order: str, cursor: Optional[str], start: int, length: int):
+    """
+    SELECT for one page of the order listing. In cursor mode it fetches one
+    extra row so split_order_page can tell whether another page follows.
+    """
+    query = (
+        select(*order_columns(AdminUser, DriverUser))
+        .join(Company, Company.id == Order.company_id)
+        .join(OrderStatus, OrderStatus.id == Order.status_id)
+        .join(AdminUser, AdminUser.id == Order.admin_id)
+        .outerjoin(DriverUser, DriverUser.id == Order.driver_id)
+        .where(*filters)
+    )
 
-    # Attach the list of items to the main order object
-    order_read.items = order_items_list
+    # Dynamic sorting, with id as a tie-breaker so pages are stable
+    descending = sort_order.lower() != "asc"
+    if sort_order.lower() == "relevance" and search_query is not None and cursor is None:
+        query = query.order_by(search_query.rank.desc(), Order.created_at.desc(), Order.id.desc())
+    elif descending:
+        query = query.order_by(Order.created_at.desc(), Order.id.desc())
+    else:
+        query = query.order_by(Order.created_at.asc(), Order.id.asc())
 
-    return order_read
+    # Pagination
+    if cursor is not None:
+        if cursor:
+            query = query.where(_keyset_predicate(db, cursor, descending))
+        return query.limit(length + 1)
+    return query.offset(start).limit(length)
+
+def split_order_page(results: list, length: int, cursor: Optional[str]) -> tuple[list, Optional[str]]:
+    """Trim the look-ahead row of a cursor page and return (rows, next_cursor)."""
+    if cursor is not None and len(results) > length:
+        results = results[:length]
+        return results, encode_order_cursor(results[-1].created_at, results[-1].id)
+    return results, None
 
 def list_orders(
     db: Session,
@@ -202,186 +464,244 @@ def list_orders(
     status_id: Optional[int] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    sort_order: str = "desc"
+    sort_order: str = "desc",
+    cursor: Optional[str] = None,
+    as_dicts: bool = False
 ):
+    """
+    List orders for DataTables.
+
+    Paging is offset-based by default. When `cursor` is given (an empty string
+    requests the first page) the page is located with a keyset predicate on
+    (created_at, id) instead, `start` is ignored and the result carries a
+    `next_cursor` for the following page (None on the last page).
+
+    `as_dicts` returns the orders as plain dicts for app/core/fast_json.py
+    instead of OrderWithItemsRead models.
+    """
     # Aliases for users
     AdminUser = aliased(User)
     DriverUser = aliased(User)
 
-    # Base query
-    query = (
-        db.query(
-            Order.id,
-            Order.company_id,
-            Company.name.label("company_name"),
-            Company.address.label("company_address"),
-            Order.status_id,
-            OrderStatus.name.label("status_name"),
-            Order.admin_id,
-            AdminUser.name.label("admin_name"),
-            Order.driver_id,
-            DriverUser.name.label("driver_name"),
-            Order.area,
-            Order.mobile_no,
-            Order.notes,
-            Order.created_at,
-            Order.updated_at,
-        )
-        .join(Company, Company.id == Order.company_id)
-        .join(OrderStatus, OrderStatus.id == Order.status_id)
-        .join(AdminUser, AdminUser.id == Order.admin_id)
-        .outerjoin(DriverUser, DriverUser.id == Order.driver_id)
-        .filter(Order.is_deleted == False)
-    )
+    search_query = build_search(db, search, order_search_fields(DriverUser), scope=[Order.is_deleted == False])
+    filters = order_listing_filters(search_query, status_id, start_date, end_date)
 
-    # Search functionality
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Company.name.ilike(search_term),
-                DriverUser.name.ilike(search_term),
-                OrderStatus.name.ilike(search_term)
-            )
-        )
-        
-    # Get total records count before filtering
-    total_records = db.query(func.count(Order.id)).scalar()
-
-
-    # Add optional filtering by status_id
-    if status_id is not None:
-        query = query.filter(Order.status_id == status_id)
+    # Total active orders, served from the cached per-table counter
+    total_records = cached_total(db, record_counts.ORDERS, ACTIVE_ORDER_COUNT)
+    if search_query is not None and search_query.matches_nothing:
+        return {"recordsTotal": total_records, "recordsFiltered": 0, "data": [], "next_cursor": None}
 
-    # Add optional filtering by date range
-    if start_date:
-        query = query.filter(Order.created_at >= start_date)
-    if end_date:
-        query = query.filter(Order.created_at <= end_date)
-    
-    # Get filtered records count
-    filtered_records = query.count()
-
-    # Dynamic sorting
-    if sort_order.lower() == "asc":
-        query = query.order_by(Order.created_at.asc())
+    # Filtered count over order ids only
+    if len(filters) == 1:
+        filtered_records = total_records
     else:
-        query = query.order_by(Order.created_at.desc())
-    
-    # Pagination
-    query = query.offset(start).limit(length)
-    
-    results = query.all()
+        filtered_records = filtered_count(db, filtered_order_ids_select(filters))
+
+    page = order_page_select(db, AdminUser, DriverUser, filters, search_query, sort_order, cursor, start, length)
+    results, next_cursor = split_order_page(db.execute(page).all(), length, cursor)
     
     # Efficiently fetch items for the retrieved orders
     order_ids = [row.id for row in results]
     items_map = {}
     if order_ids:
-        items_query = (
-            db.query(OrderItem, Gas.name, Gas.unit)
-            .join(Gas, OrderItem.gas_id == Gas.id)
-            .filter(OrderItem.order_id.in_(order_ids))
-            .all()
-        )
-        for item in items_query:
-            item_data = {
-                "id": item.OrderItem.id, "order_id": item.OrderItem.order_id,
-                "gas_id": item.OrderItem.gas_id, "quantity": item.OrderItem.quantity,
-                "gas_name": item.name, "gas_unit": item.unit,
-            }
-            if item.OrderItem.order_id not in items_map:
-                items_map[item.OrderItem.order_id] = []
-            items_map[item.OrderItem.order_id].append(item_data)
+        items_map = group_order_items(db.execute(order_items_select(order_ids)).all())
             
     # Combine orders and their items
-    orders_list = []
-    ist = pytz.timezone('Asia/Kolkata') # Define IST
-    for result in results:
-        order_dict = result._asdict()
-        order_dict['created_at'] = order_dict['created_at'].astimezone(ist)
-        order_dict['updated_at'] = order_dict['updated_at'].astimezone(ist)
-
-        order_read = OrderWithItemsRead.model_validate(order_dict)
-        order_items_data = items_map.get(order_read.id, [])
-        order_read.items = [OrderItemRead.model_validate(item) for item in order_items_data]
-        orders_list.append(order_read)
+    if as_dicts:
+        orders_list = to_order_dicts(results, items_map)
+    else:
+        orders_list = [to_order_with_items(result, items_map.get(result.id, [])) for result in results]
 
     return {
         "recordsTotal": total_records,
         "recordsFiltered": filtered_records,
         "data": orders_list,
+        "next_cursor": next_cursor,
     }
 
 def update_order(db: Session, order_id: int, **kwargs):
-    if not order_exists(db, order_id):
+    validate_order_changes(kwargs)
+
+    # Locked so concurrent changes adjust the order aggregates one at a time
+    order = db.query(Order).filter(Order.id == order_id, Order.is_deleted == False).with_for_update().first()
+    if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=Message.Error.ORDER_NOT_FOUND
         )
 
-    order = db.query(Order).filter(Order.id == order_id, Order.is_deleted == False).first()
+    # Status, driver and company in one round trip
+    require(db, *order_change_requirements(kwargs))
 
-    if 'status_id' in kwargs and kwargs['status_id'] is not None:
-        if not order_status_exists(db, kwargs['status_id']):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=Message.Error.STATUS_NOT_FOUND
-            )
-    
-    if 'driver_id' in kwargs and kwargs['driver_id'] is not None:
-        if not user_exists(db, kwargs['driver_id']):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=Message.Error.USER_NOT_FOUND
-            )
-        if not is_driver(db, kwargs['driver_id']):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=Message.Error.NOT_DRIVER
-            )
+    before = aggregated_values(order)
+    for key, value in kwargs.items():
+        setattr(order, key, value)
 
-    if 'company_id' in kwargs and kwargs['company_id'] is not None:
-        if not company_exists(db, kwargs['company_id']):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=Message.Error.COMPANY_NOT_FOUND
-            )
+    if aggregated_values(order) != before:
+        after = load_order_facts(db, order)
+        record_order_change(db, replace(after, **dict(zip(AGGREGATED_FIELDS, before))), after)
 
-    if 'area' in kwargs and kwargs['area'] is not None and not kwargs['area'].strip():
+    order_events.queue_event(db, order_events.updated_event(db, order, kwargs))
+    db.commit()
+    # Expired attributes reload on first access; the endpoint re-reads the order with its details instead
+    return order
+
+def validate_order_changes(changes: dict):
+    """Input checks for an order update that need no database access."""
+    if changes.get('area') is not None and not changes['area'].strip():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Area cannot be empty"
         )
 
-    for key, value in kwargs.items():
-        setattr(order, key, value)
+def order_change_requirements(changes: dict) -> list:
+    """Rows an order update points to, for db_validation.require."""
+    requirements = []
+    if changes.get('status_id') is not None:
+        requirements.append(order_status(changes['status_id']))
+    if changes.get('driver_id') is not None:
+        requirements += [active_user(changes['driver_id']), driver_user(changes['driver_id'])]
+    if changes.get('company_id') is not None:
+        requirements.append(active_company(changes['company_id']))
+    return requirements
+
+# --- Bulk status / driver changes ---
+
+BULK_UPDATE_FIELDS = ("status_id", "driver_id")
+
+def as_utc(moment: datetime) -> datetime:
+    """Timestamps read back from SQLite are naive UTC."""
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment.astimezone(timezone.utc)
+
+def bulk_update_changes(changes: dict) -> dict:
+    """The status/driver change of a bulk update; 400 if there is none or too many orders."""
+    changes = {
+        field: value for field, value in changes.items()
+        if field in BULK_UPDATE_FIELDS and not (field == "status_id" and value is None)
+    }
+    if not changes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=Message.Error.REQUIRED_FIELD
+        )
+    return changes
+
+def apply_bulk_order_update(db: Session, versions: List[OrderVersion], changes: dict) -> dict:
+    """
+    Apply one status and/or driver change to many orders, without committing.
+
+    Optimistic locking: an order whose updated_at differs from the one the
+    client sent has changed since it was read and is reported as stale
+    instead of overwritten. Inequality, not "later than": Postgres stamps
+    the transaction start, so a writer that committed after the client read
+    can leave an older updated_at. The orders are read and locked in one SELECT
+    (their old values feed the version check and the aggregate deltas) and
+    changed with one UPDATE ... RETURNING whose rows are the response, so
+    the statement count does not grow with the number of orders.
+    """
+    changes = bulk_update_changes(changes)
+    if len(versions) > settings.ORDER_BULK_UPDATE_MAX_ORDERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=Message.Error.BULK_UPDATE_TOO_LARGE
+        )
+    require(db, *order_change_requirements(changes))
+
+    seen = {version.id: version.updated_at for version in versions}
+    # Locked in id order so concurrent bulk updates cannot deadlock
+    current = {
+        row.id: row for row in db.execute(
+            select(Order.id, Order.status_id, Order.company_id, Order.area, Order.created_at, Order.updated_at)
+            .where(Order.id.in_(seen), Order.is_deleted == False)
+            .order_by(Order.id)
+            .with_for_update()
+        ).all()
+    }
+    stale = {
+        order_id for order_id, row in current.items()
+        if seen[order_id] is not None and as_utc(row.updated_at) != as_utc(seen[order_id])
+    }
+    fresh = [order_id for order_id in current if order_id not in stale]
+
+    rows = []
+    if fresh:
+        DriverUser = aliased(User)
+        rows = db.execute(
+            update(Order)
+            .where(Order.id.in_(fresh), Order.is_deleted == False)
+            .values(**changes)
+            .returning(
+                Order.id, Order.status_id, Order.driver_id, Order.updated_at,
+                select(DriverUser.name).where(DriverUser.id == Order.driver_id).scalar_subquery().label("driver_name"),
+            )
+            .execution_options(synchronize_session=False)
+        ).all()
+
+    moved = [row for row in rows if row.status_id != current[row.id].status_id]
+    if moved:
+        totals = totals_by_order(db.execute(orders_item_totals_select([row.id for row in moved])).all())
+        change = OrderChange()
+        for row in moved:
+            before = order_facts(current[row.id], totals.get(row.id, {}))
+            change.record(before, replace(before, status_id=row.status_id))
+        change.apply(db)
+
+    statuses = reference_data.get_reference(db, reference_data.ORDER_STATUSES).by_id
+    for row in rows:
+        order_events.queue_event(db, order_events.updated_event(db, row, changes))
 
-    db.commit()
-    db.refresh(order)
-    return order
+    return {
+        "updated": [
+            OrderBulkUpdateRow(
+                id=row.id, status_id=row.status_id, status_name=statuses.get(row.status_id, {}).get("name"),
+                driver_id=row.driver_id, driver_name=row.driver_name, updated_at=row.updated_at,
+            )
+            for row in rows
+        ],
+        "stale": sorted(stale),
+        "not_found": sorted(set(seen) - set(current)),
+    }
+
+def bulk_update_orders(db: Session, versions: List[OrderVersion], changes: dict) -> dict:
+    try:
+        report = apply_bulk_order_update(db, versions, changes)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return report
 
 def soft_delete_order(db: Session, order_id: int):
-    order = db.query(Order).filter(Order.id == order_id, Order.is_deleted == False).first()
+    order = db.query(Order).filter(Order.id == order_id, Order.is_deleted == False).with_for_update().first()
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=Message.Error.ORDER_NOT_FOUND
         )
 
+    record_order_change(db, load_order_facts(db, order), None)
     order.is_deleted = True
+    order_events.queue_event(db, order_events.deleted_event(order_id))
     db.commit()
+    record_counts.adjust_total(record_counts.ORDERS, -1)
     return order
 
 def hard_delete_order(db: Session, order_id: int):
-    order = db.query(Order).filter(Order.id == order_id).first()
+    order = db.query(Order).filter(Order.id == order_id).with_for_update().first()
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=Message.Error.ORDER_NOT_FOUND
         )
 
+    was_active = not order.is_deleted
+    if was_active:
+        record_order_change(db, load_order_facts(db, order), None)
+        order_events.queue_event(db, order_events.deleted_event(order_id))
     db.delete(order)
     db.commit()
+    if was_active:
+        record_counts.adjust_total(record_counts.ORDERS, -1)
 
 def get_order_items(db: Session, order_id: int):
     if not order_exists(db, order_id):
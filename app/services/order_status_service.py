@@ -1,5 +1,8 @@
 from sqlalchemy.orm import Session
-from app.models.order_status import OrderStatus
+from app.utils import reference_data
 
 def get_all_statuses(db: Session):
-    return db.query(OrderStatus).all()
+    return list(reference_data.get_reference(db, reference_data.ORDER_STATUSES).rows)
+
+def refresh_statuses():
+    reference_data.invalidate(reference_data.ORDER_STATUSES)
@@ -1,5 +1,8 @@
 from sqlalchemy.orm import Session
-from app.models.role import Role
+from app.utils import reference_data
 
 def get_all_roles(db: Session):
-    return db.query(Role).all()
+    return list(reference_data.get_reference(db, reference_data.ROLES).rows)
+
+def refresh_roles():
+    reference_data.invalidate(reference_data.ROLES)
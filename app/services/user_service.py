@@ -1,16 +1,27 @@
 
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, func
 from app.models.users import User
 from app.dto.user_dto import UserCreate, UserUpdate
 from app.core.security import get_password_hash
+from app.dependencies import invalidate_principal
+from app.utils import record_counts
+from app.utils.record_counts import cached_total, filtered_count
+from app.utils.search import build_search, SearchField
 
 def get_all_users(db: Session, skip: int = 0, limit: int = 100, search: str = None, sort_by: str = None, sort_dir: str = "asc"):
     query = db.query(User).options(joinedload(User.company), joinedload(User.role))
 
-    if search:
-        query = query.filter(User.name.contains(search) | User.email.contains(search))
+    total_records = cached_total(db, record_counts.USERS, select(func.count(User.id)))
+    filtered_records = total_records
 
-    total_records = query.count()
+    user_search = build_search(db, search, [
+        SearchField(User.name, User.id, "users_fts"),
+        SearchField(User.email, User.id, "users_fts"),
+    ])
+    if user_search is not None:
+        query = query.filter(user_search.filter)
+        filtered_records = filtered_count(db, select(User.id).where(user_search.filter))
 
     if sort_by and hasattr(User, sort_by):
         column = getattr(User, sort_by)
@@ -18,9 +29,11 @@ def get_all_users(db: Session, skip: int = 0, limit: int = 100, search: str = No
             query = query.order_by(column.asc())
         else:
             query = query.order_by(column.desc())
+    elif user_search is not None:
+        query = query.order_by(user_search.rank.desc(), User.id)
 
     users = query.offset(skip).limit(limit).all()
-    return users, total_records
+    return users, total_records, filtered_records
 
 def get_user(db: Session, user_id: int):
     return db.query(User).options(joinedload(User.company), joinedload(User.role)).filter(User.id == user_id).first()
@@ -39,22 +52,27 @@ def create_user(db: Session, user: UserCreate):
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    record_counts.invalidate_total(record_counts.USERS)
     return db_user
 
 def update_user(db: Session, user_id: int, user: UserUpdate):
+    update_data = user.model_dump(exclude_unset=True)
+    # Hashed before the user is loaded, so no connection is held while bcrypt runs
+    hashed_password = None
+    if "password" in update_data and update_data["password"]:
+        hashed_password = get_password_hash(update_data.pop("password"))
+
     db_user = get_user(db, user_id)
     if db_user:
-        update_data = user.model_dump(exclude_unset=True)
-        if "password" in update_data and update_data["password"]:
-            hashed_password = get_password_hash(update_data["password"])
+        if hashed_password is not None:
             db_user.password_hash = hashed_password
-            del update_data["password"]
         
         for key, value in update_data.items():
             setattr(db_user, key, value)
         
         db.commit()
         db.refresh(db_user)
+        invalidate_principal(user_id)
     return db_user
 
 def delete_user(db: Session, user_id: int):
@@ -62,6 +80,8 @@ def delete_user(db: Session, user_id: int):
     if db_user:
         db.delete(db_user)
         db.commit()
+        record_counts.invalidate_total(record_counts.USERS)
+        invalidate_principal(user_id)
     return db_user
 
 def get_all_drivers(db: Session):
@@ -0,0 +1,193 @@
+"""
+Dashboard Stats
+---------------
+The admin dashboard reads its totals from the `dashboard_stats` table instead
+of aggregating orders on every load. Rows are keyed by (kind, ref_id):
+
+- ("order_status", status_id): active (not deleted) orders in each status
+- ("pending_gas", gas_id): quantity of each gas on active pending orders
+
+Services record every change to an active order through
+app/utils/order_aggregates.py, which adds the resulting deltas here before
+committing, so the totals commit or roll back together with the change.
+`rebuild` recomputes the table from orders and order_items;
+scripts/reconcile_dashboard_stats.py runs it to repair drift from writes
+made outside the services (manual SQL, restores).
+
+The assembled insights are also cached in memory for
+DASHBOARD_CACHE_TTL_SECONDS, together with their ETag. A commit that applied
+deltas (or a rebuild) drops the cached copy in this process; other instances
+pick the change up when the TTL expires.
+"""
+
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+from sqlalchemy import and_, delete, event, func, insert, literal, select, text
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.upsert import add_to_counters
+from app.models.dashboard_stat import DashboardStat
+from app.models.gas import Gas
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.utils.http_cache import make_etag
+
+ORDER_STATUS = "order_status"
+PENDING_GAS = "pending_gas"
+
+# --- Status IDs ---
+PENDING_STATUS_ID = 1
+OUT_FOR_DELIVERY_STATUS_ID = 2
+COMPLETED_STATUS_ID = 3
+
+# Session.info flag: this transaction changed the totals
+_CHANGED = "dashboard_stats_changed"
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    insights: dict
+    etag: str
+
+
+_snapshots = TTLCache("dashboard_insights", settings.DASHBOARD_CACHE_TTL_SECONDS, max_entries=1)
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def count_order(deltas: Counter, status_id: int, quantities: Mapping[int, int], sign: int = 1):
+    """Add (sign=1) or remove (sign=-1) one active order and its per-gas quantities."""
+    deltas[(ORDER_STATUS, status_id)] += sign
+    if status_id == PENDING_STATUS_ID:
+        for gas_id, quantity in quantities.items():
+            deltas[(PENDING_GAS, gas_id)] += sign * quantity
+
+
+def apply_deltas(db: Session, deltas: Mapping[tuple, int]):
+    """Add `deltas` to the stored totals inside the caller's transaction."""
+    rows = [
+        {"kind": kind, "ref_id": ref_id, "value": value}
+        for (kind, ref_id), value in sorted(deltas.items())
+        if value
+    ]
+    if rows:
+        add_to_counters(db, DashboardStat, ["value"], rows)
+        db.info[_CHANGED] = True
+
+
+def dashboard_stats_select():
+    """Every stored total, with gas names for the pending_gas rows."""
+    return (
+        select(DashboardStat.kind, DashboardStat.ref_id, DashboardStat.value, Gas.name)
+        .outerjoin(Gas, and_(DashboardStat.kind == PENDING_GAS, Gas.id == DashboardStat.ref_id))
+    )
+
+
+def insights_from_rows(rows) -> dict:
+    status_counts = {}
+    gas_requirements = {}
+    for kind, ref_id, value, gas_name in rows:
+        if kind == ORDER_STATUS:
+            status_counts[ref_id] = value
+        elif kind == PENDING_GAS and value and gas_name is not None:
+            gas_requirements[gas_name] = value
+
+    return {
+        "total_pending_orders": status_counts.get(PENDING_STATUS_ID, 0),
+        "gas_requirements": gas_requirements,
+        "total_completed_orders": status_counts.get(COMPLETED_STATUS_ID, 0),
+        "total_out_for_delivery_orders": status_counts.get(OUT_FOR_DELIVERY_STATUS_ID, 0),
+    }
+
+
+def _status_counts_select():
+    return (
+        select(literal(ORDER_STATUS), Order.status_id, func.count(Order.id))
+        .where(Order.is_deleted == False)
+        .group_by(Order.status_id)
+    )
+
+
+def _pending_gas_select():
+    return (
+        select(literal(PENDING_GAS), OrderItem.gas_id, func.sum(OrderItem.quantity))
+        .join(Order, OrderItem.order_id == Order.id)
+        .where(Order.status_id == PENDING_STATUS_ID, Order.is_deleted == False)
+        .group_by(OrderItem.gas_id)
+    )
+
+
+def stored_totals(db: Session) -> dict:
+    return {(kind, ref_id): value for kind, ref_id, value in db.execute(
+        select(DashboardStat.kind, DashboardStat.ref_id, DashboardStat.value)
+    ).all()}
+
+
+def computed_totals(db: Session) -> dict:
+    """The totals recomputed from orders and order_items, without writing them."""
+    totals = {}
+    for stmt in (_status_counts_select(), _pending_gas_select()):
+        totals.update({(kind, ref_id): value for kind, ref_id, value in db.execute(stmt).all()})
+    return totals
+
+
+def rebuild(db: Session):
+    """
+    Recompute every total from orders and order_items and commit.
+
+    On Postgres the table is locked first: writers that already applied deltas
+    finish before the recount, and later ones wait for it and apply theirs on
+    top, so no change is counted twice or lost.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE dashboard_stats IN EXCLUSIVE MODE"))
+
+    db.execute(delete(DashboardStat))
+    for stmt in (_status_counts_select(), _pending_gas_select()):
+        db.execute(insert(DashboardStat).from_select(["kind", "ref_id", "value"], stmt))
+    db.info[_CHANGED] = True
+    db.commit()
+
+
+def invalidate_snapshot():
+    global _generation
+    with _generation_lock:
+        _generation += 1
+        _snapshots.invalidate()
+
+
+def cached_snapshot() -> Optional[DashboardSnapshot]:
+    return _snapshots.get("insights")
+
+
+def snapshot_generation() -> int:
+    """Read before loading insights and pass to `remember_snapshot`."""
+    return _generation
+
+
+def remember_snapshot(insights: dict, generation: int) -> DashboardSnapshot:
+    """
+    Wrap freshly loaded insights with their ETag and cache them, unless a
+    commit invalidated the cache while they were being loaded.
+    """
+    snapshot = DashboardSnapshot(insights, make_etag(insights))
+    with _generation_lock:
+        if generation == _generation:
+            _snapshots.set("insights", snapshot)
+    return snapshot
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session):
+    if session.info.pop(_CHANGED, False):
+        invalidate_snapshot()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_change(session: Session):
+    session.info.pop(_CHANGED, None)
@@ -1,111 +1,203 @@
 """
 Database Validation Utility
 ---------------------------
-Provides quick existence checks for database entities before CRUD operations.
-Returns boolean values for efficient validation in service layers.
+Provides existence checks for database entities before CRUD operations.
+
+Write paths describe what must hold as `Requirement`s (order X active, user Y
+a driver, gases [..] active, status Z exists) and resolve them together:
+`check` answers all of them with a single SELECT of EXISTS / IN tests, one
+round trip however many there are, and returns a `Failure` for each one that
+does not hold; `require` raises the HTTPException of the first failure, in
+the order the requirements were given.
+
+The boolean helpers below are single-requirement checks kept for existing
+callers; none of them loads a row.
 """
 
+from dataclasses import dataclass
+from typing import Any, Iterable, List
+
+from fastapi import HTTPException, status
+from sqlalchemy import exists, func, select
 from sqlalchemy.orm import Session
 from app.models.users import User
 from app.models.company import Company
 from app.models.order import Order
 from app.models.gas import Gas
 from app.models.order_status import OrderStatus
-from app.models.role import Role
+from app.models.role import Role as RoleModel
 from app.core.role import Role
+from app.messages.messages import Message
+from app.utils import reference_data
+
+
+@dataclass(frozen=True)
+class Requirement:
+    name: str
+    value: Any
+    test: Any            # boolean SQL expression that is true when the requirement holds
+    status_code: int
+    detail: str
+
+
+@dataclass(frozen=True)
+class Failure:
+    name: str
+    value: Any
+    status_code: int
+    detail: str
+
+    def to_http(self) -> HTTPException:
+        return HTTPException(status_code=self.status_code, detail=self.detail)
+
+
+# --- Requirements ---
+
+def active_order(order_id: int) -> Requirement:
+    return Requirement(
+        "order", order_id,
+        exists().where(Order.id == order_id, Order.is_deleted == False),
+        status.HTTP_404_NOT_FOUND, Message.Error.ORDER_NOT_FOUND,
+    )
+
+def active_user(user_id: int) -> Requirement:
+    return Requirement(
+        "user", user_id,
+        exists().where(User.id == user_id, User.is_deleted == False),
+        status.HTTP_404_NOT_FOUND, Message.Error.USER_NOT_FOUND,
+    )
+
+def user_with_role(user_id: int, role_id: int, detail: str, status_code: int = status.HTTP_400_BAD_REQUEST) -> Requirement:
+    """Holds for an active user with `role_id`; pair it with active_user to tell "missing" from "wrong role"."""
+    return Requirement(
+        "user_role", user_id,
+        exists().where(User.id == user_id, User.is_deleted == False, User.role_id == role_id),
+        status_code, detail,
+    )
+
+def driver_user(user_id: int) -> Requirement:
+    return user_with_role(user_id, Role.DRIVER, Message.Error.NOT_DRIVER)
+
+def admin_user(user_id: int) -> Requirement:
+    return user_with_role(user_id, Role.ADMIN, Message.Error.NOT_ADMIN, status.HTTP_403_FORBIDDEN)
+
+def active_company(company_id: int) -> Requirement:
+    return Requirement(
+        "company", company_id,
+        exists().where(Company.id == company_id, Company.is_deleted == False),
+        status.HTTP_404_NOT_FOUND, Message.Error.COMPANY_NOT_FOUND,
+    )
+
+def active_gases(gas_ids: Iterable[int]) -> Requirement:
+    """Holds when every id in `gas_ids` is an active gas."""
+    gas_ids = frozenset(gas_ids)
+    found = select(func.count(Gas.id)).where(Gas.id.in_(gas_ids), Gas.is_deleted == False).scalar_subquery()
+    return Requirement(
+        "gases", sorted(gas_ids), found == len(gas_ids),
+        status.HTTP_404_NOT_FOUND, Message.Error.GAS_NOT_FOUND,
+    )
+
+def order_status(status_id: int) -> Requirement:
+    return Requirement(
+        "status", status_id,
+        exists().where(OrderStatus.id == status_id),
+        status.HTTP_404_NOT_FOUND, Message.Error.STATUS_NOT_FOUND,
+    )
+
+def existing_role(role_id: int) -> Requirement:
+    return Requirement(
+        "role", role_id,
+        exists().where(RoleModel.id == role_id),
+        status.HTTP_404_NOT_FOUND, Message.Error.ROLE_NOT_FOUND,
+    )
+
+
+# --- Resolution ---
+
+def requirements_select(requirements: List[Requirement]):
+    return select(*[requirement.test.label(f"r{index}") for index, requirement in enumerate(requirements)])
+
+def check(db: Session, *requirements: Requirement) -> List[Failure]:
+    """Every failed requirement, in the given order; one query for all of them (none if empty)."""
+    if not requirements:
+        return []
+    results = db.execute(requirements_select(list(requirements))).one()
+    return [
+        Failure(requirement.name, requirement.value, requirement.status_code, requirement.detail)
+        for requirement, passed in zip(requirements, results)
+        if not passed
+    ]
+
+def require(db: Session, *requirements: Requirement) -> None:
+    """Raise the HTTPException of the first failed requirement."""
+    failures = check(db, *requirements)
+    if failures:
+        raise failures[0].to_http()
+
+def holds(db: Session, requirement: Requirement) -> bool:
+    return not check(db, requirement)
+
+
+# --- Single checks ---
 
 def order_exists(db: Session, order_id: int) -> bool:
     """Check if order exists and is not deleted"""
-    return db.query(Order).filter(
-        Order.id == order_id, 
-        Order.is_deleted == False
-    ).first() is not None
+    return holds(db, active_order(order_id))
 
 def user_exists(db: Session, user_id: int) -> bool:
     """Check if user exists and is not deleted"""
-    return db.query(User).filter(
-        User.id == user_id, 
-        User.is_deleted == False
-    ).first() is not None
+    return holds(db, active_user(user_id))
 
 def role_exsist(db:Session, role_id:int) -> bool:
     """Check if role exsist or not"""
-    if role_id>=1 and role_id<=4:
-        return True
-    else:
-        return False
-    
+    return role_id in reference_data.get_reference(db, reference_data.ROLES).by_id
+
 def company_exists(db: Session, company_id: int) -> bool:
-    """Check if company exists and is not deleted"""
-    return db.query(Company).filter(
-        Company.id == company_id, 
-        Company.is_deleted == False
-    ).first() is not None
+    """Check if company exists and is not deleted (served from the reference cache)"""
+    return company_id in reference_data.get_reference(db, reference_data.COMPANIES).by_id
 
 def gas_exists(db: Session, gas_id: int) -> bool:
-    """Check if gas exists and is not deleted"""
-    return db.query(Gas).filter(
-        Gas.id == gas_id, 
-        Gas.is_deleted == False
-    ).first() is not None
+    """Check if gas exists and is not deleted (served from the reference cache)"""
+    return gas_id in reference_data.get_reference(db, reference_data.GASES).by_id
 
 def order_status_exists(db: Session, status_id: int) -> bool:
-    """Check if order status exists"""
-    return db.query(OrderStatus).filter(
-        OrderStatus.id == status_id
-    ).first() is not None
+    """Check if order status exists (served from the reference cache)"""
+    return status_id in reference_data.get_reference(db, reference_data.ORDER_STATUSES).by_id
 
 def is_admin(db: Session, user_id: int) -> bool:
     """Check if user has admin role"""
-    user = db.query(User).filter(
-        User.id == user_id, 
-        User.is_deleted == False
-    ).first()
-    return user and user.role_id == Role.ADMIN
+    return holds(db, admin_user(user_id))
 
 def is_driver(db: Session, user_id: int) -> bool:
     """Check if user has driver role"""
-    user = db.query(User).filter(
-        User.id == user_id, 
-        User.is_deleted == False
-    ).first()
-    return user and user.role_id == Role.DRIVER
+    return holds(db, driver_user(user_id))
 
 def is_customer(db: Session, user_id: int) -> bool:
     """Check if user has customer role"""
-    user = db.query(User).filter(
-        User.id == user_id, 
-        User.is_deleted == False
-    ).first()
-    return user and user.role_id == Role.CUSTOMER
+    return holds(db, user_with_role(user_id, Role.CUSTOMER, Message.Error.UNAUTHORIZED))
 
 def is_dispatcher(db: Session, user_id: int) -> bool:
     """Check if user has dispatcher role"""
-    user = db.query(User).filter(
-        User.id == user_id, 
-        User.is_deleted == False
-    ).first()
-    return user and user.role_id == Role.DISPATCHER
+    return holds(db, user_with_role(user_id, Role.DISPATCHER, Message.Error.UNAUTHORIZED))
 
 def user_belongs_to_company(db: Session, user_id: int, company_id: int) -> bool:
     """Check if user belongs to specific company"""
-    user = db.query(User).filter(
+    return db.query(exists().where(
         User.id == user_id,
         User.company_id == company_id,
         User.is_deleted == False
-    ).first()
-    return user is not None
+    )).scalar()
 
 def gas_name_exists(db: Session, gas_name: str) -> bool:
     """Check if gas name exists (case-insensitive)"""
-    return db.query(Gas).filter(
+    return db.query(exists().where(
         Gas.name.ilike(gas_name.strip()),
         Gas.is_deleted == False
-    ).first() is not None
+    )).scalar()
 
 def company_name_exists(db: Session, company_name: str) -> bool:
     """Check if company name exists (case-insensitive)"""
-    return db.query(Company).filter(
+    return db.query(exists().where(
         Company.name.ilike(company_name.strip()),
         Company.is_deleted == False
-    ).first() is not None
\ No newline at end of file
+    )).scalar()
@@ -0,0 +1,39 @@
+"""
+HTTP Cache Utility
+------------------
+ETag helpers for GET endpoints whose clients revalidate often. The ETag is a
+hash of the response data, so an unchanged result answers a revalidation
+with 304 and no body.
+"""
+
+import hashlib
+import json
+
+from fastapi import Request, Response, status
+
+# Let the browser store the response but revalidate it on every use
+REVALIDATE = "private, no-cache"
+
+
+def make_etag(data) -> str:
+    payload = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha1(payload.encode()).hexdigest()[:20] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match already names `etag` (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": REVALIDATE}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
@@ -0,0 +1,124 @@
+"""
+Order Aggregates
+----------------
+Orders feed two pre-aggregated tables: dashboard_stats (current totals) and
+order_rollup (daily history). Services describe an active order by its
+`OrderFacts` (what the aggregates count) and record each change as the
+facts before and after it; `OrderChange.apply` adds the difference to both
+tables inside the caller's transaction.
+
+- create: before None, after the new order
+- status / company / area change: before and after differ in that field
+- soft or hard delete: before the order, after None
+- item change: the same order with no items before and only the changed
+  gas (quantity and item-count deltas) after
+"""
+
+from collections import Counter
+from dataclasses import dataclass, replace
+from datetime import date
+from typing import Iterable, Mapping, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.order_item import OrderItem
+from app.utils import dashboard_stats, order_rollup
+
+
+@dataclass(frozen=True)
+class OrderFacts:
+    status_id: int
+    company_id: int
+    area: str
+    day: date
+    quantities: Mapping[int, Tuple[int, int]]  # gas_id -> (quantity, item rows)
+
+
+def order_facts(order, quantities: Mapping[int, Tuple[int, int]]) -> OrderFacts:
+    """Facts of an Order (or a row with the same columns) carrying `quantities`."""
+    return OrderFacts(
+        status_id=order.status_id,
+        company_id=order.company_id,
+        area=order.area,
+        day=order_rollup.rollup_day(order.created_at),
+        quantities=quantities,
+    )
+
+
+def item_totals(items: Iterable) -> dict:
+    """Per-gas (quantity, item rows) of OrderItemCreate-like objects or item dicts."""
+    totals = {}
+    for item in items:
+        gas_id, quantity = (item["gas_id"], item["quantity"]) if isinstance(item, Mapping) else (item.gas_id, item.quantity)
+        total_quantity, rows = totals.get(gas_id, (0, 0))
+        totals[gas_id] = (total_quantity + quantity, rows + 1)
+    return totals
+
+
+def item_totals_select(order_id: int):
+    return (
+        select(OrderItem.gas_id, func.sum(OrderItem.quantity), func.count(OrderItem.id))
+        .where(OrderItem.order_id == order_id)
+        .group_by(OrderItem.gas_id)
+    )
+
+
+def totals_from_rows(rows) -> dict:
+    return {gas_id: (quantity, count) for gas_id, quantity, count in rows}
+
+
+def orders_item_totals_select(order_ids):
+    return (
+        select(OrderItem.order_id, OrderItem.gas_id, func.sum(OrderItem.quantity), func.count(OrderItem.id))
+        .where(OrderItem.order_id.in_(order_ids))
+        .group_by(OrderItem.order_id, OrderItem.gas_id)
+    )
+
+
+def totals_by_order(rows) -> dict:
+    """order_id -> item totals, from orders_item_totals_select rows."""
+    totals = {}
+    for order_id, gas_id, quantity, count in rows:
+        totals.setdefault(order_id, {})[gas_id] = (quantity, count)
+    return totals
+
+
+def load_order_facts(db: Session, order) -> OrderFacts:
+    """Facts of a stored order, reading its item totals."""
+    return order_facts(order, totals_from_rows(db.execute(item_totals_select(order.id)).all()))
+
+
+def item_change(facts: OrderFacts, gas_id: int, quantity_delta: int, items_delta: int) -> Tuple[OrderFacts, OrderFacts]:
+    """(before, after) for an item change on an active order."""
+    return replace(facts, quantities={}), replace(facts, quantities={gas_id: (quantity_delta, items_delta)})
+
+
+class OrderChange:
+    """Deltas for any number of order changes, applied together."""
+
+    def __init__(self):
+        self.stats = Counter()
+        self.rollup_quantities = Counter()
+        self.rollup_items = Counter()
+
+    def _count(self, facts: OrderFacts, sign: int):
+        pending = {gas_id: quantity for gas_id, (quantity, _) in facts.quantities.items()}
+        dashboard_stats.count_order(self.stats, facts.status_id, pending, sign)
+        order_rollup.count_order(self.rollup_quantities, self.rollup_items, facts, sign)
+
+    def record(self, before: Optional[OrderFacts], after: Optional[OrderFacts]) -> "OrderChange":
+        """Record one change; None stands for "not an active order"."""
+        if before is not None:
+            self._count(before, -1)
+        if after is not None:
+            self._count(after, 1)
+        return self
+
+    def apply(self, db: Session):
+        dashboard_stats.apply_deltas(db, self.stats)
+        order_rollup.apply_deltas(db, self.rollup_quantities, self.rollup_items)
+
+
+def record_order_change(db: Session, before: Optional[OrderFacts], after: Optional[OrderFacts]):
+    OrderChange().record(before, after).apply(db)
@@ -0,0 +1,169 @@
+"""
+Order Events
+------------
+Live order changes for GET /api/orders/stream, so the orders page and the
+admin dashboard can patch what they show instead of reloading it.
+
+Services build an event for each change (`created_event`, `updated_event`,
+`deleted_event`, `imported_event`) and `queue_event` it on their session;
+nothing is sent unless the transaction commits. ORDER_EVENTS_TRANSPORT picks
+how committed events reach the streams:
+
+- "local": published to this process's broker after commit. Enough for a
+  single instance.
+- "postgres": NOTIFY on the order_events channel inside the transaction;
+  every instance relays the notifications to its own streams (see
+  app/core/event_stream.py). "auto" uses it when the database is Postgres.
+
+Event payloads (the SSE event name is the "type"):
+
+- order.created: {"order_id", "order": OrderRead fields plus "items"}
+- order.updated: {"order_id", "changes": changed fields, with names for ids}
+- order.deleted: {"order_id"}
+- orders.imported: {"count"}; clients reload their list
+- resync: events may have been missed; clients reload their list
+"""
+
+import json
+from typing import Iterable, List, Optional
+
+from sqlalchemy import event, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.event_stream import Broker, PostgresRelay, Subscription
+from app.dto.order_dto import OrderRead
+from app.models.users import User
+from app.utils import reference_data
+
+CHANNEL = "order_events"
+
+LOCAL = "local"
+POSTGRES = "postgres"
+
+# Postgres caps NOTIFY payloads at 8000 bytes
+MAX_NOTIFY_BYTES = 7900
+
+# Session.info key: events waiting for this transaction to commit
+_PENDING = "order_events"
+
+broker = Broker("orders", settings.ORDER_STREAM_MAX_CLIENTS, settings.ORDER_STREAM_QUEUE_SIZE)
+
+
+def transport() -> str:
+    if settings.ORDER_EVENTS_TRANSPORT == "auto":
+        return POSTGRES if make_url(settings.NEON_CONNECTION_STRING).get_backend_name() == "postgresql" else LOCAL
+    return settings.ORDER_EVENTS_TRANSPORT
+
+
+def _connect_listener():
+    """A direct (never pooled) psycopg2 connection for LISTEN."""
+    import psycopg2
+
+    url = make_url(settings.NEON_CONNECTION_STRING)
+    return psycopg2.connect(
+        **url.translate_connect_args(username="user", database="dbname"),
+        **url.query,
+        connect_timeout=settings.DB_CONNECT_TIMEOUT_SECONDS,
+        keepalives=1,
+        keepalives_idle=settings.DB_KEEPALIVE_IDLE_SECONDS,
+        keepalives_interval=10,
+        keepalives_count=3,
+    )
+
+
+_relay = PostgresRelay(broker, CHANNEL, _connect_listener)
+
+
+def subscribe() -> Subscription:
+    """A new stream subscription; raises 503 when ORDER_STREAM_MAX_CLIENTS are connected."""
+    subscription = broker.subscribe(retry_after=settings.ORDER_STREAM_PING_SECONDS)
+    if transport() == POSTGRES:
+        _relay.start()
+    return subscription
+
+
+def created_event(db: Session, order: OrderRead, items: Iterable) -> dict:
+    """`items` are OrderItemCreate-like objects with gas_id and quantity."""
+    gases = reference_data.get_reference(db, reference_data.GASES).by_id
+    return {
+        "type": "order.created",
+        "order_id": order.id,
+        "order": {
+            **order.model_dump(mode="json"),
+            "items": [
+                {"gas_id": item.gas_id, "gas_name": gases.get(item.gas_id, {}).get("name"), "quantity": item.quantity}
+                for item in items
+            ],
+        },
+    }
+
+
+def updated_event(db: Session, order, changed: Iterable[str]) -> Optional[dict]:
+    """
+    The `changed` fields of an updated Order (or a row with its columns), with
+    display names for changed ids.
+    """
+    changed = [field for field in changed if hasattr(order, field)]
+    if not changed:
+        return None
+
+    changes = {field: getattr(order, field) for field in changed}
+    if "status_id" in changes:
+        statuses = reference_data.get_reference(db, reference_data.ORDER_STATUSES).by_id
+        changes["status_name"] = statuses.get(order.status_id, {}).get("name")
+    if "company_id" in changes:
+        companies = reference_data.get_reference(db, reference_data.COMPANIES).by_id
+        changes["company_name"] = companies.get(order.company_id, {}).get("name")
+    if "driver_id" in changes and hasattr(order, "driver_name"):
+        # Rows returned by a bulk UPDATE carry the name already
+        changes["driver_name"] = order.driver_name
+    elif "driver_id" in changes:
+        changes["driver_name"] = db.execute(
+            select(User.name).where(User.id == order.driver_id)
+        ).scalar() if order.driver_id is not None else None
+    return {"type": "order.updated", "order_id": order.id, "changes": changes}
+
+
+def deleted_event(order_id: int) -> dict:
+    return {"type": "order.deleted", "order_id": order_id}
+
+
+def imported_event(count: int) -> dict:
+    return {"type": "orders.imported", "count": count}
+
+
+def queue_event(db: Session, order_event: Optional[dict]):
+    """Send `order_event` to the streams if the session's transaction commits."""
+    if order_event is not None:
+        db.info.setdefault(_PENDING, []).append(order_event)
+
+
+def _notify_payload(order_event: dict) -> str:
+    payload = json.dumps(order_event, separators=(",", ":"), default=str)
+    if len(payload.encode()) > MAX_NOTIFY_BYTES:
+        # Too large to NOTIFY: send the bare event; clients fetch the order
+        payload = json.dumps({"type": order_event["type"], "order_id": order_event.get("order_id")})
+    return payload
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_before_commit(session: Session):
+    pending: List[dict] = session.info.get(_PENDING)
+    if pending and transport() == POSTGRES:
+        session.info.pop(_PENDING)
+        for order_event in pending:
+            session.execute(text("SELECT pg_notify(:channel, :payload)"),
+                            {"channel": CHANNEL, "payload": _notify_payload(order_event)})
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session):
+    for order_event in session.info.pop(_PENDING, ()):
+        broker.publish(order_event)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_events(session: Session):
+    session.info.pop(_PENDING, None)
@@ -0,0 +1,120 @@
+"""
+Order Rollup
+------------
+Pre-aggregated order history for the dashboard analytics endpoint: gas
+quantity and item count per (day, company, area, gas, status) over active
+orders, where day is the order's creation date in the business timezone.
+
+Range queries read the rollup instead of orders, so their cost depends on the
+number of days and groups requested, not on order volume.
+
+Services keep it current through app/utils/order_aggregates.py, in the same
+transaction as each order change. `rebuild` recomputes it from orders and
+order_items, for all history or from a given day onwards
+(scripts/rebuild_order_rollup.py).
+"""
+
+from collections import Counter
+from datetime import date, datetime, time, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import Date, cast, delete, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.db.upsert import add_to_counters
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.order_rollup import OrderRollup
+
+# Business timezone, as in order_service
+IST = ZoneInfo("Asia/Kolkata")
+
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+
+
+def rollup_day(created_at: datetime) -> date:
+    """The rollup day of an order. Naive timestamps (SQLite) are UTC."""
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at.astimezone(IST).date()
+
+
+def count_order(quantity_deltas: Counter, item_deltas: Counter, facts, sign: int = 1):
+    """Add (sign=1) or remove (sign=-1) an active order's items, described by OrderFacts."""
+    for gas_id, (quantity, items) in facts.quantities.items():
+        key = (facts.day, facts.company_id, facts.area, gas_id, facts.status_id)
+        quantity_deltas[key] += sign * quantity
+        item_deltas[key] += sign * items
+
+
+def apply_deltas(db: Session, quantity_deltas: Counter, item_deltas: Counter):
+    rows = []
+    for key in sorted(quantity_deltas.keys() | item_deltas.keys()):
+        if quantity_deltas[key] or item_deltas[key]:
+            day, company_id, area, gas_id, status_id = key
+            rows.append({
+                "day": day, "company_id": company_id, "area": area, "gas_id": gas_id, "status_id": status_id,
+                "quantity": quantity_deltas[key], "items": item_deltas[key],
+            })
+    add_to_counters(db, OrderRollup, ["quantity", "items"], rows)
+
+
+def local_day(dialect_name: str, created_at):
+    """SQL for the business-timezone date of a timestamp column."""
+    if dialect_name == "postgresql":
+        return func.date(func.timezone(IST.key, created_at))
+    # SQLite stores UTC text; the business timezone has a fixed offset
+    offset_minutes = int(datetime.now(IST).utcoffset().total_seconds() // 60)
+    return func.date(created_at, f"{offset_minutes:+d} minutes")
+
+
+def period_start(dialect_name: str, granularity: str, day):
+    """SQL for the first day of the day/week (Monday)/month bucket containing `day`."""
+    if granularity == DAY:
+        return day
+    if dialect_name == "postgresql":
+        return cast(func.date_trunc(granularity, day), Date)
+    if granularity == WEEK:
+        return func.date(day, "weekday 0", "-6 days")
+    return func.date(day, "start of month")
+
+
+def _utc_start_of(day: date, dialect_name: str) -> datetime:
+    start = datetime.combine(day, time(), IST).astimezone(timezone.utc)
+    return start if dialect_name == "postgresql" else start.replace(tzinfo=None)
+
+
+def rebuild(db: Session, since: Optional[date] = None):
+    """
+    Recompute the rollup from orders and order_items (from `since` onwards
+    when given) and commit. On Postgres the table is locked first, as in
+    dashboard_stats.rebuild, so concurrent order changes are not lost.
+    """
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        db.execute(text("LOCK TABLE order_rollup IN EXCLUSIVE MODE"))
+
+    day = local_day(dialect_name, Order.created_at)
+    source = (
+        select(
+            day, Order.company_id, Order.area, OrderItem.gas_id, Order.status_id,
+            func.sum(OrderItem.quantity), func.count(OrderItem.id),
+        )
+        .join(Order, OrderItem.order_id == Order.id)
+        .where(Order.is_deleted == False)
+        .group_by(day, Order.company_id, Order.area, OrderItem.gas_id, Order.status_id)
+    )
+
+    clear = delete(OrderRollup)
+    if since is not None:
+        clear = clear.where(OrderRollup.day >= since)
+        source = source.where(Order.created_at >= _utc_start_of(since, dialect_name))
+
+    db.execute(clear)
+    db.execute(insert(OrderRollup).from_select(
+        ["day", "company_id", "area", "gas_id", "status_id", "quantity", "items"], source
+    ))
+    db.commit()
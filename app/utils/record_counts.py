@@ -0,0 +1,65 @@
+"""
+Record Counts Utility
+---------------------
+Provides recordsTotal / recordsFiltered values for DataTables listings without
+paying for full COUNT(*) queries on every page.
+
+- Totals are cached per table and maintained by the services: they adjust the
+  cached value on create/delete (or invalidate it), and the TTL bounds drift
+  caused by writes from other instances.
+- Filtered counts run a narrow COUNT over the filtered id set. On Postgres,
+  when COUNT_ESTIMATE_MIN_ROWS is set and the planner estimates at least that
+  many rows, the EXPLAIN estimate is returned instead of an exact count.
+"""
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+ORDERS = "orders"
+COMPANIES = "companies"
+USERS = "users"
+
+_totals = TTLCache("record_totals", ttl_seconds=settings.COUNT_CACHE_TTL_SECONDS)
+
+
+def cached_total(db: Session, key: str, count_stmt: Select) -> int:
+    """Return the cached total for `key`, running `count_stmt` on a miss."""
+    return _totals.get_or_load(key, lambda: db.execute(count_stmt).scalar() or 0)
+
+
+def adjust_total(key: str, delta: int) -> None:
+    """Incrementally maintain a cached total after a committed create/delete."""
+    _totals.update(key, lambda total: max(total + delta, 0))
+
+
+def invalidate_total(key: str) -> None:
+    """Force the next listing to recount `key`."""
+    _totals.invalidate(key)
+
+
+def estimate_rows(db: Session, stmt: Select) -> int | None:
+    """Planner row estimate for `stmt` on Postgres, or None on other databases."""
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+    compiled = stmt.compile(dialect=bind.dialect, compile_kwargs={"render_postcompile": True})
+    plan = db.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def filtered_count(db: Session, id_stmt: Select) -> int:
+    """
+    Count the rows selected by `id_stmt` (a narrow SELECT of primary keys with
+    the listing's joins and filters).
+    """
+    threshold = settings.COUNT_ESTIMATE_MIN_ROWS
+    if threshold > 0:
+        estimate = estimate_rows(db, id_stmt)
+        if estimate is not None and estimate >= threshold:
+            return estimate
+    return db.execute(select(func.count()).select_from(id_stmt.subquery())).scalar() or 0
@@ -0,0 +1,109 @@
+"""
+Reference Data Cache
+--------------------
+In-process cache for rarely changing lookup tables: gases, order statuses,
+roles and companies.
+
+Each dataset is loaded whole, kept for REFERENCE_CACHE_TTL_SECONDS and carries
+a version number. Services that modify a dataset call `invalidate`, which bumps
+the version so a load that raced with the write is never stored. Other
+instances pick up changes when their TTL expires.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.company import Company
+from app.models.gas import Gas
+from app.models.order_status import OrderStatus
+from app.models.role import Role
+
+GASES = "gases"
+ORDER_STATUSES = "order_statuses"
+ROLES = "roles"
+COMPANIES = "companies"
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    version: int
+    rows: tuple
+    by_id: Dict[int, dict]
+
+
+def _load_gases(db: Session) -> List[dict]:
+    gases = db.query(Gas).filter(Gas.is_deleted == False).order_by(Gas.id).all()
+    return [
+        {
+            "id": gas.id, "name": gas.name, "unit": gas.unit, "description": gas.description,
+            "is_deleted": gas.is_deleted, "created_at": gas.created_at, "updated_at": gas.updated_at,
+        }
+        for gas in gases
+    ]
+
+
+def _load_order_statuses(db: Session) -> List[dict]:
+    return [
+        {"id": s.id, "name": s.name, "description": s.description}
+        for s in db.query(OrderStatus).order_by(OrderStatus.id).all()
+    ]
+
+
+def _load_roles(db: Session) -> List[dict]:
+    return [
+        {"id": r.id, "name": r.name, "description": r.description}
+        for r in db.query(Role).order_by(Role.id).all()
+    ]
+
+
+def _load_companies(db: Session) -> List[dict]:
+    rows = (
+        db.query(Company.id, Company.name, Company.address)
+        .filter(Company.is_deleted == False)
+        .order_by(Company.id)
+        .all()
+    )
+    return [row._asdict() for row in rows]
+
+
+_LOADERS: Dict[str, Callable[[Session], List[dict]]] = {
+    GASES: _load_gases,
+    ORDER_STATUSES: _load_order_statuses,
+    ROLES: _load_roles,
+    COMPANIES: _load_companies,
+}
+
+_cache = TTLCache("reference_data", ttl_seconds=settings.REFERENCE_CACHE_TTL_SECONDS)
+_versions: Dict[str, int] = {name: 0 for name in _LOADERS}
+_lock = threading.Lock()
+
+
+def get_reference(db: Session, name: str) -> ReferenceSnapshot:
+    """Return the cached snapshot of a reference dataset, loading it on a miss."""
+    snapshot = _cache.get(name)
+    if snapshot is not None:
+        return snapshot
+
+    version = _versions[name]
+    rows = _LOADERS[name](db)
+    snapshot = ReferenceSnapshot(version=version, rows=tuple(rows), by_id={row["id"]: row for row in rows})
+    with _lock:
+        if _versions[name] == version:
+            _cache.set(name, snapshot)
+    return snapshot
+
+
+def invalidate(name: str) -> None:
+    """Drop a dataset after it was modified; the next read reloads it."""
+    with _lock:
+        _versions[name] += 1
+        _cache.invalidate(name)
+
+
+def reference_versions() -> Dict[str, int]:
+    return dict(_versions)
@@ -0,0 +1,173 @@
+"""
+Search Query Builder
+--------------------
+Builds substring search filters and relevance expressions shared by the
+listing and search services.
+
+- Postgres: `ILIKE '%term%'`, which the pg_trgm GIN indexes serve, ranked by
+  `word_similarity(term, column)`.
+- SQLite: when the FTS5 trigram tables from the search migration exist and the
+  term has at least three characters, rows are matched through the FTS index;
+  otherwise it falls back to `LIKE`. Ranked by how early the term appears.
+
+A field on a table the listed one references (orders -> companies) is matched
+through the foreign key: the keys of matching rows are looked up first, with
+one statement for all such fields, and the listing filters on
+`company_id IN (<keys>) OR driver_id IN (<keys>) ...`. Each small table is
+searched through its own index and the listed rows are reached through the
+foreign key indexes (BitmapOr on Postgres, MULTI-INDEX OR on SQLite). One OR
+across joined tables, or of IN subqueries, is only evaluated by a full scan.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from sqlalchemy import (
+    ColumnElement, Select, and_, case, column, false, func, inspect, literal, literal_column, or_, select, table,
+    union_all,
+)
+from sqlalchemy.orm import Session
+
+# Shortest term the FTS5 trigram tokenizer can match.
+MIN_TRIGRAM_LENGTH = 3
+
+# A foreign key field matching more rows than this is filtered with a subquery
+# instead of a list: it selects a large share of the listed table anyway.
+MAX_LISTED_KEYS = 1000
+
+_fts_tables: dict = {}
+
+
+@dataclass(frozen=True)
+class SearchField:
+    """
+    A searchable text column.
+
+    `key` is the primary key of the row holding `column` (on the same alias),
+    and `fts_table` the SQLite FTS5 table mirroring it, if any.
+
+    `via` is the foreign key on the listed table that references `key`. When
+    set, `column` is on the base table (the keys are looked up on their own),
+    `key_filter` narrows the rows looked up (only drivers are assigned orders)
+    and `ranked` is the column the listing joins, for the relevance order.
+    """
+    column: ColumnElement
+    key: Optional[ColumnElement] = None
+    fts_table: Optional[str] = None
+    via: Optional[ColumnElement] = None
+    key_filter: tuple = ()
+    ranked: Optional[ColumnElement] = None
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    filter: ColumnElement
+    rank: Optional[ColumnElement]
+    matches_nothing: bool = False   # no field can match: listings can skip their queries
+
+
+def _has_fts_table(db: Session, name: str) -> bool:
+    bind = db.get_bind()
+    cache_key = (str(bind.url), name)
+    if cache_key not in _fts_tables:
+        _fts_tables[cache_key] = inspect(bind).has_table(name)
+    return _fts_tables[cache_key]
+
+
+def _fts_rowids(field: SearchField, term: str) -> Select:
+    """`SELECT rowid FROM <fts> WHERE <fts> MATCH '{column} : "term"'`"""
+    phrase = '"' + term.replace('"', '""') + '"'
+    fts = table(field.fts_table, column("rowid"))
+    return select(fts.c.rowid).where(
+        literal_column(field.fts_table).op("MATCH", is_comparison=True)(
+            f"{{{field.column.key}}} : {phrase}"
+        )
+    )
+
+
+def _uses_fts(db: Session, field: SearchField, term: str) -> bool:
+    return (
+        db.get_bind().dialect.name == "sqlite"
+        and field.fts_table is not None
+        and len(term) >= MIN_TRIGRAM_LENGTH
+        and _has_fts_table(db, field.fts_table)
+    )
+
+
+def _matching_keys(db: Session, term: str, fields: Sequence[SearchField]) -> list:
+    """Keys of the rows matching `term`, per field, from one UNION ALL over the fields' tables."""
+    pattern = f"%{term}%"
+    selects = []
+    for index, field in enumerate(fields):
+        if _uses_fts(db, field, term):
+            match = field.key.in_(_fts_rowids(field, term))
+        else:
+            match = field.column.ilike(pattern)
+        selects.append(select(literal(index).label("field"), field.key.label("key")).where(match, *field.key_filter))
+    keys = [[] for _ in fields]
+    for index, key in db.execute(union_all(*selects) if len(selects) > 1 else selects[0]):
+        keys[index].append(key)
+    return keys
+
+
+def _via_filter(db: Session, field: SearchField, term: str, keys: list,
+                scope: Sequence[ColumnElement]) -> Optional[ColumnElement]:
+    if not keys:
+        return None
+    if len(keys) > MAX_LISTED_KEYS:
+        match = field.key.in_(_fts_rowids(field, term)) if _uses_fts(db, field, term) else field.column.ilike(f"%{term}%")
+        return field.via.in_(select(field.key).where(match, *field.key_filter).correlate(None))
+    # `scope` repeated per branch so a partial index on it can serve the branch
+    return and_(field.via.in_(keys), *scope)
+
+
+def _ranked(field: SearchField) -> ColumnElement:
+    return field.column if field.ranked is None else field.ranked
+
+
+def build_search(db: Session, term: Optional[str], fields: Sequence[SearchField],
+                 scope: Sequence[ColumnElement] = ()) -> Optional[SearchQuery]:
+    """
+    Return the filter and relevance expression for `term` over `fields`, or
+    None when the term is blank. `scope` holds conditions every listed row
+    meets (e.g. not deleted), repeated next to each foreign key list.
+    """
+    term = (term or "").strip()
+    if not term:
+        return None
+
+    pattern = f"%{term}%"
+    dialect = db.get_bind().dialect.name
+
+    via_fields = [field for field in fields if field.via is not None]
+    clauses = []
+    if via_fields:
+        for field, keys in zip(via_fields, _matching_keys(db, term, via_fields)):
+            clause = _via_filter(db, field, term, keys, scope)
+            if clause is not None:
+                clauses.append(clause)
+
+    for field in fields:
+        if field.via is not None:
+            continue
+        if _uses_fts(db, field, term):
+            clauses.append(field.key.in_(_fts_rowids(field, term)))
+        else:
+            clauses.append(field.column.ilike(pattern))
+    match = or_(*clauses) if clauses else false()
+
+    if dialect == "postgresql":
+        return SearchQuery(
+            filter=match,
+            rank=func.greatest(*(func.word_similarity(term, _ranked(field)) for field in fields)),
+            matches_nothing=not clauses,
+        )
+
+    # Earlier matches rank higher: 1 / position of the term, best over all fields
+    scores = [
+        case((func.instr(func.lower(_ranked(field)), term.lower()) > 0,
+              1.0 / func.instr(func.lower(_ranked(field)), term.lower())), else_=0.0)
+        for field in fields
+    ]
+    rank = func.max(*scores) if len(scores) > 1 else scores[0]
+    return SearchQuery(filter=match, rank=rank, matches_nothing=not clauses)
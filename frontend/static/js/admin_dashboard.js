@@ -31,7 +31,7 @@ $(document).ready(function () {
     }
 
     // --- Main function to load dashboard data ---
-    async function loadDashboard() {
+    async function loadDashboard(quiet = false) {
         const token = localStorage.getItem('accessToken');
         if (!token) {
             showToast('Authentication Error: You are not logged in. Please log in.', 'danger');
@@ -39,8 +39,10 @@ $(document).ready(function () {
         }
 
         try {
+            // no-cache: revalidate with the stored ETag; unchanged data comes back as 304
             const response = await fetch('/api/dashboard/', {
-                headers: { 'Authorization': 'Bearer ' + token }
+                headers: { 'Authorization': 'Bearer ' + token },
+                cache: 'no-cache'
             });
 
             const result = await response.json();
@@ -50,7 +52,7 @@ $(document).ready(function () {
             }
 
             if (result.statusCode === 200 && result.data) {
-                showToast(result.message, 'success');
+                if (!quiet) { showToast(result.message, 'success'); }
                 const data = result.data;
 
                 // Populate the insight cards
@@ -93,7 +95,46 @@ $(document).ready(function () {
         }
     }
 
+    // --- Live refresh ---
+    // Order changes arrive from /api/orders/stream; a burst of them triggers one
+    // revalidation of the insights (304 when the totals did not move).
+    let refreshTimer = null;
+    function scheduleRefresh() {
+        clearTimeout(refreshTimer);
+        refreshTimer = setTimeout(() => loadDashboard(true), 1000);
+    }
+
+    // EventSource cannot send the session token, so the URL carries a
+    // short-lived stream token instead.
+    async function openOrderStream() {
+        const token = localStorage.getItem('accessToken');
+        if (!token || !window.EventSource) { return; }
+        let streamToken;
+        try {
+            const response = await fetch('/api/orders/stream/token', {
+                method: 'POST',
+                headers: { 'Authorization': 'Bearer ' + token }
+            });
+            const result = await response.json();
+            if (!response.ok || result.statusCode !== 200) { return; }
+            streamToken = result.data.stream_token;
+        } catch (error) { return; }
+
+        const stream = new EventSource(`/api/orders/stream?stream_token=${encodeURIComponent(streamToken)}`);
+        ['order.created', 'order.updated', 'order.deleted', 'orders.imported', 'resync'].forEach(type => {
+            stream.addEventListener(type, scheduleRefresh);
+        });
+        stream.onerror = () => {
+            // The browser retries with the same URL until the stream token has
+            // expired, then gives up; start over with a fresh one
+            if (stream.readyState === EventSource.CLOSED) {
+                setTimeout(() => { scheduleRefresh(); openOrderStream(); }, 5000);
+            }
+        };
+    }
+
     if ($('#pending-orders').length) {
         loadDashboard();
+        openOrderStream();
     }
 });
\ No newline at end of file
@@ -50,7 +50,11 @@ $(document).ready(function() {
         orders.forEach(order => renderOrderCard(order));
     }
 
-    function renderOrderCard(order) {
+    function findOrderCard(orderId) {
+        return orderList.querySelector(`.order-card[data-id="${orderId}"]`);
+    }
+
+    function renderOrderCard(order, prepend = false) {
         const orderCard = document.createElement('div');
         orderCard.className = 'order-card';
         orderCard.dataset.id = order.id;
@@ -81,10 +85,93 @@ $(document).ready(function() {
             <div class="swipe-action delete"><i class="fas fa-trash-alt"></i></div>
         `;
 
-        orderList.appendChild(orderCard);
+        const existing = findOrderCard(order.id);
+        if (existing) {
+            existing.replaceWith(orderCard);
+        } else if (prepend) {
+            orderList.prepend(orderCard);
+        } else {
+            orderList.appendChild(orderCard);
+        }
         initSwipe(orderCard);
     }
 
+    // --- 2b. LIVE UPDATES ---
+    // Changes arrive from /api/orders/stream (Server-Sent Events) and are
+    // patched into the list, so it is only reloaded when events were missed.
+    // EventSource cannot send the session token, so the URL carries a
+    // short-lived stream token instead.
+    let orderStream = null;
+    openOrderStream();
+
+    async function openOrderStream(reconnecting = false) {
+        const token = localStorage.getItem('accessToken');
+        if (!token || !window.EventSource) { return; }
+
+        let streamToken;
+        try {
+            const data = await apiFetch('/api/orders/stream/token', { method: 'POST' });
+            if (data.statusCode !== 200) { return; }
+            streamToken = data.data.stream_token;
+        } catch (error) { return; }
+
+        orderStream = new EventSource(`/api/orders/stream?stream_token=${encodeURIComponent(streamToken)}`);
+        let opened = reconnecting;
+        orderStream.onopen = () => {
+            // Reconnected: changes made while disconnected were not received
+            if (opened) { fetchOrders(); }
+            opened = true;
+        };
+        orderStream.onerror = () => {
+            // The browser retries with the same URL until the stream token has
+            // expired, then gives up; start over with a fresh one
+            if (orderStream.readyState === EventSource.CLOSED) {
+                setTimeout(() => openOrderStream(true), 5000);
+            }
+        };
+        orderStream.addEventListener('order.created', (e) => {
+            const event = JSON.parse(e.data);
+            if (event.order) {
+                renderOrderCard(event.order, true);
+            } else {
+                refreshOrderCard(event.order_id, true);
+            }
+        });
+        orderStream.addEventListener('order.updated', (e) => {
+            const event = JSON.parse(e.data);
+            if (event.changes) {
+                patchOrderCard(event.order_id, event.changes);
+            } else {
+                refreshOrderCard(event.order_id);
+            }
+        });
+        orderStream.addEventListener('order.deleted', (e) => {
+            const card = findOrderCard(JSON.parse(e.data).order_id);
+            if (card) { card.remove(); }
+        });
+        orderStream.addEventListener('orders.imported', fetchOrders);
+        orderStream.addEventListener('resync', fetchOrders);
+    }
+
+    function streamIsOpen() {
+        return orderStream !== null && orderStream.readyState === EventSource.OPEN;
+    }
+
+    function patchOrderCard(orderId, changes) {
+        const card = findOrderCard(orderId);
+        if (!card) { return; }
+        if ('company_name' in changes) { card.querySelector('.company-name').textContent = changes.company_name; }
+        if ('status_name' in changes) { card.querySelector('.status span').textContent = changes.status_name || 'N/A'; }
+        if ('area' in changes) { card.querySelector('.area span').textContent = changes.area; }
+    }
+
+    async function refreshOrderCard(orderId, prepend = false) {
+        const data = await apiFetch(`/api/orders/${orderId}`);
+        if (data.statusCode === 200) {
+            if (prepend || findOrderCard(orderId)) { renderOrderCard(data.data, prepend); }
+        }
+    }
+
     // --- 3. EVENT LISTENERS ---
 
     $('#add-order-btn').on('click', function() {
@@ -152,7 +239,7 @@ $(document).ready(function() {
             if (data.statusCode === 200 || data.statusCode === 201) {
                 addEditModal.hide();
                 showToast(message, 'success');
-                fetchOrders();
+                if (!streamIsOpen()) { fetchOrders(); }
             } else {
                 showToast(message, 'danger');
             }
@@ -170,7 +257,7 @@ $(document).ready(function() {
 
                 if (data.statusCode === 200) {
                     showToast(message, 'success');
-                    fetchOrders();
+                    if (!streamIsOpen()) { fetchOrders(); }
                 } else {
                     showToast(message, 'danger');
                 }
@@ -1,7 +1,8 @@
-
 from fastapi import FastAPI
-from app.api import auth_controller,dashboard_controller , company_controller, gas_controller, order_controller, order_item_controller, health_controller, order_status_controller, user_controller, role_controller
+from app.api.registry import include_routers
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware
+from app.db.instrumentation import DBTimingMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
@@ -18,19 +19,17 @@ def create_app():
         allow_headers=["*"],
     )
 
+    if settings.DB_REPORT_ACQUIRE_TIMING or settings.DB_REQUEST_STATS or settings.QUERY_BUDGETS != "off":
+        app.add_middleware(DBTimingMiddleware)
+
+    # Outermost, so recorded latency covers every other middleware
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+
     app.mount("/frontend", StaticFiles(directory="frontend"), name="frontend")
 
-    # Include routers
-    app.include_router(auth_controller.router, prefix="/api/auth", tags=["auth"])
-    app.include_router(dashboard_controller.router, prefix="/api/dashboard", tags=["dashboard"])
-    app.include_router(company_controller.router, prefix="/api", tags=["companies"])
-    app.include_router(role_controller.router, prefix="/api", tags=["roles"])
-    app.include_router(gas_controller.router, prefix="/api", tags=["gases"])
-    app.include_router(order_controller.router, prefix="/api", tags=["orders"])
-    app.include_router(order_item_controller.router, prefix="/api", tags=["order-items"])
-    app.include_router(health_controller.router, prefix="/api/health", tags=["health"])
-    app.include_router(user_controller.router, prefix="/api", tags=["users"])
-    app.include_router(order_status_controller.router, prefix="/api", tags=["order_statuses"])
+    # Include routers (see app/api/registry.py for async and lazy selection)
+    include_routers(app)
 
     @app.get("/")
     async def read_index():
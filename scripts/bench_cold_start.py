@@ -0,0 +1,137 @@
+"""
+Cold-Start Benchmark
+--------------------
+Measures what a fresh serverless instance pays before answering, in new
+interpreters, with lazy routers off and on:
+
+- import:    `import main` (module imports plus create_app)
+- first:     first request that needs no database (GET /api/health/ping)
+- first db:  first request that needs the database (GET /api/orders/),
+             including engine creation and the first connection
+
+Each phase is reported as the median over --runs interpreters. The run fails
+(exit code 1) when the lazy-mode import + first request exceeds --budget-ms,
+so the cold-start budget can be tracked in CI.
+
+Usage:
+    python scripts/bench_cold_start.py
+    python scripts/bench_cold_start.py --runs 10 --budget-ms 900
+
+Requests are sent straight to the ASGI app, so no HTTP client is imported
+into the measured process. Auth uses AUTH_TRUST_TOKEN_CLAIMS against a
+scratch SQLite database with an empty schema.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+import script_env
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budget for import + first request with lazy routers, in milliseconds
+COLD_START_BUDGET_MS = 1200
+
+_scratch_db = script_env.scratch_database_url("quickgas_cold_start.db")
+DEFAULT_ENV = {
+    **script_env.placeholder_settings("QuickGas Cold Start", _scratch_db),
+    "AUTH_TRUST_TOKEN_CLAIMS": "true",
+}
+
+# Runs in the measured interpreter; prints one JSON line of timings in ms.
+_PROBE = r"""
+import asyncio, json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def call(path, headers=()):
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+             "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+             "root_path": "", "headers": [(k.encode(), v.encode()) for k, v in headers],
+             "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 80)}
+    status = {}
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+    await main.app(scope, receive, send)
+    return status["code"]
+
+async def probe():
+    t0 = time.perf_counter()
+    assert await call("/api/health/ping") == 200
+    t1 = time.perf_counter()
+    from app.core.security import create_access_token
+    token = create_access_token({"user_id": 1, "role_id": 1, "email": "bench@quickgas.local", "name": "Bench"})
+    t2 = time.perf_counter()
+    assert await call("/api/orders/", [("authorization", "Bearer " + token)]) == 200
+    t3 = time.perf_counter()
+    return t1 - t0, t3 - t2
+
+first, first_db = asyncio.run(probe())
+print(json.dumps({"import": (imported - started) * 1000, "first": first * 1000, "first_db": first_db * 1000}))
+"""
+
+
+def create_scratch_schema():
+    sys.path.insert(0, ROOT)
+    for key, value in DEFAULT_ENV.items():
+        os.environ.setdefault(key, value)
+    from sqlalchemy import create_engine
+    from app.db.base import Base
+    import app.models  # noqa: F401
+
+    path = _scratch_db.split("///", 1)[1]
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(_scratch_db)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+
+def measure(lazy_routers: str, runs: int) -> dict:
+    env = {**os.environ, **DEFAULT_ENV, "LAZY_ROUTERS": lazy_routers}
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", _PROBE], cwd=ROOT, env=env, capture_output=True, text=True)
+        if result.returncode != 0:
+            sys.stderr.write(result.stderr)
+            raise SystemExit("cold-start probe failed")
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return {phase: statistics.median(sample[phase] for sample in samples) for phase in samples[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per mode")
+    parser.add_argument("--budget-ms", type=float, default=COLD_START_BUDGET_MS,
+                        help="Maximum lazy-mode import + first request time")
+    args = parser.parse_args()
+
+    create_scratch_schema()
+    # Warm the bytecode cache so the first run does not pay for compilation
+    measure("off", 1)
+
+    results = {mode: measure(mode, args.runs) for mode in ("off", "on")}
+
+    print(f"{'lazy routers':<13} {'import ms':>10} {'first ms':>9} {'first db ms':>12} {'cold start ms':>14}")
+    for mode, timings in results.items():
+        cold_start = timings["import"] + timings["first"]
+        print(f"{mode:<13} {timings['import']:>10.1f} {timings['first']:>9.1f} "
+              f"{timings['first_db']:>12.1f} {cold_start:>14.1f}")
+
+    lazy_cold_start = results["on"]["import"] + results["on"]["first"]
+    if lazy_cold_start > args.budget_ms:
+        print(f"\nFAIL: cold start {lazy_cold_start:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+    print(f"\nOK: cold start {lazy_cold_start:.1f} ms within the {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Create-Order Round-Trip Benchmark
+---------------------------------
+Counts the SQL round trips and wall time spent by order_service.create_order
+for orders of increasing size, and fails if the round-trip count grows with
+the number of items.
+
+Usage:
+    python scripts/bench_create_order.py
+    python scripts/bench_create_order.py --sizes 1 10 100 --repeat 20
+
+Runs against an in-memory SQLite database by default. Pass --database-url to
+run against a scratch Postgres database (tables and reference rows are created
+if missing, so never point it at production).
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Settings are required at import time; use placeholders for what the environment lacks.
+# The application engine is never used here, the benchmark builds its own.
+import script_env
+script_env.use_placeholder_settings("QuickGas Benchmark")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models import Company, Gas, Role, User, OrderStatus
+from app.dto.order_dto import OrderItemCreate
+from app.services.order_service import create_order
+
+
+def build_engine(database_url: str):
+    if database_url.startswith("sqlite"):
+        return create_engine(
+            database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    return create_engine(database_url)
+
+
+def seed_reference_data(SessionFactory, gas_count: int):
+    """Insert the minimum rows create_order needs, returning (company_id, admin_id, gas_ids)."""
+    db = SessionFactory()
+    try:
+        if not db.query(Role).filter(Role.id == 1).first():
+            db.add(Role(id=1, name="ADMIN"))
+        if not db.query(OrderStatus).filter(OrderStatus.id == 1).first():
+            db.add(OrderStatus(id=1, name="PENDING"))
+        company = Company(name=f"Benchmark Company {time.time_ns()}", address="Benchmark Address")
+        db.add(company)
+        db.flush()
+        admin = User(
+            name="Benchmark Admin",
+            email=f"bench-{time.time_ns()}@quickgas.local",
+            company_id=company.id,
+            role_id=1,
+            password_hash="x",
+        )
+        gases = [Gas(name=f"Benchmark Gas {time.time_ns()}-{i}") for i in range(gas_count)]
+        db.add(admin)
+        db.add_all(gases)
+        db.commit()
+        return company.id, admin.id, [gas.id for gas in gases]
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 5, 10, 50, 100])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    engine = build_engine(args.database_url)
+    Base.metadata.create_all(engine)
+    SessionFactory = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
+
+    statements = {"count": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements["count"] += 1
+
+    company_id, admin_id, gas_ids = seed_reference_data(SessionFactory, max(args.sizes))
+
+    print(f"{'items':>6} {'round trips':>12} {'avg ms':>10}")
+    round_trips = {}
+    for size in args.sizes:
+        items = [OrderItemCreate(gas_id=gas_ids[i % len(gas_ids)], quantity=1) for i in range(size)]
+        elapsed = 0.0
+        for _ in range(args.repeat):
+            db = SessionFactory()
+            try:
+                statements["count"] = 0
+                started = time.perf_counter()
+                create_order(db, company_id, admin_id, "Benchmark Area", None, None, items)
+                elapsed += time.perf_counter() - started
+            finally:
+                db.close()
+        round_trips[size] = statements["count"]
+        print(f"{size:>6} {round_trips[size]:>12} {elapsed / args.repeat * 1000:>10.2f}")
+
+    if len(set(round_trips.values())) != 1:
+        print("FAIL: round-trip count depends on the number of items")
+        sys.exit(1)
+    print("OK: round-trip count is constant")
+
+
+if __name__ == "__main__":
+    main()
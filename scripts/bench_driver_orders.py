@@ -0,0 +1,165 @@
+"""
+Driver Feed Benchmark
+---------------------
+Times order_service.get_driver_orders (GET /api/orders/my-deliveries) for a
+driver with a long delivery history, prints the query plan of the feed query
+and fails if the p95 exceeds the budget or the plan scans the orders table.
+
+Usage:
+    python scripts/bench_driver_orders.py
+    python scripts/bench_driver_orders.py --history 200000 --open 20 --budget-ms 10
+
+Runs against an in-memory SQLite database by default. Pass --database-url to
+run against a scratch Postgres database (tables and rows are created, so never
+point it at production).
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Settings are required at import time; use placeholders for what the environment lacks.
+# The application engine is never used here, the benchmark builds its own.
+import script_env
+script_env.use_placeholder_settings("QuickGas Benchmark")
+
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models import Company, Gas, Order, OrderItem, OrderStatus, Role, User
+from app.services.order_service import driver_orders_select, get_driver_orders
+
+COMPLETED_STATUS_ID = 3
+STATUSES = ["PENDING", "OUT_FOR_DELIVERY", "COMPLETED", "OVERDUE", "DELETED", "CANCELLED"]
+
+
+def build_engine(database_url: str):
+    if database_url.startswith("sqlite"):
+        from sqlalchemy.pool import StaticPool
+        return create_engine(database_url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    return create_engine(database_url)
+
+
+def seed(SessionFactory, history: int, open_orders: int, other_drivers: int) -> int:
+    """Insert the driver's history, their open orders and other drivers' orders; return the driver id."""
+    db = SessionFactory()
+    try:
+        for role_id, name in enumerate(["ADMIN", "DISPATCHER", "DRIVER", "CUSTOMER"], start=1):
+            if db.get(Role, role_id) is None:
+                db.add(Role(id=role_id, name=name))
+        for status_id, name in enumerate(STATUSES, start=1):
+            if db.get(OrderStatus, status_id) is None:
+                db.add(OrderStatus(id=status_id, name=name))
+        company = Company(name=f"Benchmark Company {time.time_ns()}", address="Benchmark Address")
+        gas = Gas(name=f"Benchmark Gas {time.time_ns()}")
+        db.add_all([company, gas])
+        db.flush()
+        admin = User(name="Benchmark Admin", email=f"admin-{time.time_ns()}@quickgas.local",
+                     company_id=company.id, role_id=1, password_hash="x")
+        drivers = [
+            User(name=f"Benchmark Driver {i}", email=f"driver-{i}-{time.time_ns()}@quickgas.local",
+                 company_id=company.id, role_id=3, password_hash="x")
+            for i in range(1 + other_drivers)
+        ]
+        db.add(admin)
+        db.add_all(drivers)
+        db.flush()
+
+        started = datetime.now(timezone.utc) - timedelta(days=3 * 365)
+        driver_ids = [driver.id for driver in drivers]
+        rows = []
+        total = (history + open_orders) * (1 + other_drivers)
+        for i in range(total):
+            driver_id = driver_ids[i % len(driver_ids)]
+            is_open = i >= total - open_orders * len(driver_ids)
+            rows.append({
+                "company_id": company.id, "admin_id": admin.id, "driver_id": driver_id,
+                "status_id": (1 + i % 2) if is_open else COMPLETED_STATUS_ID,
+                "area": "Benchmark Area", "is_deleted": False,
+                "created_at": started + timedelta(minutes=i), "updated_at": started + timedelta(minutes=i),
+            })
+        for offset in range(0, len(rows), 5000):
+            batch = rows[offset:offset + 5000]
+            ids = db.execute(insert(Order).returning(Order.id), batch).scalars().all()
+            db.execute(insert(OrderItem), [{"order_id": order_id, "gas_id": gas.id, "quantity": 1} for order_id in ids])
+        db.commit()
+        return driver_ids[0]
+    finally:
+        db.close()
+
+
+def query_plan(db, driver_id: int) -> str:
+    stmt = driver_orders_select(driver_id)
+    compiled = stmt.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    prefix = "EXPLAIN QUERY PLAN " if db.get_bind().dialect.name == "sqlite" else "EXPLAIN "
+    return "\n".join(str(row[-1]) for row in db.execute(text(prefix + str(compiled))).all())
+
+
+def scans_orders(plan: str) -> bool:
+    """True if the plan reads all of orders (SQLite "SCAN orders", Postgres "Seq Scan on orders")."""
+    return any(
+        line.strip().lower().startswith("scan orders") or "seq scan on orders" in line.lower()
+        for line in plan.splitlines()
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--history", type=int, default=50000, help="Completed orders in the driver's history")
+    parser.add_argument("--open", type=int, default=20, help="Open orders assigned to the driver")
+    parser.add_argument("--other-drivers", type=int, default=3, help="Drivers with the same amount of orders")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--budget-ms", type=float, default=10.0, help="Fail if the p95 exceeds this")
+    args = parser.parse_args()
+
+    engine = build_engine(args.database_url)
+    Base.metadata.create_all(engine)
+    SessionFactory = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
+
+    statements = {"count": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements["count"] += 1
+
+    driver_id = seed(SessionFactory, args.history, args.open, args.other_drivers)
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as connection:
+            connection.execute(text("ANALYZE orders"))
+            connection.execute(text("ANALYZE order_items"))
+
+    timings = []
+    with SessionFactory() as db:
+        plan = query_plan(db, driver_id)
+        get_driver_orders(db, driver_id)  # warm the reference data cache
+        for _ in range(args.repeat):
+            statements["count"] = 0
+            started = time.perf_counter()
+            orders = get_driver_orders(db, driver_id)
+            timings.append((time.perf_counter() - started) * 1000)
+            db.rollback()
+
+    timings.sort()
+    p50 = statistics.median(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(plan)
+    print(f"orders returned {len(orders)}  statements {statements['count']}  p50 {p50:.2f} ms  p95 {p95:.2f} ms")
+
+    if scans_orders(plan):
+        print("FAIL: the feed query scans the orders table")
+        sys.exit(1)
+    if p95 > args.budget_ms:
+        print(f"FAIL: p95 above the {args.budget_ms:g} ms budget")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
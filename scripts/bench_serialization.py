@@ -0,0 +1,167 @@
+"""
+Order Page Serialization Benchmark
+----------------------------------
+Times turning one page of GET /api/orders/ rows into response bytes, without
+the database or HTTP, for:
+
+- current:  OrderWithItemsRead/OrderItemRead.model_validate per row, wrapped
+            in APIResponse(data=Any), then validated and dumped the way
+            FastAPI applies response_model=APIResponse
+- typed:    the same models in OrderListResponse (RESPONSE_SERIALIZATION=pydantic)
+- fast:     plain dicts from the rows, written by app/core/fast_json.py
+            (RESPONSE_SERIALIZATION=fast, the default)
+
+Fails if the three paths do not produce the same JSON document.
+
+Usage:
+    python scripts/bench_serialization.py
+    python scripts/bench_serialization.py --page-sizes 10,100 --repeat 500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Settings are required at import time; use placeholders for what the environment lacks.
+# The application engine is never used here, the benchmark builds its own.
+import script_env
+script_env.use_placeholder_settings("QuickGas Benchmark")
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import aliased, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core import fast_json
+from app.db.base import Base
+from app.dto.base_response import APIResponse
+from app.dto.order_dto import OrderListResponse
+from app.models import Company, Gas, Order, OrderItem, OrderStatus, Role, User
+from app.services.order_service import (
+    group_order_items, order_items_select, order_listing_filters, order_page_select, to_order_dicts, to_order_with_items,
+)
+
+STATUSES = ["PENDING", "OUT_FOR_DELIVERY", "COMPLETED", "OVERDUE", "DELETED", "CANCELLED"]
+MESSAGE = "Order retrieved successfully."
+
+
+def seed(SessionFactory, orders: int):
+    db = SessionFactory()
+    try:
+        for role_id, name in enumerate(["ADMIN", "DISPATCHER", "DRIVER", "CUSTOMER"], start=1):
+            db.add(Role(id=role_id, name=name))
+        for status_id, name in enumerate(STATUSES, start=1):
+            db.add(OrderStatus(id=status_id, name=name))
+        company = Company(name="Benchmark Company", address="Plot 12, GIDC Estate, Surat")
+        gases = [Gas(name=name, unit="m3") for name in ("Oxygen", "Nitrogen", "Argon")]
+        db.add(company)
+        db.add_all(gases)
+        db.flush()
+        admin = User(name="Benchmark Admin", email="admin@quickgas.local", company_id=company.id, role_id=1, password_hash="x")
+        driver = User(name="Benchmark Driver", email="driver@quickgas.local", company_id=company.id, role_id=3, password_hash="x")
+        db.add_all([admin, driver])
+        db.flush()
+
+        now = datetime.now(timezone.utc)
+        ids = db.execute(insert(Order).returning(Order.id), [
+            {"company_id": company.id, "admin_id": admin.id, "driver_id": driver.id if i % 3 else None,
+             "status_id": 1 + i % 3, "area": f"Area {i % 7}", "mobile_no": "9876543210",
+             "notes": "Deliver before noon" if i % 2 else None, "is_deleted": False,
+             "created_at": now - timedelta(minutes=i, microseconds=i), "updated_at": now - timedelta(seconds=i)}
+            for i in range(orders)
+        ]).scalars().all()
+        db.execute(insert(OrderItem), [
+            {"order_id": order_id, "gas_id": gases[(order_id + n) % 3].id, "quantity": 1 + n}
+            for order_id in ids for n in range(1 + order_id % 3)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def fetch_page(db, length: int):
+    """Rows and items of the first page, as list_orders reads them."""
+    AdminUser, DriverUser = aliased(User), aliased(User)
+    filters = order_listing_filters(None)
+    results = db.execute(order_page_select(db, AdminUser, DriverUser, filters, None, "desc", None, 0, length)).all()
+    items_map = group_order_items(db.execute(order_items_select([row.id for row in results])).all())
+    return results, items_map
+
+
+def page_data(orders: list, total: int) -> dict:
+    return {"draw": 1, "recordsTotal": total, "recordsFiltered": total, "data": orders, "next_cursor": None}
+
+
+def current_path(results, items_map, total: int, adapter: TypeAdapter) -> bytes:
+    orders = [to_order_with_items(row, items_map.get(row.id, [])) for row in results]
+    response = APIResponse(data=page_data(orders, total), statusCode=200, message=MESSAGE, technicalMessage=None)
+    return adapter.dump_json(adapter.validate_python(response))
+
+
+def typed_path(results, items_map, total: int, adapter: TypeAdapter) -> bytes:
+    orders = [to_order_with_items(row, items_map.get(row.id, [])) for row in results]
+    response = OrderListResponse(data=page_data(orders, total), statusCode=200, message=MESSAGE, technicalMessage=None)
+    return adapter.dump_json(adapter.validate_python(response))
+
+
+def fast_path(results, items_map, total: int) -> bytes:
+    orders = to_order_dicts(results, items_map)
+    return fast_json.api_response(page_data(orders, total), 200, MESSAGE).body
+
+
+def timed(function, repeat: int) -> float:
+    """Median microseconds per call."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--page-sizes", default="10,50,100")
+    parser.add_argument("--repeat", type=int, default=300)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    SessionFactory = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
+    seed(SessionFactory, args.orders)
+
+    current_adapter, typed_adapter = TypeAdapter(APIResponse), TypeAdapter(OrderListResponse)
+    print(f"{'page':>5} {'current us':>11} {'typed us':>10} {'fast us':>9} {'speedup':>8} {'bytes':>7}")
+    failed = False
+    with SessionFactory() as db:
+        for size in (int(size) for size in args.page_sizes.split(",")):
+            results, items_map = fetch_page(db, size)
+            paths = {
+                "current": lambda: current_path(results, items_map, args.orders, current_adapter),
+                "typed": lambda: typed_path(results, items_map, args.orders, typed_adapter),
+                "fast": lambda: fast_path(results, items_map, args.orders),
+            }
+            outputs = {name: path() for name, path in paths.items()}
+            documents = {name: json.loads(body) for name, body in outputs.items()}
+            if not documents["current"] == documents["typed"] == documents["fast"]:
+                print(f"FAIL: page of {size}: the paths produce different JSON")
+                failed = True
+                continue
+            micros = {name: timed(path, args.repeat) for name, path in paths.items()}
+            print(f"{size:>5} {micros['current']:>11.0f} {micros['typed']:>10.0f} {micros['fast']:>9.0f} "
+                  f"{micros['current'] / micros['fast']:>7.1f}x {len(outputs['fast']):>7}")
+
+    if failed:
+        sys.exit(1)
+    print("OK: identical JSON from every path")
+
+
+if __name__ == "__main__":
+    main()
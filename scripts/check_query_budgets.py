@@ -0,0 +1,217 @@
+"""
+Query Budget Check
+------------------
+Drives every API route through the application with QUERY_BUDGETS=enforce
+and reports the statements each request ran against its endpoint's budget
+(see app/db/query_budget.py). Fails if a request exceeds its budget, runs
+the same statement shape QUERY_REPEAT_THRESHOLD times or more (N+1), or
+answers with an unexpected status.
+
+Usage:
+    python scripts/check_query_budgets.py
+    python scripts/check_query_budgets.py --warm --verbose
+
+In-process caches (principals, reference data, counts, dashboard) are
+emptied before each request by default, so the numbers are those of a cold
+serverless instance, the most a request can cost. --warm keeps them.
+
+Runs against a fresh SQLite database file by default. Pass --database-url to
+check a scratch Postgres database (tables and rows are created, so never
+point it at production).
+"""
+
+import argparse
+import logging
+import os
+import re
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from typing import Optional
+
+import script_env
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def configure(database_url: str):
+    """Settings are read at import time, so the environment is set before importing the app."""
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["NEON_CONNECTION_STRING"] = database_url
+    os.environ["QUERY_BUDGETS"] = "enforce"
+    os.environ["DB_REQUEST_STATS"] = "true"
+    script_env.use_placeholder_settings("QuickGas Query Budgets")
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+    os.environ.setdefault("PASSWORD_HASH_EXECUTOR", "thread")
+    os.environ.setdefault("ORDER_EVENTS_TRANSPORT", "local")
+
+
+@dataclass
+class Call:
+    name: str
+    method: str
+    path: str
+    as_user: Optional[str] = "admin"   # "admin", "driver" or None (no token)
+    json: Optional[dict] = None
+    expect: int = 200
+
+
+@dataclass
+class Seeded:
+    admin_id: int
+    driver_id: int
+    company_id: int
+    gas_ids: list
+    order_ids: list = field(default_factory=list)
+
+
+ADMIN_EMAIL = "admin@quickgas.example.com"
+PASSWORD = "budget-check-password"
+
+
+def seed(SessionFactory) -> Seeded:
+    from sqlalchemy import insert
+
+    from app.core import password_hashing
+    from app.models import Company, Gas, Order, OrderItem, OrderStatus, Role, User
+    from app.utils import dashboard_stats, order_rollup
+
+    db = SessionFactory()
+    try:
+        for role_id, name in enumerate(["ADMIN", "DISPATCHER", "DRIVER", "CUSTOMER"], start=1):
+            db.add(Role(id=role_id, name=name))
+        for status_id, name in enumerate(["PENDING", "OUT_FOR_DELIVERY", "COMPLETED", "OVERDUE", "DELETED", "CANCELLED"], start=1):
+            db.add(OrderStatus(id=status_id, name=name))
+        companies = [Company(name=f"Budget Company {i}", address="Plot 12, GIDC Estate, Surat") for i in range(3)]
+        gases = [Gas(name=name, unit="m3") for name in ("Oxygen", "Nitrogen", "Argon", "Acetylene")]
+        db.add_all(companies + gases)
+        db.flush()
+        admin = User(name="Budget Admin", email=ADMIN_EMAIL, company_id=companies[0].id, role_id=1,
+                     password_hash=password_hashing._hash(PASSWORD, 4))
+        drivers = [User(name=f"Budget Driver {i}", email=f"driver{i}@quickgas.example.com", company_id=companies[0].id,
+                        role_id=3, password_hash="x") for i in range(3)]
+        db.add_all([admin] + drivers)
+        db.flush()
+
+        order_ids = db.execute(insert(Order).returning(Order.id), [
+            {"company_id": companies[i % 3].id, "admin_id": admin.id,
+             "driver_id": drivers[i % 3].id if i % 2 else None, "status_id": 2 if i % 2 else 1,
+             "area": f"Area {i % 5}", "mobile_no": "9876543210", "is_deleted": False}
+            for i in range(30)
+        ]).scalars().all()
+        db.execute(insert(OrderItem), [
+            {"order_id": order_id, "gas_id": gases[(order_id + n) % 4].id, "quantity": 1 + n}
+            for order_id in order_ids for n in range(3)
+        ])
+        db.commit()
+        dashboard_stats.rebuild(db)
+        order_rollup.rebuild(db)
+        return Seeded(admin.id, drivers[0].id, companies[0].id, [gas.id for gas in gases], list(order_ids))
+    finally:
+        db.close()
+
+
+def calls(seeded: Seeded) -> list:
+    order, other, removed = seeded.order_ids[0], seeded.order_ids[1], seeded.order_ids[-1]
+    items = [{"gas_id": gas_id, "quantity": 2} for gas_id in seeded.gas_ids]
+    return [
+        Call("login", "POST", "/api/auth/login", None, {"email": ADMIN_EMAIL, "password": PASSWORD}),
+        Call("dashboard", "GET", "/api/dashboard/"),
+        Call("analytics", "GET", "/api/dashboard/analytics?group_by=company&group_by=gas"),
+        Call("companies: page", "GET", "/api/companies/"),
+        Call("companies: all", "GET", "/api/companies/all"),
+        Call("company", "GET", f"/api/companies/{seeded.company_id}"),
+        Call("company: create", "POST", "/api/companies/", json={"name": "Budget Company New", "address": "Vapi"}, expect=201),
+        Call("company: update", "PUT", f"/api/companies/{seeded.company_id}", json={"address": "Hazira"}),
+        Call("gases", "GET", "/api/gases/"),
+        Call("gas", "GET", f"/api/gases/{seeded.gas_ids[0]}"),
+        Call("roles", "GET", "/api/roles/"),
+        Call("order statuses", "GET", "/api/order-statuses/"),
+        Call("orders: page", "GET", "/api/orders/"),
+        Call("orders: search", "GET", "/api/orders/?search=Driver"),
+        Call("order", "GET", f"/api/orders/{order}"),
+        Call("order: create (4 items)", "POST", "/api/orders/",
+             json={"company_id": seeded.company_id, "area": "Area 9", "items": items}, expect=201),
+        Call("order: assign driver", "PUT", f"/api/orders/{order}", json={"driver_id": seeded.driver_id, "status_id": 2}),
+        Call("order: complete", "PUT", f"/api/orders/{other}", json={"status_id": 3}),
+        Call("orders: bulk update (10)", "PATCH", "/api/orders/bulk",
+             json={"orders": [{"id": order_id} for order_id in seeded.order_ids[2:12]], "status_id": 4}),
+        Call("order: delete", "DELETE", f"/api/orders/{removed}"),
+        Call("driver feed", "GET", "/api/orders/my-deliveries", "driver"),
+        Call("order stream token", "POST", "/api/orders/stream/token", "driver"),
+        Call("users: page", "GET", "/api/users/all"),
+        Call("drivers", "GET", "/api/users/drivers"),
+        Call("user", "GET", f"/api/users/{seeded.driver_id}"),
+        Call("health", "GET", "/api/health/ping", None),
+    ]
+
+
+def reported_statements(timing: str) -> tuple:
+    """(statements, budget) from the db entry of a Server-Timing header: desc="6 statements, budget 8"."""
+    match = re.search(r'\bdb;[^,]*desc="(\d+) statements(?:, budget (\d+))?"', timing)
+    if match is None:
+        return "?", None
+    return match.group(1), match.group(2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="Scratch database (default: a fresh SQLite file)")
+    parser.add_argument("--warm", action="store_true", help="Keep in-process caches between requests")
+    parser.add_argument("--verbose", action="store_true", help="Print the budget report of failing requests")
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if database_url is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="quickgas-budgets-"), "budgets.db")
+        database_url = "sqlite:///" + path
+    configure(database_url)
+
+    from fastapi.testclient import TestClient
+
+    from app.core import cache
+    from app.core.security import create_access_token
+    from app.db.base import Base
+    from app.db.session import SessionLocal, get_engine
+    from main import app
+
+    Base.metadata.create_all(get_engine())
+    seeded = seed(SessionLocal)
+    tokens = {
+        "admin": create_access_token({"user_id": seeded.admin_id, "role_id": 1, "email": ADMIN_EMAIL, "name": "Budget Admin"}),
+        "driver": create_access_token({"user_id": seeded.driver_id, "role_id": 3, "email": "driver0@quickgas.example.com", "name": "Budget Driver 0"}),
+    }
+
+    failures = 0
+    with TestClient(app, raise_server_exceptions=False) as client:
+        # One-time per-process probes (SQLite's full-text table lookup) are not per-request costs
+        logging.getLogger("app.db.instrumentation").disabled = True
+        client.get("/api/orders/?search=warm-up", headers={"Authorization": f"Bearer {tokens['admin']}"})
+        logging.getLogger("app.db.instrumentation").disabled = False
+        for call in calls(seeded):
+            if not args.warm:
+                cache.invalidate_all()
+            headers = {"Authorization": f"Bearer {tokens[call.as_user]}"} if call.as_user else {}
+            response = client.request(call.method, call.path, json=call.json, headers=headers)
+            statements, budget = reported_statements(response.headers.get("server-timing", ""))
+
+            problem = ""
+            if response.status_code != call.expect:
+                body = response.json() if response.headers.get("content-type") == "application/json" else {}
+                problem = body.get("technicalMessage") or body.get("detail") or f"status {response.status_code}"
+                problem = f"expected {call.expect}, got {response.status_code}: {problem}"
+            status = "FAIL" if problem else "ok"
+            print(f"{status:<4} {call.name:<26} {statements:>3} / {budget if budget is not None else '-':<3} {call.method} {call.path}")
+            if problem:
+                failures += 1
+                if args.verbose or "budget" in problem.lower():
+                    print(f"     {problem}")
+
+    if failures:
+        print(f"FAIL: {failures} request(s) over budget or failing")
+        sys.exit(1)
+    print("OK: every request within its query budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Query Plan Check
+----------------
+Seeds a database, runs the read paths of the services (order listing, order
+details, driver feed, dashboard, analytics, validation and lookups), captures
+every SELECT they issue and EXPLAINs it. Fails if a plan reads a whole table
+holding more than --max-scan-rows rows, unless the scenario reads that table
+in full by design (and says why).
+
+Usage:
+    python scripts/check_query_plans.py
+    python scripts/check_query_plans.py --orders 100000 --max-scan-rows 1000 --verbose
+
+Runs against an in-memory SQLite database by default, built from the models
+(so from the same indexes as the migrations). Pass --database-url to check a
+scratch Postgres database (existing rows are deleted and a synthetic dataset
+loaded, see app/db/synthetic_data.py, so never point it at production); plans
+there reflect the real planner and statistics.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Settings are required at import time; use placeholders for what the environment lacks.
+# The application engine is never used here, the check builds its own.
+import script_env
+script_env.use_placeholder_settings("QuickGas Query Plans")
+
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db import synthetic_data
+from app.db.base import Base
+from app.services import dashboard_service, order_item_service, order_service, user_service
+from app.services.auth_service import _login_candidate
+from app.utils import db_validation, record_counts, reference_data
+
+@dataclass
+class Scenario:
+    name: str
+    run: Callable[[Session], object]
+    full_scans: tuple = ()   # tables this scenario reads in full by design
+    why: str = ""
+
+
+@dataclass
+class Seeded:
+    admin_id: int
+    driver_id: int
+    order_id: int
+    email: str
+
+
+def build_engine(database_url: str):
+    if database_url.startswith("sqlite"):
+        from sqlalchemy.pool import StaticPool
+        return create_engine(database_url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    return create_engine(database_url)
+
+
+def seed(SessionFactory, spec: synthetic_data.DatasetSpec) -> Seeded:
+    db = SessionFactory()
+    try:
+        if not synthetic_data.is_empty(db):
+            synthetic_data.clear(db)
+        dataset = synthetic_data.generate(db, spec)
+        return Seeded(dataset.admin_ids[0], dataset.driver_ids[0], dataset.orders, dataset.admin_email)
+    finally:
+        db.close()
+
+
+def scenarios(seeded: Seeded) -> list:
+    today = date.today()
+    week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+    return [
+        Scenario("orders: first page", lambda db: order_service.list_orders(db)),
+        Scenario("orders: page 50 (offset)", lambda db: order_service.list_orders(db, start=500)),
+        Scenario("orders: first page by cursor", lambda db: order_service.list_orders(db, cursor="")),
+        Scenario("orders: oldest first", lambda db: order_service.list_orders(db, sort_order="asc")),
+        Scenario("orders: by status", lambda db: order_service.list_orders(db, status_id=2)),
+        Scenario("orders: last 7 days", lambda db: order_service.list_orders(db, start_date=week_ago)),
+        Scenario("orders: search", lambda db: order_service.list_orders(db, search="Patel")),
+        Scenario("orders: search, no match", lambda db: order_service.list_orders(db, search="Zzyzx")),
+        Scenario("orders: recordsTotal", lambda db: db.execute(order_service.ACTIVE_ORDER_COUNT).scalar(),
+                 full_scans=("orders",), why="counts every active order; cached for COUNT_CACHE_TTL_SECONDS"),
+        Scenario("order details", lambda db: order_service.get_order_with_details(db, seeded.order_id)),
+        Scenario("order items", lambda db: order_item_service.get_order_items_with_gas_details(db, seeded.order_id)),
+        Scenario("driver feed", lambda db: order_service.get_driver_orders(db, seeded.driver_id)),
+        Scenario("dashboard (stats)", lambda db: dashboard_service.get_dashboard_insights(db)),
+        Scenario("dashboard (live) status totals",
+                 lambda db: db.execute(dashboard_service.STATUS_TOTALS_SELECT).one(),
+                 full_scans=("orders",), why="DASHBOARD_SOURCE=live aggregates every active order"),
+        Scenario("dashboard (live) gas requirements",
+                 lambda db: db.execute(dashboard_service.GAS_REQUIREMENTS_SELECT).all()),
+        Scenario("analytics: 30 days by company and gas", lambda db: dashboard_service.get_order_analytics(
+            db, today - timedelta(days=30), today, "day", ["company", "gas"])),
+        Scenario("analytics: 12 months by status", lambda db: dashboard_service.get_order_analytics(
+            db, today - timedelta(days=365), today, "month", ["status"])),
+        Scenario("validation: order exists", lambda db: db_validation.order_exists(db, seeded.order_id)),
+        Scenario("validation: is driver", lambda db: db_validation.is_driver(db, seeded.driver_id)),
+        Scenario("drivers list", lambda db: user_service.get_all_drivers(db)),
+        Scenario("login lookup", lambda db: _login_candidate(db, seeded.email)),
+    ]
+
+
+def table_rows(engine) -> dict:
+    with engine.connect() as connection:
+        return {
+            name: connection.execute(select(func.count()).select_from(table)).scalar()
+            for name, table in Base.metadata.tables.items()
+        }
+
+
+def _aliases(statement: str) -> dict:
+    """alias -> table for `table AS alias` in a statement (SQLite plans name aliases)."""
+    return {alias: table for table, alias in re.findall(r"\b(\w+) AS (\w+)\b", statement)}
+
+
+def full_scans(connection, statement: str, parameters) -> tuple[list, str]:
+    """(tables read in full, plan text) for one captured statement."""
+    if connection.dialect.name == "sqlite":
+        rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+        details = [str(row[-1]) for row in rows]
+        aliases = _aliases(statement)
+        # "SCAN t USING INDEX" walks rows in index order; under a LIMIT it stops early
+        bounded = re.search(r"\bLIMIT\b", statement) is not None
+        scanned = []
+        for detail in details:
+            match = re.match(r"SCAN (\w+)( USING (COVERING )?INDEX)?", detail)
+            if match and not (match.group(2) and bounded):
+                scanned.append(aliases.get(match.group(1), match.group(1)))
+        return scanned, "\n".join(details)
+
+    plan = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+    plan = plan if isinstance(plan, list) else json.loads(plan)
+    scanned, lines = [], []
+
+    def walk(node, depth=0):
+        relation = node.get("Relation Name")
+        lines.append("  " * depth + node["Node Type"] + (f" on {relation}" if relation else ""))
+        if node["Node Type"] == "Seq Scan":
+            scanned.append(relation)
+        for child in node.get("Plans", ()):
+            walk(child, depth + 1)
+
+    walk(plan[0]["Plan"])
+    return scanned, "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--orders", type=int, default=30000)
+    parser.add_argument("--companies", type=int, default=300)
+    parser.add_argument("--drivers", type=int, default=25)
+    parser.add_argument("--max-scan-rows", type=int, default=1000, help="Largest table a plan may read in full")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--verbose", action="store_true", help="Print every plan")
+    args = parser.parse_args()
+
+    engine = build_engine(args.database_url)
+    Base.metadata.create_all(engine)
+    SessionFactory = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
+    spec = synthetic_data.DatasetSpec(companies=args.companies, orders=args.orders, drivers=args.drivers, seed=args.seed)
+    seeded = seed(SessionFactory, spec)
+    rows = table_rows(engine)
+
+    captured: Optional[list] = None
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if captured is not None and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, parameters))
+
+    failures = 0
+    with SessionFactory() as db:
+        # Reference data and cached totals are loaded whole on purpose; warm them first
+        for dataset in (reference_data.GASES, reference_data.ORDER_STATUSES, reference_data.ROLES, reference_data.COMPANIES):
+            reference_data.get_reference(db, dataset)
+        record_counts.cached_total(db, record_counts.ORDERS, order_service.ACTIVE_ORDER_COUNT)
+        db.rollback()
+
+        for scenario in scenarios(seeded):
+            captured = []
+            scenario.run(db)
+            statements, captured = captured, None
+            db.rollback()
+
+            problems = []
+            with engine.connect() as connection:
+                for statement, parameters in statements:
+                    scanned, plan = full_scans(connection, statement, parameters)
+                    for table in scanned:
+                        if rows.get(table, 0) > args.max_scan_rows and table not in scenario.full_scans:
+                            problems.append(f"full scan of {table} ({rows[table]} rows)")
+                    if args.verbose:
+                        print(f"--- {scenario.name}\n{statement}\n{plan}\n")
+
+            status = "FAIL" if problems else "ok"
+            note = "; ".join(problems) or (f"full scan allowed: {scenario.why}" if scenario.full_scans else "")
+            print(f"{status:<4} {scenario.name:<42} {len(statements)} statement(s)  {note}")
+            failures += bool(problems)
+
+    if failures:
+        print(f"FAIL: {failures} scenario(s) read large tables in full")
+        sys.exit(1)
+    print("OK: no unexpected full scans")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,491 @@
+"""
+Mixed-Scenario Load Test
+------------------------
+Turns the requests in PostmanTestingJSON/ into load: virtual users play
+weighted role scenarios against a local uvicorn server and the run reports
+latency percentiles and throughput per route. Results can be saved as a
+baseline and later runs compared against it.
+
+Scenarios (see SCENARIOS):
+- dispatcher: pages through orders, opens one, assigns a driver to a pending one
+- admin:      loads the dashboard, creates an order, lists companies
+- driver:     loads the delivery feed and completes one of its orders
+
+Every step names an API operation. Request bodies are filled into the
+example bodies of postman_collection.json, and query parameters checked
+against the application's current OpenAPI schema, so a scenario that drifts
+from the API stops the run instead of measuring 422s. Operations the
+collection lacks (the dashboard, the driver feed) fall back to openapi.json
+and then to the current schema.
+
+Usage:
+    python scripts/load_test.py
+    python scripts/load_test.py --users 50 --duration 30 --save-baseline baseline.json
+    python scripts/load_test.py --compare baseline.json --max-regression 20
+    python scripts/load_test.py --database-url postgresql://... --admin-id 1
+
+Without --database-url a scratch SQLite database is created and seeded with
+--orders orders. With --database-url the database must already contain
+companies, gases and drivers, and --admin-id must be an active admin (tokens
+are signed with JWT_SECRET from the environment, as the server sees it).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import script_env
+_scratch_db = script_env.use_placeholder_settings("QuickGas Load Test", "quickgas_load_mix.db", env="loadtest")
+
+COLLECTION = os.path.join(ROOT, "PostmanTestingJSON", "postman_collection.json")
+OPENAPI = os.path.join(ROOT, "PostmanTestingJSON", "openapi.json")
+
+
+# --- Operations ---
+
+@dataclass(frozen=True)
+class Operation:
+    method: str
+    path: str                       # OpenAPI template: /api/orders/{order_id}
+    name: str
+    source: str                     # "postman", "openapi.json" or "app"
+    body: Any = None                # example body, "<integer>"-style placeholders as values
+    query: frozenset = frozenset()  # query parameters the current API accepts
+
+
+def _postman_requests(items):
+    for item in items:
+        if "item" in item:
+            yield from _postman_requests(item["item"])
+        else:
+            yield item
+
+
+def _parameters(operation: dict) -> frozenset:
+    return frozenset(p["name"] for p in operation.get("parameters", []) if p.get("in") == "query")
+
+
+def load_operations(collection_path: str, openapi_path: str, app_schema: dict) -> Dict[tuple, Operation]:
+    """(METHOD, path) -> Operation from the collection, the saved OpenAPI document and the running API."""
+    current = {
+        (method.upper(), path): _parameters(operation)
+        for path, methods in app_schema["paths"].items() for method, operation in methods.items()
+    }
+    operations = {}
+    with open(collection_path) as handle:
+        for item in _postman_requests(json.load(handle)["item"]):
+            request = item["request"]
+            segments = ["{" + s[1:] + "}" if s.startswith(":") else s for s in request["url"]["path"]]
+            key = (request["method"], "/" + "/".join(segments))
+            raw = (request.get("body") or {}).get("raw")
+            operations[key] = Operation(key[0], key[1], item["name"], "postman", json.loads(raw) if raw else None)
+    with open(openapi_path) as handle:
+        for path, methods in json.load(handle)["paths"].items():
+            for method, operation in methods.items():
+                operations.setdefault((method.upper(), path), Operation(method.upper(), path, operation["summary"], "openapi.json"))
+    for (method, path), query in current.items():
+        known = operations.get((method, path))
+        operations[(method, path)] = Operation(
+            method, path, known.name if known else path, known.source if known else "app", known.body if known else None, query
+        )
+    # Snapshot operations the API no longer serves cannot be load tested
+    return {key: operation for key, operation in operations.items() if key in current}
+
+
+def fill(template: Any, values: Any, where: str) -> Any:
+    """`values` laid onto an example body: only fields the example has, optional ones may be left out."""
+    if isinstance(values, dict):
+        if not isinstance(template, dict):
+            raise ValueError(f"{where}: expected an object in the collection's example")
+        unknown = set(values) - set(template)
+        if unknown:
+            raise ValueError(f"{where}: {', '.join(sorted(unknown))} not in the collection's example body")
+        return {key: fill(template[key], value, f"{where}.{key}") for key, value in values.items()}
+    if isinstance(values, list):
+        if not isinstance(template, list) or not template:
+            raise ValueError(f"{where}: expected a list in the collection's example")
+        return [fill(template[0], value, f"{where}[]") for value in values]
+    return values
+
+
+# --- Scenarios ---
+
+@dataclass
+class World:
+    """Ids known to exist, shared by every virtual user."""
+    company_ids: list
+    gas_ids: list
+    driver_ids: list
+    tokens: dict                                   # role -> token, or "driver:<id>" -> token
+
+
+@dataclass
+class Step:
+    method: str
+    path: str
+    build: Callable[["Session"], Optional[dict]]   # -> {"path": {...}, "query": {...}, "body": {...}}, or None to skip
+    read: Optional[Callable[["Session", dict], None]] = None
+
+
+@dataclass
+class Scenario:
+    name: str
+    weight: int
+    role: str
+    steps: list
+
+
+@dataclass
+class Session:
+    world: World
+    rng: random.Random
+    user: str
+    state: dict = field(default_factory=dict)
+
+
+def _page_start(session: Session) -> int:
+    # Dispatchers mostly look at the newest orders; a few page deep
+    return 25 * min(int(session.rng.paretovariate(1.5)) - 1, 40)
+
+
+def _remember_page(session: Session, data: dict):
+    session.state["page"] = data["data"]["data"]
+
+
+def _remember_feed(session: Session, data: dict):
+    session.state["feed"] = data["data"]
+
+
+def _open_order(session: Session):
+    page = session.state.get("page")
+    return {"path": {"order_id": session.rng.choice(page)["id"]}} if page else None
+
+
+def _assign_driver(session: Session):
+    pending = [order for order in session.state.get("page", []) if order["status_id"] == 1]
+    if not pending:
+        return None
+    return {"path": {"order_id": session.rng.choice(pending)["id"]},
+            "body": {"status_id": 2, "driver_id": session.rng.choice(session.world.driver_ids)}}
+
+
+def _new_order(session: Session):
+    rng, world = session.rng, session.world
+    gas_ids = rng.sample(world.gas_ids, rng.randint(1, min(3, len(world.gas_ids))))
+    return {"body": {
+        "company_id": world.company_ids[int(rng.paretovariate(1.2)) % len(world.company_ids)],
+        "area": f"Area {rng.randrange(40)}",
+        "items": [{"gas_id": gas_id, "quantity": rng.randint(1, 20)} for gas_id in gas_ids],
+    }}
+
+
+def _complete_delivery(session: Session):
+    feed = session.state.get("feed")
+    return {"path": {"order_id": session.rng.choice(feed)["id"]}, "body": {"status_id": 3}} if feed else None
+
+
+SCENARIOS = [
+    Scenario("dispatcher", 5, "dispatcher", [
+        Step("GET", "/api/orders/", lambda s: {"query": {"start": _page_start(s), "length": 25}}, _remember_page),
+        Step("GET", "/api/orders/{order_id}", _open_order),
+        Step("PUT", "/api/orders/{order_id}", _assign_driver),
+    ]),
+    Scenario("admin", 2, "admin", [
+        Step("GET", "/api/dashboard/", lambda s: {}),
+        Step("POST", "/api/orders/", _new_order),
+        Step("GET", "/api/companies/", lambda s: {"query": {"length": 25}}),
+    ]),
+    Scenario("driver", 3, "driver", [
+        Step("GET", "/api/orders/my-deliveries", lambda s: {}, _remember_feed),
+        Step("PUT", "/api/orders/{order_id}", _complete_delivery),
+    ]),
+]
+
+
+def check_scenarios(operations: Dict[tuple, Operation]):
+    """Every step must name an operation the API serves (query parameters are checked per request)."""
+    for scenario in SCENARIOS:
+        for step in scenario.steps:
+            if (step.method, step.path) not in operations:
+                raise ValueError(f"{scenario.name}: {step.method} {step.path} is not an API operation")
+
+
+def prepare(operation: Operation, parts: dict) -> dict:
+    unknown = set(parts.get("query", {})) - operation.query
+    if unknown:
+        raise ValueError(f"{operation.method} {operation.path}: unknown query parameter(s) {', '.join(sorted(unknown))}")
+    body = parts.get("body")
+    if body is not None and operation.body is not None:
+        body = fill(operation.body, body, f"{operation.method} {operation.path}")
+    return {
+        "method": operation.method,
+        "url": operation.path.format(**parts.get("path", {})),
+        "params": parts.get("query"),
+        "json": body,
+    }
+
+
+# --- Running ---
+
+@dataclass
+class RouteStats:
+    latencies: list = field(default_factory=list)
+    errors: int = 0
+    statuses: Dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+
+async def run_load(base_url: str, world: World, operations: dict, users: int, duration: float, warmup: float, seed: int):
+    stats: Dict[str, RouteStats] = defaultdict(RouteStats)
+    weights = [scenario.weight for scenario in SCENARIOS]
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        measure_from = time.monotonic() + warmup
+        deadline = measure_from + duration
+
+        async def virtual_user(number: int):
+            rng = random.Random(seed * 100003 + number)
+            while time.monotonic() < deadline:
+                scenario = rng.choices(SCENARIOS, weights)[0]
+                user = scenario.role
+                if user == "driver":
+                    user = f"driver:{rng.choice(world.driver_ids)}"
+                session = Session(world, rng, user)
+                headers = {"Authorization": f"Bearer {world.tokens[user]}"}
+                for step in scenario.steps:
+                    parts = step.build(session)
+                    if parts is None:
+                        continue
+                    operation = operations[(step.method, step.path)]
+                    started = time.monotonic()
+                    try:
+                        response = await client.request(headers=headers, **prepare(operation, parts))
+                        status = response.status_code
+                    except httpx.HTTPError:
+                        response, status = None, 0
+                    if started >= measure_from and started < deadline:
+                        route = stats[f"{step.method} {step.path}"]
+                        route.latencies.append(time.monotonic() - started)
+                        route.statuses[status] += 1
+                        route.errors += not 200 <= status < 300
+                    if step.read and response is not None and 200 <= status < 300:
+                        step.read(session, response.json())
+
+        await asyncio.gather(*(virtual_user(i) for i in range(users)))
+    return stats
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def summarize(stats: Dict[str, RouteStats], duration: float) -> dict:
+    def summary(latencies: list, errors: int) -> dict:
+        latencies = sorted(latencies)
+        return {
+            "requests": len(latencies),
+            "errors": errors,
+            "rps": round(len(latencies) / duration, 2),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        }
+
+    routes = {route: summary(entry.latencies, entry.errors) for route, entry in sorted(stats.items())}
+    everything = [latency for entry in stats.values() for latency in entry.latencies]
+    return {"routes": routes, "total": summary(everything, sum(entry.errors for entry in stats.values()))}
+
+
+def print_summary(summary: dict, baseline: Optional[dict]):
+    header = f"{'route':<34} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    print(header + ("   p95 vs baseline  req/s vs baseline" if baseline else ""))
+    rows = list(summary["routes"].items()) + [("total", summary["total"])]
+    for route, row in rows:
+        line = (f"{route:<34} {row['requests']:>8} {row['errors']:>6} {row['rps']:>8.1f} "
+                f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}")
+        before = baseline_row(baseline, route)
+        if before:
+            line += f"   {change(before['p95_ms'], row['p95_ms']):>15}  {change(before['rps'], row['rps']):>17}"
+        print(line)
+
+
+def baseline_row(baseline: Optional[dict], route: str) -> Optional[dict]:
+    if not baseline:
+        return None
+    return baseline["total"] if route == "total" else baseline["routes"].get(route)
+
+
+def change(before: float, after: float) -> str:
+    return f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+
+
+def regressions(summary: dict, baseline: dict, max_regression: float, min_requests: int = 20) -> list:
+    """Routes whose p95 grew by more than `max_regression` percent (with enough samples on both sides)."""
+    found = []
+    for route, row in list(summary["routes"].items()) + [("total", summary["total"])]:
+        before = baseline_row(baseline, route)
+        if not before or min(before["requests"], row["requests"]) < min_requests or not before["p95_ms"]:
+            continue
+        growth = (row["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100
+        if growth > max_regression:
+            found.append(f"{route}: p95 {before['p95_ms']:.1f} -> {row['p95_ms']:.1f} ms ({growth:+.1f}%)")
+    return found
+
+
+# --- Setup ---
+
+def seed_scratch_database(database_url: str, order_count: int):
+    """A fresh SQLite database with synthetic data: admin id 1, dispatcher id 2, drivers and `order_count` orders."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session as DBSession
+
+    from app.db import synthetic_data
+    from app.db.base import Base
+
+    path = database_url.split("///", 1)[1]
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    spec = synthetic_data.DatasetSpec(companies=50, orders=order_count, admins=1, dispatchers=1, drivers=10, seed=42)
+    with DBSession(engine) as db:
+        synthetic_data.generate(db, spec)
+    engine.dispose()
+
+
+def start_server(port: int, env: dict) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+
+
+def wait_until_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/health/ping", timeout=1.0).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not start")
+
+
+def discover_world(base_url: str, admin_id: int, dispatcher_id: Optional[int]) -> World:
+    from app.core.security import create_access_token
+
+    def token(user_id: int, role_id: int) -> str:
+        return create_access_token({"user_id": user_id, "role_id": role_id, "email": None, "name": "Load Test"},
+                                   expires_minutes=120)
+
+    admin = token(admin_id, 1)
+    headers = {"Authorization": f"Bearer {admin}"}
+    data = {path: httpx.get(base_url + path, headers=headers, timeout=30.0).json()["data"]
+            for path in ("/api/companies/all", "/api/gases/", "/api/users/drivers")}
+    world = World(
+        company_ids=[company["id"] for company in data["/api/companies/all"]],
+        gas_ids=[gas["id"] for gas in data["/api/gases/"]],
+        driver_ids=[driver["id"] for driver in data["/api/users/drivers"]],
+        tokens={"admin": admin, "dispatcher": token(dispatcher_id, 2) if dispatcher_id else admin},
+    )
+    if not (world.company_ids and world.gas_ids and world.driver_ids):
+        raise RuntimeError("the database needs at least one company, gas and driver")
+    world.tokens.update({f"driver:{driver_id}": token(driver_id, 3) for driver_id in world.driver_ids})
+    return world
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Existing database to test against (default: seeded scratch SQLite)")
+    parser.add_argument("--orders", type=int, default=20000, help="Orders to seed into the scratch database")
+    parser.add_argument("--admin-id", type=int, default=1, help="Active admin the admin token is issued for")
+    parser.add_argument("--dispatcher-id", type=int, default=None, help="Active dispatcher (default: 2 on the scratch database, else the admin)")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=20.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds before measuring")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the virtual users' choices")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write the results to PATH as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="Compare with a saved baseline")
+    parser.add_argument("--max-regression", type=float, default=None,
+                        help="With --compare, fail if a route's p95 grew by more than this many percent")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    dispatcher_id = args.dispatcher_id
+    if args.database_url:
+        env["NEON_CONNECTION_STRING"] = env["DATABASE_URL"] = args.database_url
+    else:
+        env["NEON_CONNECTION_STRING"] = env["DATABASE_URL"] = _scratch_db
+        seed_scratch_database(_scratch_db, args.orders)
+        dispatcher_id = dispatcher_id or 2
+
+    from main import app
+    operations = load_operations(COLLECTION, OPENAPI, app.openapi())
+    check_scenarios(operations)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = start_server(args.port, env)
+    try:
+        wait_until_ready(base_url)
+        world = discover_world(base_url, args.admin_id, dispatcher_id)
+        print(f"running {args.users} virtual users for {args.duration:.0f}s "
+              f"({', '.join(f'{s.name} x{s.weight}' for s in SCENARIOS)}) ...")
+        stats = asyncio.run(run_load(base_url, world, operations, args.users, args.duration, args.warmup, args.seed))
+    finally:
+        server.terminate()
+        server.wait()
+
+    summary = summarize(stats, args.duration)
+    print()
+    print_summary(summary, baseline)
+    for route, entry in sorted(stats.items()):
+        failed = {status: count for status, count in entry.statuses.items() if not 200 <= status < 300}
+        if failed:
+            print(f"  {route}: non-2xx responses {dict(sorted(failed.items()))}")
+
+    if args.save_baseline:
+        document = {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "settings": {"users": args.users, "duration": args.duration, "seed": args.seed,
+                         "database": "postgres" if args.database_url and args.database_url.startswith("postgres") else "sqlite",
+                         "orders": None if args.database_url else args.orders},
+            **summary,
+        }
+        with open(args.save_baseline, "w") as handle:
+            json.dump(document, handle, indent=2)
+        print(f"\nbaseline saved to {args.save_baseline}")
+
+    if baseline and args.max_regression is not None:
+        found = regressions(summary, baseline, args.max_regression)
+        if found:
+            print("\nFAIL: p95 regressed beyond {:.0f}%:".format(args.max_regression))
+            for line in found:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nOK: no route's p95 regressed beyond {args.max_regression:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Sync vs Async Stack Load Test
+-----------------------------
+Starts the API twice under uvicorn, once with the sync handlers and once with
+ASYNC_ROUTERS=orders,dashboard,companies, drives the same read mix at both
+with a fixed number of concurrent clients, and prints throughput and latency
+percentiles side by side.
+
+Usage:
+    python scripts/load_test_async.py
+    python scripts/load_test_async.py --concurrency 200 --duration 30
+    python scripts/load_test_async.py --database-url postgresql://... --user-id 1
+
+Without --database-url a scratch SQLite database is created and seeded with
+--orders orders. With --database-url the database must already contain data,
+and --user-id must be an active admin (the token is signed with JWT_SECRET
+from the environment, as the server sees it).
+
+The async stack needs asyncpg (or aiosqlite for SQLite) installed.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import script_env
+_scratch_db = script_env.use_placeholder_settings("QuickGas Load Test", "quickgas_load_test.db", env="loadtest")
+
+ASYNC_MODE_ROUTERS = "orders,dashboard,companies"
+
+# (weight, path) of the read mix; {order_id} is filled from the seeded ids
+REQUEST_MIX = [
+    (4, "/api/orders/?length=25"),
+    (2, "/api/orders/{order_id}"),
+    (1, "/api/dashboard/"),
+    (2, "/api/companies/?length=25"),
+    (1, "/api/companies/all"),
+]
+
+
+def seed_scratch_database(database_url: str, order_count: int):
+    """Create a fresh SQLite database with reference rows, an admin and `order_count` orders."""
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import Session
+
+    from app.db.base import Base
+    from app.models import Company, Gas, Order, OrderItem, OrderStatus, Role, User
+
+    path = database_url.split("///", 1)[1]
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    rng = random.Random(42)
+    with Session(engine) as db:
+        db.add_all([Role(id=i, name=n) for i, n in enumerate(["ADMIN", "DISPATCHER", "DRIVER", "CUSTOMER"], 1)])
+        db.add_all([OrderStatus(id=i, name=n) for i, n in enumerate(
+            ["PENDING", "OUT_FOR_DELIVERY", "COMPLETED", "OVERDUE", "DELETED", "CANCELLED"], 1)])
+        db.add_all([Company(id=i, name=f"Company {i}", address=f"Area {i % 7}") for i in range(1, 51)])
+        db.add_all([Gas(id=i, name=n, unit="m3") for i, n in enumerate(["Oxygen", "Nitrogen", "Argon", "CO2"], 1)])
+        db.add(User(id=1, name="Load Admin", email="load@quickgas.local", company_id=1, role_id=1, password_hash="x"))
+        db.flush()
+        db.execute(insert(Order), [
+            {"id": i, "company_id": rng.randint(1, 50), "admin_id": 1, "area": f"Area {i % 7}",
+             "status_id": rng.choice([1, 1, 2, 3]), "is_deleted": False}
+            for i in range(1, order_count + 1)
+        ])
+        db.execute(insert(OrderItem), [
+            {"order_id": i, "gas_id": rng.randint(1, 4), "quantity": rng.randint(1, 20)}
+            for i in range(1, order_count + 1)
+        ])
+        db.commit()
+    engine.dispose()
+
+
+def start_server(async_routers: str, port: int, env: dict) -> subprocess.Popen:
+    env = {**env, "ASYNC_ROUTERS": async_routers}
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+
+
+def wait_until_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/health/ping", timeout=1.0).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not start")
+
+
+async def run_load(base_url: str, token: str, order_ids: list, concurrency: int, duration: float, warmup: float):
+    paths = [path for weight, path in REQUEST_MIX for _ in range(weight)]
+    latencies, errors = [], 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers={"Authorization": f"Bearer {token}"},
+                                 limits=limits, timeout=30.0) as client:
+        measure_from = time.monotonic() + warmup
+        deadline = measure_from + duration
+
+        async def worker(seed: int):
+            nonlocal errors
+            rng = random.Random(seed)
+            while True:
+                started = time.monotonic()
+                if started >= deadline:
+                    return
+                path = rng.choice(paths).format(order_id=rng.choice(order_ids))
+                try:
+                    ok = (await client.get(path)).status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if started >= measure_from:
+                    latencies.append(time.monotonic() - started)
+                    errors += not ok
+
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return latencies, errors
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Existing database to test against (default: seeded scratch SQLite)")
+    parser.add_argument("--orders", type=int, default=5000, help="Orders to seed into the scratch database")
+    parser.add_argument("--user-id", type=int, default=1, help="Admin user id the token is issued for")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=15.0, help="Measured seconds per mode")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds before each run")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.database_url:
+        env["NEON_CONNECTION_STRING"] = env["DATABASE_URL"] = args.database_url
+    else:
+        env["NEON_CONNECTION_STRING"] = env["DATABASE_URL"] = _scratch_db
+        seed_scratch_database(_scratch_db, args.orders)
+
+    from app.core.security import create_access_token
+    token = create_access_token(
+        {"user_id": args.user_id, "role_id": 1, "email": "load@quickgas.local", "name": "Load Admin"},
+        expires_minutes=60,
+    )
+    order_ids = list(range(1, args.orders + 1)) if not args.database_url else None
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    results = {}
+    for mode, routers in (("sync", ""), ("async", ASYNC_MODE_ROUTERS)):
+        server = start_server(routers, args.port, env)
+        try:
+            wait_until_ready(base_url)
+            if order_ids is None:
+                listing = httpx.get(f"{base_url}/api/orders/?length=100",
+                                    headers={"Authorization": f"Bearer {token}"}).json()
+                order_ids = [order["id"] for order in listing["data"]["data"]] or [1]
+            print(f"running {mode} stack: {args.concurrency} clients for {args.duration:.0f}s ...")
+            latencies, errors = asyncio.run(
+                run_load(base_url, token, order_ids, args.concurrency, args.duration, args.warmup)
+            )
+        finally:
+            server.terminate()
+            server.wait()
+        results[mode] = (sorted(latencies), errors)
+
+    print()
+    print(f"{'stack':<6} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for mode, (latencies, errors) in results.items():
+        print(
+            f"{mode:<6} {len(latencies):>9} {errors:>7} {len(latencies) / args.duration:>9.1f} "
+            f"{percentile(latencies, 0.50) * 1000:>8.1f} {percentile(latencies, 0.95) * 1000:>8.1f} "
+            f"{percentile(latencies, 0.99) * 1000:>8.1f}"
+        )
+    sync_rate = len(results["sync"][0]) or 1
+    print(f"\nasync/sync throughput: {len(results['async'][0]) / sync_rate:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
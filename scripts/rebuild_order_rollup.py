@@ -0,0 +1,38 @@
+"""
+Rebuild Order Rollup
+--------------------
+Recomputes the order_rollup table behind GET /api/dashboard/analytics from
+orders and order_items, for all history or from a given day onwards.
+
+Usage:
+    python scripts/rebuild_order_rollup.py                       # all history
+    python scripts/rebuild_order_rollup.py --since 2026-10-01    # from a day (business timezone)
+
+Uses the application's database settings (NEON_CONNECTION_STRING). The
+services keep the rollup current; a rebuild is only needed after writes made
+outside them (manual SQL, restores) or a change of business timezone.
+"""
+
+import argparse
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.utils import order_rollup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--since", type=date.fromisoformat, help="Only rebuild days on or after YYYY-MM-DD")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        order_rollup.rebuild(db, since=args.since)
+    print("order_rollup rebuilt" + (f" from {args.since}" if args.since else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Reconcile Dashboard Stats
+-------------------------
+Compares the running totals in dashboard_stats with a fresh aggregation of
+orders and order_items, prints every total that drifted and rebuilds the
+table.
+
+Usage:
+    python scripts/reconcile_dashboard_stats.py           # report and rebuild
+    python scripts/reconcile_dashboard_stats.py --check   # report only, exit 1 on drift
+
+Uses the application's database settings (NEON_CONNECTION_STRING), so it can
+run as a scheduled job next to the API. The services keep the table current;
+drift only comes from writes made outside them (manual SQL, restores).
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.utils import dashboard_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="Only report drift; exit 1 if any is found")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        stored = dashboard_stats.stored_totals(db)
+        computed = dashboard_stats.computed_totals(db)
+        drift = {
+            key: (stored.get(key, 0), computed.get(key, 0))
+            for key in sorted(stored.keys() | computed.keys())
+            if stored.get(key, 0) != computed.get(key, 0)
+        }
+
+        for (kind, ref_id), (stored_value, computed_value) in drift.items():
+            print(f"{kind:<13} {ref_id:>6}  stored {stored_value:>10}  actual {computed_value:>10}")
+        print(f"{len(drift)} total(s) drifted")
+
+        if args.check:
+            sys.exit(1 if drift else 0)
+
+        dashboard_stats.rebuild(db)
+        print("dashboard_stats rebuilt")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Script Environment
+------------------
+Settings are required at import time (app/core/config.py). The benchmark,
+load-test and check scripts run against scratch databases, so they fill in
+placeholders for whatever the environment does not set before importing the
+app. Values already in the environment always win.
+
+Usage (before any `app` import):
+    import script_env
+    script_env.use_placeholder_settings("QuickGas Benchmark")
+"""
+
+import os
+import tempfile
+
+DEFAULT_DATABASE = "quickgas_benchmark.db"
+
+
+def scratch_database_url(filename: str = DEFAULT_DATABASE) -> str:
+    """SQLite URL of `filename` in the temp directory."""
+    return "sqlite:///" + os.path.join(tempfile.gettempdir(), filename)
+
+
+def placeholder_settings(app_name: str, database_url: str, env: str = "benchmark") -> dict:
+    """The required settings, for scripts that pass an environment to a child process."""
+    return {
+        "APP_NAME": app_name,
+        "ENV": env,
+        "NEON_CONNECTION_STRING": database_url,
+        "DATABASE_URL": database_url,
+        "JWT_SECRET": "script-secret-key-0000-0000-0000",
+    }
+
+
+def use_placeholder_settings(app_name: str, database: str = DEFAULT_DATABASE, env: str = "benchmark") -> str:
+    """Set the required settings missing from os.environ; returns the scratch database URL."""
+    database_url = scratch_database_url(database)
+    for key, value in placeholder_settings(app_name, database_url, env).items():
+        os.environ.setdefault(key, value)
+    return database_url
@@ -0,0 +1,91 @@
+"""
+Startup Import Profile
+----------------------
+Runs `python -X importtime -c "import main"` in a fresh interpreter and
+summarises where cold-start import time goes: the slowest modules by
+cumulative and self time, and self time grouped by top-level package.
+
+Usage:
+    python scripts/startup_profile.py
+    python scripts/startup_profile.py --lazy-routers on --top 30
+    python scripts/startup_profile.py --module app.services.order_service
+
+Importing main also runs create_app(), so router registration is included.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+import script_env
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_ENV = script_env.placeholder_settings(
+    "QuickGas Startup Profile", script_env.scratch_database_url("quickgas_startup_profile.db"), env="profile"
+)
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def profile_imports(module: str, env: dict) -> list[tuple[str, int, int, int]]:
+    """Return (module, self_us, cumulative_us, depth) for every import made while importing `module`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"importing {module} failed")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument("--top", type=int, default=20, help="Rows per table")
+    parser.add_argument("--lazy-routers", choices=["auto", "on", "off"], help="Override LAZY_ROUTERS")
+    parser.add_argument("--async-routers", help="Override ASYNC_ROUTERS")
+    args = parser.parse_args()
+
+    env = {**DEFAULT_ENV, **os.environ}
+    if args.lazy_routers:
+        env["LAZY_ROUTERS"] = args.lazy_routers
+    if args.async_routers is not None:
+        env["ASYNC_ROUTERS"] = args.async_routers
+
+    rows = profile_imports(args.module, env)
+    total_us = next((cumulative for name, _, cumulative, _ in rows if name == args.module), 0)
+
+    print(f"import {args.module}: {total_us / 1000:.1f} ms, {len(rows)} modules\n")
+
+    print(f"{'cumulative ms':>13} {'self ms':>8}  module (application)")
+    app_rows = [row for row in rows if row[0].startswith("app.") or row[0] == args.module]
+    for name, self_us, cumulative_us, _ in sorted(app_rows, key=lambda row: -row[2])[:args.top]:
+        print(f"{cumulative_us / 1000:>13.1f} {self_us / 1000:>8.1f}  {name}")
+
+    print(f"\n{'self ms':>8}  module (slowest overall)")
+    for name, self_us, _, _ in sorted(rows, key=lambda row: -row[1])[:args.top]:
+        print(f"{self_us / 1000:>8.1f}  {name}")
+
+    by_package = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+    print(f"\n{'self ms':>8} {'share':>6}  top-level package")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:args.top]:
+        share = self_us / total_us * 100 if total_us else 0
+        print(f"{self_us / 1000:>8.1f} {share:>5.1f}%  {package}")
+
+
+if __name__ == "__main__":
+    main()
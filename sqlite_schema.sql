@@ -79,4 +79,41 @@ CREATE TABLE orders (
     FOREIGN KEY(admin_id) REFERENCES users (id), 
     FOREIGN KEY(driver_id) REFERENCES users (id)
 );
+CREATE INDEX ix_orders_created_at_id ON orders (created_at, id);
+CREATE INDEX ix_orders_driver_open ON orders (driver_id, status_id) WHERE is_deleted = 0;
+CREATE INDEX ix_order_items_order_id ON order_items (order_id);
+CREATE INDEX ix_orders_status_created_active ON orders (status_id, created_at, id) WHERE is_deleted = 0;
+CREATE INDEX ix_orders_company_id ON orders (company_id);
+CREATE INDEX ix_orders_admin_id ON orders (admin_id);
+CREATE INDEX ix_orders_driver_id ON orders (driver_id);
+CREATE INDEX ix_users_role_id ON users (role_id);
+CREATE INDEX ix_users_company_id ON users (company_id);
+CREATE TABLE dashboard_stats (
+    kind VARCHAR(32) NOT NULL, 
+    ref_id INTEGER NOT NULL, 
+    value BIGINT NOT NULL, 
+    PRIMARY KEY (kind, ref_id)
+);
+CREATE TABLE order_rollup (
+    day DATE NOT NULL, 
+    company_id INTEGER NOT NULL, 
+    area VARCHAR(255) NOT NULL, 
+    gas_id INTEGER NOT NULL, 
+    status_id INTEGER NOT NULL, 
+    quantity BIGINT NOT NULL, 
+    items INTEGER NOT NULL, 
+    PRIMARY KEY (day, company_id, area, gas_id, status_id)
+);
+CREATE VIRTUAL TABLE companies_fts USING fts5(name, address, content='companies', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER companies_fts_ai AFTER INSERT ON companies BEGIN INSERT INTO companies_fts(rowid, name, address) VALUES (new.id, new.name, new.address); END;
+CREATE TRIGGER companies_fts_ad AFTER DELETE ON companies BEGIN INSERT INTO companies_fts(companies_fts, rowid, name, address) VALUES ('delete', old.id, old.name, old.address); END;
+CREATE TRIGGER companies_fts_au AFTER UPDATE ON companies BEGIN INSERT INTO companies_fts(companies_fts, rowid, name, address) VALUES ('delete', old.id, old.name, old.address); INSERT INTO companies_fts(rowid, name, address) VALUES (new.id, new.name, new.address); END;
+CREATE VIRTUAL TABLE users_fts USING fts5(name, email, content='users', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER users_fts_ai AFTER INSERT ON users BEGIN INSERT INTO users_fts(rowid, name, email) VALUES (new.id, new.name, new.email); END;
+CREATE TRIGGER users_fts_ad AFTER DELETE ON users BEGIN INSERT INTO users_fts(users_fts, rowid, name, email) VALUES ('delete', old.id, old.name, old.email); END;
+CREATE TRIGGER users_fts_au AFTER UPDATE ON users BEGIN INSERT INTO users_fts(users_fts, rowid, name, email) VALUES ('delete', old.id, old.name, old.email); INSERT INTO users_fts(rowid, name, email) VALUES (new.id, new.name, new.email); END;
+CREATE VIRTUAL TABLE gases_fts USING fts5(name, content='gases', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER gases_fts_ai AFTER INSERT ON gases BEGIN INSERT INTO gases_fts(rowid, name) VALUES (new.id, new.name); END;
+CREATE TRIGGER gases_fts_ad AFTER DELETE ON gases BEGIN INSERT INTO gases_fts(gases_fts, rowid, name) VALUES ('delete', old.id, old.name); END;
+CREATE TRIGGER gases_fts_au AFTER UPDATE ON gases BEGIN INSERT INTO gases_fts(gases_fts, rowid, name) VALUES ('delete', old.id, old.name); INSERT INTO gases_fts(rowid, name) VALUES (new.id, new.name); END;
 sqlite3 is not installed, but available in the following packages, pick one to run it, Ctrl+C to cancel.